@@ -0,0 +1,116 @@
+## ImGui Boilerplate: Batch Load Benchmark
+## Compares loading a folder of photos with `ImguiImage.load()` in a loop, with `loadAsync(...)` on worker threads, and with an `ImageBatch` on worker processes.
+## Run from the repository root: `python benchmarks/batchLoad.py [--images 200] [--workers N] [--headless]`
+## Headless runs use Pyglet's EGL backend and PyOpenGL's EGL platform.
+
+## Imports
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+## Constants
+SOURCE_SIZE = (3000, 2000)
+THUMB_LIMIT = (512, 512)
+
+## Functions
+def makeCorpus(directory: str, count: int) -> list:
+    """
+    Writes a corpus of noisy JPEG photos and returns their paths.
+
+    directory: A string directory to write the photos into.
+    count: An int number of photos.
+    """
+    from PIL import Image
+    noise = Image.effect_noise(SOURCE_SIZE, 64).convert("RGB")
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"{i}.jpg")
+        Image.blend(noise, Image.new("RGB", SOURCE_SIZE, ((i * 37) % 256, 90, 160)), 0.5).save(path, quality=90)
+        paths.append(path)
+
+    noise.close()
+    return paths
+
+def timeSerial(paths: list) -> float:
+    """
+    Returns the seconds to load every photo with `ImguiImage.load()` in a loop.
+
+    paths: A list of string filepaths.
+    """
+    from imguiRenderer.imguiImage import ImguiImage
+
+    start = time.perf_counter()
+    images = [ImguiImage(path, thumbLimit=THUMB_LIMIT, lean=True) for path in paths]
+    for img in images:
+        img.load()
+        img.getTexture()
+
+    return time.perf_counter() - start
+
+def timeBatch(paths: list, loader) -> float:
+    """
+    Returns the seconds to load every photo with an `ImageBatch` on the provided loader.
+
+    paths: A list of string filepaths.
+    loader: The `ImageLoader` to decode with.
+    """
+    from imguiRenderer.imageBatch import ImageBatch
+
+    start = time.perf_counter()
+    batch = ImageBatch(paths, thumbLimit=THUMB_LIMIT, loader=loader)
+    for _ in batch.results():
+        pass
+
+    return time.perf_counter() - start
+
+## Execution
+if __name__ == "__main__":
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Compares serial, threaded, and multiprocess loading of a folder of photos.")
+    parser.add_argument("--images", type=int, default=200, help="Photos in the corpus.")
+    parser.add_argument("--workers", type=int, default=(os.cpu_count() or 1), help="Worker threads or processes.")
+    parser.add_argument("--headless", action="store_true", help="Render through an offscreen EGL context.")
+    args = parser.parse_args()
+
+    # Configure Pyglet and PyOpenGL before any windowing is imported
+    import pyglet
+    pyglet.options["headless"] = args.headless
+    if args.headless:
+        os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from imguiRenderer.imageLoader import ImageLoader
+    from imguiRenderer.textureCache import TextureCache
+
+    # Create a GL context
+    window = pyglet.window.Window(width=64, height=64, visible=False)
+
+    with tempfile.TemporaryDirectory() as workDir:
+        paths = makeCorpus(workDir, args.images)
+
+        # Start the processes before timing
+        processLoader = ImageLoader(args.workers, processes=True)
+        timeBatch(paths[:args.workers], processLoader)
+        threadLoader = ImageLoader(args.workers)
+
+        # Measure each method from an empty texture cache
+        results = []
+        for name, measure in (
+            ("serial", lambda: timeSerial(paths)),
+            ("threads", lambda: timeBatch(paths, threadLoader)),
+            ("processes", lambda: timeBatch(paths, processLoader))
+        ):
+            TextureCache.shared().clear()
+            results.append((name, measure()))
+
+        processLoader.shutdown()
+        threadLoader.shutdown()
+
+    # Report
+    serialTime = results[0][1]
+    print(f"{'Method':<12}{'Seconds':>9}{'Images/s':>10}{'Speedup':>9}")
+    for name, seconds in results:
+        print(f"{name:<12}{seconds:>9.2f}{args.images / seconds:>10.1f}{serialTime / seconds:>8.1f}x")
+
+    window.close()
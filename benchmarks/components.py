@@ -0,0 +1,136 @@
+## ImGui Boilerplate: Component Frame Cost Benchmark
+## Measures the per frame CPU cost and draw data of the included components without a window or GL.
+## Run from the repository root: `python benchmarks/components.py [--frames 500] [--json out.json] [--baseline old.json]`
+
+## Imports
+import os
+import sys
+import json
+import argparse
+import tempfile
+import imgui
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from PIL import Image
+from imguiRenderer.headless import HeadlessFrameBuilder, HeadlessTexture, DEFAULT_DISPLAY_SIZE
+from imguiRenderer.components.all import AllComponents
+from imguiRenderer.imguiImage import ImguiImage
+from imguiRenderer.textureCache import TextureCache
+from imguiRenderer.testwindow import show_test_window
+
+## Constants
+GALLERY_SIZE = 100000
+GALLERY_PRELOADED = 128
+
+## Functions
+def buildScenarios(workDir: str) -> dict:
+    """
+    Creates the build functions to benchmark keyed by name.
+
+    workDir: A string directory to write any sample files into.
+    """
+    # Prepare the components
+    comps = AllComponents()
+
+    # Prepare a sample image with a placeholder texture
+    imgPath = os.path.join(workDir, "sample.png")
+    Image.new("RGB", (1920, 1080), (40, 80, 120)).save(imgPath)
+
+    img = ImguiImage(imgPath)
+    img.load(skipTexture=True)
+    TextureCache.shared().put(img.textureKey(), HeadlessTexture(1280, 720))
+
+    # Prepare a large gallery with the first rows already loaded
+    galleryImages = [ImguiImage(imgPath) for _ in range(GALLERY_SIZE)]
+    for galleryImg in galleryImages[:GALLERY_PRELOADED]:
+        galleryImg.load(skipTexture=True)
+    gallerySizes = [(1920 - ((i * 97) % 1200), 1080 + ((i * 61) % 900)) for i in range(GALLERY_SIZE)]
+
+    def fileSelect():
+        comps.uiFileSelect()
+
+    def textInput():
+        comps.uiTextInput("Text Input", "This is a demo text input.", "Submit", lambda answer: None)
+
+    def imageDraw():
+        imgui.begin("Image")
+        img.draw((640, 360))
+        imgui.end()
+
+    def gallery():
+        imgui.set_next_window_position(0, 0)
+        imgui.set_next_window_size(*DEFAULT_DISPLAY_SIZE)
+        imgui.begin("Gallery")
+        comps.uiGallery(galleryImages)
+        imgui.end()
+
+    def justifiedGallery():
+        imgui.set_next_window_position(0, 0)
+        imgui.set_next_window_size(*DEFAULT_DISPLAY_SIZE)
+        imgui.begin("Justified Gallery")
+        comps.uiJustifiedGallery(galleryImages, gallerySizes)
+        imgui.end()
+
+    return {
+        "uiFileSelect": fileSelect,
+        "uiTextInput": textInput,
+        "ImguiImage.draw": imageDraw,
+        "uiGallery (100k)": gallery,
+        "uiJustifiedGallery (100k)": justifiedGallery,
+        "show_test_window": show_test_window
+    }
+
+def compareToBaseline(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Returns a list of string descriptions of every scenario whose p50 CPU time grew by more than `tolerance` over the baseline.
+
+    results: A dict of results from this run keyed by scenario.
+    baseline: A dict of results from a previous run keyed by scenario.
+    tolerance: A float fraction of allowed growth.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name in baseline:
+            old = baseline[name]["cpu"]["p50"]
+            new = result["cpu"]["p50"]
+            if (old > 0) and (new > old * (1 + tolerance)):
+                regressions.append(f"{name}: {old:.3f} ms -> {new:.3f} ms")
+
+    return regressions
+
+## Execution
+if __name__ == "__main__":
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Measures the per frame cost of the included components without a window.")
+    parser.add_argument("--frames", type=int, default=500, help="Frames to measure per component.")
+    parser.add_argument("--json", default=None, help="A filepath to write the results to as JSON.")
+    parser.add_argument("--baseline", default=None, help="A filepath of previous JSON results to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed fractional growth in p50 CPU time over the baseline.")
+    args = parser.parse_args()
+
+    # Run each scenario in a fresh context
+    results = {}
+    with tempfile.TemporaryDirectory() as workDir:
+        for name, build in buildScenarios(workDir).items():
+            with HeadlessFrameBuilder() as builder:
+                results[name] = builder.run(build, args.frames)
+
+    # Report
+    print(f"{'Component':<28}{'CPU p50 ms':>12}{'CPU p99 ms':>12}{'Verts':>8}{'Indices':>9}{'Cmds':>6}")
+    for name, r in results.items():
+        print(f"{name:<28}{r['cpu']['p50']:>12.3f}{r['cpu']['p99']:>12.3f}{r['vertices']['p50']:>8}{r['indices']['p50']:>9}{r['commands']['p50']:>6}")
+
+    if args.json != None:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=4)
+
+    # Compare to the baseline
+    if args.baseline != None:
+        with open(args.baseline, "r") as f:
+            regressions = compareToBaseline(results, json.load(f), args.tolerance)
+
+        if len(regressions) > 0:
+            print("Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
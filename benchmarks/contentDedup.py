@@ -0,0 +1,120 @@
+## ImGui Boilerplate: Content Dedup Benchmark
+## Compares loading a folder full of duplicate photos keyed by path with loading it keyed by content through `dedup=True`.
+## Run from the repository root: `python benchmarks/contentDedup.py [--images 12] [--copies 4] [--headless]`
+## Headless runs use Pyglet's EGL backend and PyOpenGL's EGL platform.
+
+## Imports
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+## Constants
+SOURCE_SIZE = (3000, 2000)
+THUMB_LIMIT = (512, 512)
+
+## Functions
+def makeCorpus(directory: str, count: int, copies: int) -> list:
+    """
+    Writes a corpus of noisy JPEG photos, each with copies, a symlink, and a hard link, and returns every path.
+
+    directory: A string directory to write the photos into.
+    count: An int number of distinct photos.
+    copies: An int number of byte for byte copies of each photo.
+    """
+    from PIL import Image
+    noise = Image.effect_noise(SOURCE_SIZE, 64).convert("RGB")
+    paths = []
+    for i in range(count):
+        # Write the photo
+        path = os.path.join(directory, f"{i}.jpg")
+        Image.blend(noise, Image.new("RGB", SOURCE_SIZE, ((i * 37) % 256, 90, 160)), 0.5).save(path, quality=90)
+        paths.append(path)
+
+        # Duplicate it
+        for k in range(copies):
+            copyPath = os.path.join(directory, f"{i}_copy{k}.jpg")
+            shutil.copyfile(path, copyPath)
+            paths.append(copyPath)
+
+        linkPath = os.path.join(directory, f"{i}_link.jpg")
+        os.symlink(path, linkPath)
+        paths.append(linkPath)
+
+        hardPath = os.path.join(directory, f"{i}_hard.jpg")
+        os.link(path, hardPath)
+        paths.append(hardPath)
+
+    noise.close()
+    return paths
+
+def timeLoad(paths: list, loader, dedup: bool) -> float:
+    """
+    Returns the seconds to load every photo asynchronously and upload its texture.
+
+    paths: A list of string filepaths.
+    loader: The `ImageLoader` to decode with.
+    dedup: If `True`, images are keyed by content.
+    """
+    from imguiRenderer.imguiImage import ImguiImage
+    from imguiRenderer.imageLoader import STATE_UPLOADED, STATE_FAILED
+
+    start = time.perf_counter()
+    images = [ImguiImage(path, thumbLimit=THUMB_LIMIT, dedup=dedup) for path in paths]
+    for img in images:
+        img.loadAsync(loader=loader)
+
+    while any(not (img.state in (STATE_UPLOADED, STATE_FAILED)) for img in images):
+        loader.processUploads(None)
+        loader.waitForReady(0.05)
+
+    return time.perf_counter() - start
+
+## Execution
+if __name__ == "__main__":
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Compares loading duplicate photos keyed by path and keyed by content.")
+    parser.add_argument("--images", type=int, default=12, help="Distinct photos in the corpus.")
+    parser.add_argument("--copies", type=int, default=4, help="Copies of each photo, on top of a symlink and a hard link.")
+    parser.add_argument("--headless", action="store_true", help="Render through an offscreen EGL context.")
+    args = parser.parse_args()
+
+    # Configure Pyglet and PyOpenGL before any windowing is imported
+    import pyglet
+    pyglet.options["headless"] = args.headless
+    if args.headless:
+        os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from imguiRenderer.imageLoader import ImageLoader
+    from imguiRenderer.textureCache import TextureCache
+    from imguiRenderer.contentIndex import ContentIndex
+
+    # Create a GL context
+    window = pyglet.window.Window(width=64, height=64, visible=False)
+    loader = ImageLoader()
+
+    with tempfile.TemporaryDirectory() as workDir:
+        paths = makeCorpus(workDir, args.images, args.copies)
+
+        # Measure each keying from an empty texture cache
+        results = []
+        for name, dedup in (("path", False), ("content", True)):
+            TextureCache.shared().clear()
+            seconds = timeLoad(paths, loader, dedup)
+            results.append((name, seconds, len(TextureCache.shared()), TextureCache.shared().bytes))
+
+    loader.shutdown()
+
+    # Report
+    print(f"{len(paths)} paths to {args.images} distinct photos")
+    print(f"{'Keying':<10}{'Seconds':>9}{'Textures':>10}{'Texture MB':>12}")
+    for name, seconds, textures, textureBytes in results:
+        print(f"{name:<10}{seconds:>9.2f}{textures:>10}{textureBytes / (1024 * 1024):>12.1f}")
+
+    stats = ContentIndex.shared().stats()
+    print(f"Hashed {stats['hashes']} files ({stats['hashedBytes'] / (1024 * 1024):.1f} MB), {stats['statHits']} known by stat")
+    print(f"Saved {stats['decodesSaved']} decodes, {stats['uploadsSaved']} uploads, and {stats['bytesSaved'] / (1024 * 1024):.1f} MB of texture memory")
+
+    window.close()
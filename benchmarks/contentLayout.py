@@ -0,0 +1,80 @@
+## ImGui Boilerplate: Content Layout Benchmark
+## Compares laying out a large gallery with `ImguiImage.calculateContentBestSize(...)` in a loop with `ContentLayout.calculateContentBestSizes(...)`, and times justified rows across a window resize with and without `JustifiedLayout` caching.
+## Run from the repository root: `python benchmarks/contentLayout.py [--items 50000] [--repeats 5]`
+
+## Imports
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import numpy as np
+from imguiRenderer.imguiImage import ImguiImage
+from imguiRenderer.contentLayout import ContentLayout, JustifiedLayout
+
+## Constants
+CELL_SIZE = (160, 120)
+ROW_HEIGHT = 160
+SPACING = (8, 4)
+RESIZE_WIDTHS = list(range(1280, 1600, 4)) + list(range(1600, 1280, -4))
+
+## Functions
+def makeSizes(count: int) -> list:
+    """
+    Returns a list of random photo sizes as (width, height) tuples.
+
+    count: An int number of sizes.
+    """
+    rng = random.Random(0)
+    return [(rng.randint(400, 6000), rng.randint(400, 6000)) for _ in range(count)]
+
+def best(measure, repeats: int) -> float:
+    """
+    Returns the fastest seconds of the repeated measurement.
+
+    measure: A function to time.
+    repeats: An int number of times to run it.
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        measure()
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+## Execution
+if __name__ == "__main__":
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Compares scalar and vectorized content layout.")
+    parser.add_argument("--items", type=int, default=50000, help="Contents to lay out.")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per measurement. The fastest is reported.")
+    args = parser.parse_args()
+
+    sizes = makeSizes(args.items)
+    sizeArray = np.asarray(sizes)
+
+    # Fit every content into a cell
+    scalar = best(lambda: [ImguiImage.calculateContentBestSize(size, CELL_SIZE, True) for size in sizes], args.repeats)
+    batched = best(lambda: ContentLayout.calculateContentBestSizes(sizeArray, CELL_SIZE, True), args.repeats)
+
+    # Resize a justified view across widths and back
+    def resize(layout):
+        for width in RESIZE_WIDTHS:
+            layout.layout(width)
+
+    uncached = best(lambda: resize(JustifiedLayout(sizeArray, ROW_HEIGHT, SPACING, cachedWidths=1)), args.repeats)
+    cachedLayout = JustifiedLayout(sizeArray, ROW_HEIGHT, SPACING, cachedWidths=len(RESIZE_WIDTHS))
+    resize(cachedLayout)
+    cached = best(lambda: resize(cachedLayout), args.repeats)
+
+    # Report
+    frames = len(RESIZE_WIDTHS)
+    print(f"{'Layout':<34}{'Total ms':>10}{'Per call ms':>13}")
+    print(f"{'calculateContentBestSize loop':<34}{scalar * 1000:>10.2f}{scalar * 1000:>13.3f}")
+    print(f"{'calculateContentBestSizes':<34}{batched * 1000:>10.2f}{batched * 1000:>13.3f}")
+    print(f"{'justified resize, new widths':<34}{uncached * 1000:>10.2f}{uncached * 1000 / frames:>13.3f}")
+    print(f"{'justified resize, cached widths':<34}{cached * 1000:>10.2f}{cached * 1000 / frames:>13.3f}")
+    print(f"{args.items} contents, {frames} resize frames. Vectorized fit is {scalar / batched:.1f}x faster.")
@@ -0,0 +1,102 @@
+## ImGui Boilerplate: Idle CPU Benchmark
+## Measures the CPU used by the demo menu while idle under each redraw policy.
+## Run from the repository root: `python benchmarks/idleCpu.py [--seconds 10] [--headless]`
+
+## Imports
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+## Constants
+POLICIES = ["continuous", "hybrid", "onDemand"]
+
+## Functions
+def measurePolicy(policy: str, seconds: float, headless: bool, warmup: float = 2.0):
+    """
+    Runs the full demo with the provided redraw policy and reports the CPU it used while idle.
+    Must be run in its own process as Pyglet cannot reopen its event loop cleanly.
+
+    policy: A string redraw policy from the renderer's `REDRAW_...` constants.
+    seconds: A float number of seconds to leave the window idle for.
+    warmup: A float number of seconds to ignore while the window opens and the keep alive window closes.
+    headless: If `True`, renders through an offscreen EGL context instead of a display.
+
+    Returns a dict of the measurements.
+    """
+    # Configure Pyglet and PyOpenGL before any windowing is imported
+    import pyglet
+    pyglet.options["headless"] = headless
+    if headless:
+        os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    import imgui
+    from imguiRenderer.renderer import PygletImGuiFull
+
+    # Count the frames drawn
+    runner = PygletImGuiFull()
+    state = {"frames": 0, "wall": 0.0, "cpu": 0.0}
+    baseDraw = runner._draw
+
+    def countedDraw(data):
+        # Keep the run from reading or writing the window layout file
+        if state["frames"] == 0:
+            imgui.get_io().ini_file_name = None
+
+        state["frames"] += 1
+        baseDraw(data)
+    runner._draw = countedDraw
+
+    # Start measuring after the warmup
+    def startMeasuring(dt):
+        state["frames"] = 0
+        state["wall"] = time.perf_counter()
+        state["cpu"] = time.process_time()
+    pyglet.clock.schedule_once(startMeasuring, warmup)
+
+    # Stop after the idle period
+    pyglet.clock.schedule_once(lambda dt: pyglet.app.exit(), warmup + seconds)
+
+    # Run the window
+    runner.present("Idle CPU Benchmark", redrawPolicy=policy)
+    cpuUsed = time.process_time() - state["cpu"]
+    wallUsed = time.perf_counter() - state["wall"]
+
+    return {
+        "policy": policy,
+        "seconds": wallUsed,
+        "cpuSeconds": cpuUsed,
+        "cpuPercent": (cpuUsed / wallUsed) * 100,
+        "frames": state["frames"]
+    }
+
+## Execution
+if __name__ == "__main__":
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Measures idle CPU use of the demo menu under each redraw policy.")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Seconds to leave each window idle for.")
+    parser.add_argument("--headless", action="store_true", help="Render through an offscreen EGL context.")
+    parser.add_argument("--policy", choices=POLICIES, default=None, help="Measure only this policy in the current process.")
+    args = parser.parse_args()
+
+    if args.policy != None:
+        # Measure a single policy
+        print(json.dumps(measurePolicy(args.policy, args.seconds, args.headless)))
+    else:
+        # Measure each policy in a fresh process
+        results = []
+        for policy in POLICIES:
+            cmd = [sys.executable, os.path.abspath(__file__), "--policy", policy, "--seconds", str(args.seconds)]
+            if args.headless:
+                cmd.append("--headless")
+
+            out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+
+        # Report
+        print(f"{'Policy':<12}{'CPU %':>8}{'CPU s':>8}{'Frames':>8}")
+        for r in results:
+            print(f"{r['policy']:<12}{r['cpuPercent']:>8.1f}{r['cpuSeconds']:>8.2f}{r['frames']:>8}")
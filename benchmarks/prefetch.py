@@ -0,0 +1,169 @@
+## ImGui Boilerplate: Prefetch Benchmark
+## Steps through a folder of photos one at a time like a viewer driven by the arrow keys, loading each with `ImguiImage.load()` and with a `PrefetchController`, and compares how long each step waits before its image can be shown.
+## Run from the repository root: `python benchmarks/prefetch.py [--images 60] [--interval 0.25] [--headless]`
+## Headless runs use Pyglet's EGL backend and PyOpenGL's EGL platform.
+
+## Imports
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+## Constants
+SOURCE_SIZE = (3000, 2000)
+THUMB_LIMIT = (1280, 720)
+FRAME_TIME = 1 / 60
+
+## Functions
+def makeCorpus(directory: str, count: int) -> list:
+    """
+    Writes a corpus of noisy JPEG photos and returns their paths.
+
+    directory: A string directory to write the photos into.
+    count: An int number of photos.
+    """
+    from PIL import Image
+    noise = Image.effect_noise(SOURCE_SIZE, 64).convert("RGB")
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"{i}.jpg")
+        Image.blend(noise, Image.new("RGB", SOURCE_SIZE, ((i * 37) % 256, 90, 160)), 0.5).save(path, quality=90)
+        paths.append(path)
+
+    noise.close()
+    return paths
+
+def makeSteps(count: int, interval: float) -> list:
+    """
+    Returns a list of (cursor index, seconds to wait before the step) moves.
+    Steps forward through the first half at the interval, holds the key down through a burst at a fifth of it, steps back a few images, then jumps to the end and steps back from it.
+
+    count: An int number of photos.
+    interval: A float number of seconds between normal steps.
+    """
+    half = count // 2
+    steps = [(i, interval) for i in range(1, half)]
+    steps += [(i, interval / 5) for i in range(half, half + (count // 4))]
+    cursor = steps[-1][0]
+    steps += [(cursor - i, interval) for i in range(1, 4)]
+    steps += [(count - 1, interval)]
+    steps += [(count - 1 - i, interval) for i in range(1, 6)]
+    return steps
+
+def stepSynchronous(paths: list, steps: list) -> list:
+    """
+    Loads the image at each step with `ImguiImage.load()` and returns the seconds each step waited.
+
+    paths: A list of string filepaths.
+    steps: A list of (cursor index, seconds to wait before the step) moves.
+    """
+    from imguiRenderer.imguiImage import ImguiImage
+    from imguiRenderer.textureCache import TextureCache
+
+    images = [ImguiImage(path, thumbLimit=THUMB_LIMIT) for path in paths]
+    waits = []
+    for index, delay in steps:
+        TextureCache.advanceFrame()
+        time.sleep(delay)
+        start = time.perf_counter()
+        images[index].load()
+        images[index].getTexture()
+        waits.append(time.perf_counter() - start)
+
+    for img in images:
+        img.close()
+    return waits
+
+def stepPrefetched(paths: list, steps: list) -> tuple:
+    """
+    Runs a render loop at 60 Hz stepping a `PrefetchController` and returns the seconds each step waited and the controller's stats.
+    A step waits from the moment the cursor moves until the frame its image is uploaded.
+
+    paths: A list of string filepaths.
+    steps: A list of (cursor index, seconds to wait before the step) moves.
+    """
+    from imguiRenderer.imguiImage import ImguiImage
+    from imguiRenderer.imageLoader import ImageLoader, STATE_UPLOADED
+    from imguiRenderer.textureCache import TextureCache
+    from imguiRenderer.prefetchController import PrefetchController
+
+    def frame():
+        # Upload like `PygletImGui` does at the start of each frame
+        TextureCache.advanceFrame()
+        ImageLoader.processAll()
+        prefetcher.update()
+        time.sleep(FRAME_TIME)
+
+    images = [ImguiImage(path, thumbLimit=THUMB_LIMIT) for path in paths]
+    prefetcher = PrefetchController(images)
+    waits = []
+    for index, delay in steps:
+        # Keep drawing until the next step
+        due = time.perf_counter() + delay
+        while time.perf_counter() < due:
+            frame()
+
+        # Step and draw until the image can be shown
+        start = time.perf_counter()
+        img = prefetcher.setCursor(index)
+        while img.state != STATE_UPLOADED:
+            frame()
+        waits.append(time.perf_counter() - start)
+
+    stats = prefetcher.stats()
+    prefetcher.close()
+    return (waits, stats)
+
+def summarize(waits: list) -> tuple:
+    """
+    Returns a tuple of the mean, 95th percentile, and max of the waits in milliseconds.
+
+    waits: A list of float seconds.
+    """
+    ordered = sorted(waits)
+    return (
+        sum(ordered) * 1000 / len(ordered),
+        ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        ordered[-1] * 1000
+    )
+
+## Execution
+if __name__ == "__main__":
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Compares step latency with synchronous loads and with a prefetch controller.")
+    parser.add_argument("--images", type=int, default=60, help="Photos in the corpus.")
+    parser.add_argument("--interval", type=float, default=0.25, help="Seconds between normal steps. Bursts step five times as fast.")
+    parser.add_argument("--headless", action="store_true", help="Render through an offscreen EGL context.")
+    args = parser.parse_args()
+
+    # Configure Pyglet and PyOpenGL before any windowing is imported
+    import pyglet
+    pyglet.options["headless"] = args.headless
+    if args.headless:
+        os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from imguiRenderer.textureCache import TextureCache
+
+    # Create a GL context
+    window = pyglet.window.Window(width=64, height=64, visible=False)
+
+    with tempfile.TemporaryDirectory() as workDir:
+        paths = makeCorpus(workDir, args.images)
+        steps = makeSteps(args.images, args.interval)
+
+        # Measure each method from an empty texture cache
+        TextureCache.shared().clear()
+        syncWaits = stepSynchronous(paths, steps)
+        TextureCache.shared().clear()
+        prefetchWaits, stats = stepPrefetched(paths, steps)
+        TextureCache.shared().clear()
+
+    # Report
+    print(f"{'Method':<12}{'Mean ms':>9}{'p95 ms':>9}{'Max ms':>9}")
+    for name, waits in (("load()", syncWaits), ("prefetch", prefetchWaits)):
+        mean, p95, worst = summarize(waits)
+        print(f"{name:<12}{mean:>9.1f}{p95:>9.1f}{worst:>9.1f}")
+    print(f"{stats['steps']} steps, {stats['hits']} ready when stepped to ({stats['hitRate'] * 100:.0f}%), {stats['jumps']} jumps, {stats['prefetched']} loads, {stats['cancelled']} cancelled, {stats['evicted']} closed.")
+
+    window.close()
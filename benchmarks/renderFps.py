@@ -0,0 +1,75 @@
+## ImGui Boilerplate: End to End Render Benchmark
+## Renders the full demo menu for a fixed number of frames and reports the frame timings as JSON.
+## Run from the repository root: `python benchmarks/renderFps.py [--frames 1000] [--headless] [--json out.json]`
+## Headless runs use Pyglet's EGL backend and PyOpenGL's EGL platform.
+
+## Imports
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+
+## Functions
+def runBenchmark(frames: int, headless: bool, size: tuple) -> dict:
+    """
+    Renders `PygletImGuiFull` for the provided number of frames.
+
+    frames: An int number of frames to render.
+    headless: If `True`, renders through an offscreen EGL context instead of a display.
+    size: A tuple containing the window size as (width, height).
+
+    Returns a dict report with the frame rate and per phase timings in milliseconds.
+    """
+    # Configure Pyglet and PyOpenGL before any windowing is imported
+    import pyglet
+    pyglet.options["headless"] = headless
+    if headless:
+        os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from pyglet import gl
+    from imguiRenderer.renderer import PygletImGuiFull
+
+    # Render the frames
+    runner = PygletImGuiFull()
+    wallStart = time.perf_counter()
+    summary = runner.present("Render Benchmark", size=size, frameLimit=frames)
+    wallUsed = time.perf_counter() - wallStart
+
+    # Build the report
+    frameStats = summary["frame"]
+    return {
+        "frames": frames,
+        "fps": frames / (frameStats["mean"] * frameStats["count"]),
+        "wallSeconds": wallUsed,
+        "headless": headless,
+        "size": list(size),
+        "glRenderer": gl.gl_info.get_renderer(),
+        "glVersion": gl.gl_info.get_version_string(),
+        "pyglet": pyglet.version,
+        "python": platform.python_version(),
+        "phases": {name: {key: (value * 1000 if key != "count" else value) for key, value in stats.items()} for name, stats in summary.items()}
+    }
+
+## Execution
+if __name__ == "__main__":
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Renders the full demo menu for a fixed number of frames and reports the timings as JSON.")
+    parser.add_argument("--frames", type=int, default=1000, help="Frames to render.")
+    parser.add_argument("--headless", action="store_true", help="Render through an offscreen EGL context.")
+    parser.add_argument("--width", type=int, default=1280, help="Window width.")
+    parser.add_argument("--height", type=int, default=720, help="Window height.")
+    parser.add_argument("--json", default=None, help="A filepath to write the report to. Printed if not provided.")
+    args = parser.parse_args()
+
+    # Run
+    report = runBenchmark(args.frames, args.headless, (args.width, args.height))
+
+    # Output
+    if args.json != None:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
@@ -0,0 +1,126 @@
+## ImGui Boilerplate: Stream Upload Benchmark
+## Compares showing each new frame of a live feed by writing it to a file and loading an `ImguiImage` with pushing it into a `StreamImage`.
+## Run from the repository root: `python benchmarks/streamUpload.py [--frames 60] [--headless]`
+## Headless runs use Pyglet's EGL backend and PyOpenGL's EGL platform.
+
+## Imports
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+## Constants
+SIZES = [(640, 480), (1280, 720), (1920, 1080)]
+
+## Functions
+def makeFrames(size: tuple, count: int) -> list:
+    """
+    Returns a list of RGB frames of the provided size as bytes, each differing from the last.
+
+    size: A tuple containing the frame size as (width, height).
+    count: An int number of distinct frames.
+    """
+    from PIL import Image
+    noise = Image.effect_noise(size, 64).convert("RGB")
+    frames = []
+    for i in range(count):
+        frames.append(Image.blend(noise, Image.new("RGB", size, ((i * 40) % 256, 80, 160)), 0.5).tobytes())
+
+    noise.close()
+    return frames
+
+def timeFile(frames: list, size: tuple, workDir: str, count: int) -> float:
+    """
+    Returns the mean milliseconds to show each frame by saving it as a PNG and loading it with `ImguiImage`.
+
+    frames: A list of RGB frames as bytes.
+    size: A tuple containing the frame size as (width, height).
+    workDir: A string directory to write the frames into.
+    count: An int number of frames to show.
+    """
+    from PIL import Image
+    from pyglet import gl
+    from imguiRenderer.imguiImage import ImguiImage
+    from imguiRenderer.textureCache import TextureCache
+
+    path = os.path.join(workDir, "frame.png")
+    start = time.perf_counter()
+    for i in range(count):
+        TextureCache.advanceFrame()
+
+        # Write the frame
+        Image.frombytes("RGB", size, frames[i % len(frames)]).save(path)
+
+        # Load and upload it
+        img = ImguiImage(path, thumbLimit=None)
+        img.load()
+        img.getTexture()
+        gl.glFinish()
+
+        TextureCache.shared().release(img.textureKey())
+        img.close()
+
+    return ((time.perf_counter() - start) * 1000) / count
+
+def timeStream(frames: list, size: tuple, count: int) -> tuple:
+    """
+    Returns the mean milliseconds to push each frame into a `StreamImage` and to upload it, as (push ms, upload ms).
+
+    frames: A list of RGB frames as bytes.
+    size: A tuple containing the frame size as (width, height).
+    count: An int number of frames to show.
+    """
+    from pyglet import gl
+    from imguiRenderer.streamImage import StreamImage
+    from imguiRenderer.textureCache import TextureCache
+
+    stream = StreamImage()
+    pushTime = 0.0
+    uploadTime = 0.0
+    for i in range(count):
+        TextureCache.advanceFrame()
+
+        # Push the frame
+        start = time.perf_counter()
+        stream.push(frames[i % len(frames)], size, "RGB")
+        pushTime += time.perf_counter() - start
+
+        # Upload it
+        start = time.perf_counter()
+        stream.getTexture()
+        gl.glFinish()
+        uploadTime += time.perf_counter() - start
+
+    stream.close()
+    return ((pushTime * 1000) / count, (uploadTime * 1000) / count)
+
+## Execution
+if __name__ == "__main__":
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Compares showing live frames through files and ImguiImage with pushing them into a StreamImage.")
+    parser.add_argument("--frames", type=int, default=60, help="Frames to show per size and method.")
+    parser.add_argument("--headless", action="store_true", help="Render through an offscreen EGL context.")
+    args = parser.parse_args()
+
+    # Configure Pyglet and PyOpenGL before any windowing is imported
+    import pyglet
+    pyglet.options["headless"] = args.headless
+    if args.headless:
+        os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+    # Create a GL context
+    window = pyglet.window.Window(width=64, height=64, visible=False)
+
+    # Report
+    print(f"{'Size':<12}{'File ms':>10}{'Push ms':>10}{'Upload ms':>11}{'Stream Hz':>11}{'Speedup':>9}")
+    with tempfile.TemporaryDirectory() as workDir:
+        for size in SIZES:
+            frames = makeFrames(size, 8)
+            fileMs = timeFile(frames, size, workDir, args.frames)
+            pushMs, uploadMs = timeStream(frames, size, args.frames)
+
+            print(f"{f'{size[0]}x{size[1]}':<12}{fileMs:>10.2f}{pushMs:>10.2f}{uploadMs:>11.2f}{1000 / (pushMs + uploadMs):>11.0f}{fileMs / (pushMs + uploadMs):>8.1f}x")
+
+    window.close()
@@ -0,0 +1,129 @@
+## ImGui Boilerplate: Texture Atlas Benchmark
+## Renders a gallery of small thumbnails with one texture per image and with a `TextureAtlas`, then compares their draw commands and render times.
+## Run from the repository root: `python benchmarks/textureAtlas.py [--images 400] [--frames 300] [--headless]`
+## Headless runs use Pyglet's EGL backend and PyOpenGL's EGL platform.
+
+## Imports
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+## Constants
+MODES = ["textures", "atlas"]
+THUMB_SIZE = 64
+
+## Functions
+def measureMode(mode: str, imageCount: int, frames: int, headless: bool) -> dict:
+    """
+    Renders a gallery of small thumbnails and reports its draw data and render timings.
+    Must be run in its own process as Pyglet cannot reopen its event loop cleanly.
+
+    mode: A string from `MODES`. `atlas` packs every thumbnail into a `TextureAtlas`.
+    imageCount: An int number of images in the gallery.
+    frames: An int number of frames to render.
+    headless: If `True`, renders through an offscreen EGL context instead of a display.
+
+    Returns a dict of the measurements.
+    """
+    # Configure Pyglet and PyOpenGL before any windowing is imported
+    import pyglet
+    pyglet.options["headless"] = headless
+    if headless:
+        os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    import imgui
+    from PIL import Image
+    from imguiRenderer.renderer import PygletImGui, DEFAULT_WIN_SIZE
+    from imguiRenderer.components.gallery import GalleryComponent
+    from imguiRenderer.imguiImage import ImguiImage
+    from imguiRenderer.textureAtlas import TextureAtlas
+
+    # Write the thumbnails
+    workDir = tempfile.mkdtemp()
+    paths = []
+    for i in range(imageCount):
+        path = os.path.join(workDir, f"{i}.png")
+        Image.new("RGB", (THUMB_SIZE, THUMB_SIZE), ((i * 7) % 256, (i * 13) % 256, (i * 29) % 256)).save(path)
+        paths.append(path)
+
+    class Runner(PygletImGui, GalleryComponent):
+        def __init__(self):
+            super().__init__()
+            GalleryComponent.__init__(self)
+            self.images = []
+            self.atlas = None
+            self.commands = []
+
+        def renderImgui(self, data):
+            # Count the previous frame's draw commands
+            drawData = imgui.get_draw_data()
+            if (drawData != None) and (len(self.images) > 0):
+                self.commands.append(sum(len(cmdList.commands) for cmdList in drawData.commands_lists))
+
+            # Load the images once a GL context exists
+            if len(self.images) == 0:
+                if mode == "atlas":
+                    self.atlas = TextureAtlas()
+                self.images = [ImguiImage(path, thumbLimit=(THUMB_SIZE, THUMB_SIZE), atlas=self.atlas) for path in paths]
+                for img in self.images:
+                    img.load()
+
+            # Draw the gallery
+            imgui.new_frame()
+            imgui.set_next_window_position(0, 0)
+            imgui.set_next_window_size(*DEFAULT_WIN_SIZE)
+            imgui.begin("Gallery")
+            self.uiGallery(self.images, cellSize=(THUMB_SIZE, THUMB_SIZE))
+            imgui.end()
+
+    # Render the frames
+    runner = Runner()
+    summary = runner.present("Texture Atlas Benchmark", frameLimit=frames)
+    commands = sorted(runner.commands)
+
+    result = {
+        "mode": mode,
+        "images": imageCount,
+        "commands": commands[len(commands) // 2],
+        "rendererMs": summary["renderer"]["p50"] * 1000,
+        "frameMs": summary["frame"]["p50"] * 1000
+    }
+    if runner.atlas != None:
+        stats = runner.atlas.stats()
+        result["atlasPages"] = stats["pages"]
+        result["atlasOccupancy"] = stats["occupancy"]
+
+    return result
+
+## Execution
+if __name__ == "__main__":
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Compares a gallery of small thumbnails drawn with and without a texture atlas.")
+    parser.add_argument("--images", type=int, default=400, help="Images in the gallery.")
+    parser.add_argument("--frames", type=int, default=300, help="Frames to render.")
+    parser.add_argument("--headless", action="store_true", help="Render through an offscreen EGL context.")
+    parser.add_argument("--mode", choices=MODES, default=None, help="Measure only this mode in the current process.")
+    args = parser.parse_args()
+
+    if args.mode != None:
+        # Measure a single mode
+        print(json.dumps(measureMode(args.mode, args.images, args.frames, args.headless)))
+    else:
+        # Measure each mode in a fresh process
+        results = []
+        for mode in MODES:
+            cmd = [sys.executable, os.path.abspath(__file__), "--mode", mode, "--images", str(args.images), "--frames", str(args.frames)]
+            if args.headless:
+                cmd.append("--headless")
+
+            out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+
+        # Report
+        print(f"{'Mode':<10}{'Draw cmds':>11}{'Renderer ms':>13}{'Frame ms':>10}")
+        for r in results:
+            print(f"{r['mode']:<10}{r['commands']:>11}{r['rendererMs']:>13.3f}{r['frameMs']:>10.3f}")
@@ -0,0 +1,120 @@
+## ImGui Boilerplate: Texture Level of Detail Benchmark
+## Renders a zoomed out gallery of large thumbnails with full size textures, with mipmaps, and with level of detail selection, then compares the texture memory each uses.
+## Run from the repository root: `python benchmarks/textureLod.py [--images 48] [--frames 300] [--headless]`
+## Headless runs use Pyglet's EGL backend and PyOpenGL's EGL platform.
+
+## Imports
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+## Constants
+MODES = ["plain", "mipmaps", "lod"]
+SOURCE_SIZE = (1920, 1080)
+CELL_SIZE = (150, 100)
+
+## Functions
+def measureMode(mode: str, imageCount: int, frames: int, headless: bool) -> dict:
+    """
+    Renders a gallery of large thumbnails in small cells and reports its texture memory and render timings.
+    Must be run in its own process as Pyglet cannot reopen its event loop cleanly.
+
+    mode: A string from `MODES`. `mipmaps` generates mipmaps for each texture and `lod` also switches to smaller textures.
+    imageCount: An int number of images in the gallery.
+    frames: An int number of frames to render.
+    headless: If `True`, renders through an offscreen EGL context instead of a display.
+
+    Returns a dict of the measurements.
+    """
+    # Configure Pyglet and PyOpenGL before any windowing is imported
+    import pyglet
+    pyglet.options["headless"] = headless
+    if headless:
+        os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    import imgui
+    from PIL import Image
+    from imguiRenderer.renderer import PygletImGui, DEFAULT_WIN_SIZE
+    from imguiRenderer.components.gallery import GalleryComponent
+    from imguiRenderer.imguiImage import ImguiImage
+    from imguiRenderer.imageLoader import ImageLoader
+    from imguiRenderer.textureCache import TextureCache
+
+    # Write the images
+    workDir = tempfile.mkdtemp()
+    paths = []
+    for i in range(imageCount):
+        path = os.path.join(workDir, f"{i}.jpg")
+        Image.effect_noise(SOURCE_SIZE, 32 + i).convert("RGB").save(path)
+        paths.append(path)
+
+    class Runner(PygletImGui, GalleryComponent):
+        def __init__(self):
+            super().__init__()
+            GalleryComponent.__init__(self)
+            self.images = []
+            self.frameBytes = []
+
+        def renderImgui(self, data):
+            # Load the images once a GL context exists
+            if len(self.images) == 0:
+                self.images = [ImguiImage(path, mipmaps=(mode != "plain"), lod=(mode == "lod")) for path in paths]
+                for img in self.images:
+                    img.load()
+
+            # Draw the gallery
+            imgui.new_frame()
+            imgui.set_next_window_position(0, 0)
+            imgui.set_next_window_size(*DEFAULT_WIN_SIZE)
+            imgui.begin("Gallery")
+            self.uiGallery(self.images, cellSize=CELL_SIZE)
+            imgui.end()
+
+            # Record the texture memory drawn once every level has loaded
+            if ImageLoader.pendingAll() == 0:
+                self.frameBytes.append(TextureCache.shared().stats()["frameBytes"])
+
+    # Render the frames
+    runner = Runner()
+    summary = runner.present("Texture LOD Benchmark", frameLimit=frames)
+
+    return {
+        "mode": mode,
+        "images": imageCount,
+        "frameBytes": runner.frameBytes[-1] if len(runner.frameBytes) > 0 else 0,
+        "rendererMs": summary["renderer"]["p50"] * 1000,
+        "frameMs": summary["frame"]["p50"] * 1000
+    }
+
+## Execution
+if __name__ == "__main__":
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Compares a zoomed out gallery drawn with full size textures, mipmaps, and level of detail selection.")
+    parser.add_argument("--images", type=int, default=48, help="Images in the gallery.")
+    parser.add_argument("--frames", type=int, default=300, help="Frames to render.")
+    parser.add_argument("--headless", action="store_true", help="Render through an offscreen EGL context.")
+    parser.add_argument("--mode", choices=MODES, default=None, help="Measure only this mode in the current process.")
+    args = parser.parse_args()
+
+    if args.mode != None:
+        # Measure a single mode
+        print(json.dumps(measureMode(args.mode, args.images, args.frames, args.headless)))
+    else:
+        # Measure each mode in a fresh process
+        results = []
+        for mode in MODES:
+            cmd = [sys.executable, os.path.abspath(__file__), "--mode", mode, "--images", str(args.images), "--frames", str(args.frames)]
+            if args.headless:
+                cmd.append("--headless")
+
+            out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+
+        # Report
+        print(f"{'Mode':<10}{'Drawn MB':>10}{'Renderer ms':>13}{'Frame ms':>10}")
+        for r in results:
+            print(f"{r['mode']:<10}{r['frameBytes'] / (1024 * 1024):>10.1f}{r['rendererMs']:>13.3f}{r['frameMs']:>10.3f}")
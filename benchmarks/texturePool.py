@@ -0,0 +1,105 @@
+## ImGui Boilerplate: Texture Pool Benchmark
+## Scrolls a gallery of thumbnails through a `TextureCache` too small to hold them all, uploading each with a new texture and with a `TexturePool`, and compares upload times and the textures created and deleted.
+## Run from the repository root: `python benchmarks/texturePool.py [--images 400] [--visible 60] [--passes 3] [--headless]`
+## Headless runs use Pyglet's EGL backend and PyOpenGL's EGL platform.
+
+## Imports
+import os
+import sys
+import time
+import argparse
+
+## Constants
+THUMB_SIZES = ((512, 341), (512, 384), (512, 288), (341, 512), (384, 512), (512, 512))
+
+## Functions
+def makeThumbnails(count: int) -> list:
+    """
+    Returns a list of Pyglet `ImageData` thumbnails in a mix of common photo shapes.
+
+    count: An int number of thumbnails.
+    """
+    from pyglet import image as pygletImage
+    thumbs = []
+    for i in range(count):
+        width, height = THUMB_SIZES[i % len(THUMB_SIZES)]
+        pixels = bytes([(i * 37) % 256, 90, 160]) * (width * height)
+        thumbs.append(pygletImage.ImageData(width, height, "RGB", pixels, pitch=(width * 3)))
+
+    return thumbs
+
+def scroll(thumbs: list, visible: int, passes: int, upload) -> tuple:
+    """
+    Scrolls through the thumbnails one per frame, keeping only about `visible` textures cached.
+
+    thumbs: A list of Pyglet `ImageData` thumbnails.
+    visible: An int number of thumbnails the cache can hold.
+    passes: An int number of times to scroll through every thumbnail.
+    upload: A function taking an `ImageData` and returning a texture.
+
+    Returns a tuple of (seconds spent uploading, number of uploads).
+    """
+    from pyglet import gl
+    from imguiRenderer.textureCache import TextureCache
+
+    # Fit only the visible thumbnails
+    largest = max(w * h for w, h in THUMB_SIZES) * 4
+    cache = TextureCache(budget=(visible * largest))
+
+    uploads = 0
+    elapsed = 0.0
+    for _ in range(passes):
+        for i, thumb in enumerate(thumbs):
+            TextureCache.advanceFrame()
+            start = time.perf_counter()
+            cache.put(i, upload(thumb))
+            gl.glFinish()
+            elapsed += time.perf_counter() - start
+            uploads += 1
+
+    cache.clear()
+    return (elapsed, uploads)
+
+## Execution
+if __name__ == "__main__":
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Compares uploading scrolled thumbnails into new textures and into pooled textures.")
+    parser.add_argument("--images", type=int, default=400, help="Thumbnails in the gallery.")
+    parser.add_argument("--visible", type=int, default=60, help="Thumbnails the texture cache can hold.")
+    parser.add_argument("--passes", type=int, default=3, help="Times to scroll through the gallery.")
+    parser.add_argument("--headless", action="store_true", help="Render through an offscreen EGL context.")
+    args = parser.parse_args()
+
+    # Configure Pyglet and PyOpenGL before any windowing is imported
+    import pyglet
+    pyglet.options["headless"] = args.headless
+    if args.headless:
+        os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from imguiRenderer.texturePool import TexturePool
+
+    # Create a GL context
+    window = pyglet.window.Window(width=64, height=64, visible=False)
+    thumbs = makeThumbnails(args.images)
+
+    # Create and delete a texture for every upload
+    created = [0]
+    def uploadNew(thumb):
+        created[0] += 1
+        return thumb.create_texture(pyglet.image.Texture)
+
+    newTime, uploads = scroll(thumbs, args.visible, args.passes, uploadNew)
+
+    # Reuse textures through a pool
+    pool = TexturePool()
+    poolTime, _ = scroll(thumbs, args.visible, args.passes, lambda thumb: pool.acquire(thumb))
+    stats = pool.stats()
+    pool.clear()
+
+    # Report
+    print(f"{'Method':<10}{'ms/upload':>11}{'Created':>9}{'Deleted':>9}{'Reused':>8}")
+    print(f"{'new':<10}{newTime * 1000 / uploads:>11.3f}{created[0]:>9}{created[0]:>9}{0:>8}")
+    print(f"{'pooled':<10}{poolTime * 1000 / uploads:>11.3f}{stats['created']:>9}{stats['deleted']:>9}{stats['reused']:>8}")
+    print(f"Pool after scrolling: {stats['liveTextures']} textures, {stats['liveBytes'] / (1024 * 1024):.1f} MB, kept free for reuse up to its {stats['budget'] // (1024 * 1024)} MB budget.")
+
+    window.close()
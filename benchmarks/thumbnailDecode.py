@@ -0,0 +1,109 @@
+## ImGui Boilerplate: Thumbnail Decode Benchmark
+## Compares decoding every pixel before making a thumbnail with the reduced decode `ImguiImage` uses across a JPEG, PNG, and WebP corpus.
+## Run from the repository root: `python benchmarks/thumbnailDecode.py [--repeats 3] [--corpus ./images]`
+
+## Imports
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+from imguiRenderer.imguiImage import ImguiImage
+
+## Constants
+SIZES = [(1920, 1080), (4000, 3000), (6000, 4000)]
+FORMATS = [("JPEG", ".jpg"), ("PNG", ".png"), ("WEBP", ".webp")]
+THUMB_LIMIT = (1280, 720)
+
+## Functions
+def makeCorpus(directory: str) -> list:
+    """
+    Writes a synthetic image in every format and size to the provided directory.
+
+    directory: A string directory path to write the images in.
+
+    Returns a list of the written filepaths.
+    """
+    paths = []
+    for size in SIZES:
+        # Blend noise with a gradient so the encoders do real work
+        noise = Image.effect_noise(size, 64).convert("RGB")
+        gradient = Image.linear_gradient("L").resize(size).convert("RGB")
+        img = Image.blend(noise, gradient, 0.5)
+
+        for name, extension in FORMATS:
+            path = os.path.join(directory, f"{size[0]}x{size[1]}{extension}")
+            img.save(path, name)
+            paths.append(path)
+
+        img.close()
+
+    return paths
+
+def fullDecode(path: str):
+    """
+    Returns a thumbnail made after decoding every pixel of the image, as `ImguiImage` did before reduced decoding.
+
+    path: A string filepath pointing to the image file.
+    """
+    img = ImguiImage.openImage(path)
+    imgThumb = ImguiImage.makeThumbnail(img, THUMB_LIMIT)
+    img.close()
+    return imgThumb
+
+def reducedDecode(path: str):
+    """
+    Returns a thumbnail made the same way `ImguiImage.decodeThumbnail(...)` does without a thumbnail cache.
+
+    path: A string filepath pointing to the image file.
+    """
+    return ImguiImage.decodeThumbnail(path, THUMB_LIMIT)[0]
+
+def timeDecode(decode, path: str, repeats: int) -> float:
+    """
+    Returns the best time in milliseconds of the provided decode function over the repeats.
+
+    decode: A function that takes a filepath and returns a PIL thumbnail.
+    path: A string filepath pointing to the image file.
+    repeats: An int number of times to repeat.
+    """
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        decode(path).close()
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if (best == None) or (elapsed < best):
+            best = elapsed
+
+    return best
+
+## Execution
+if __name__ == "__main__":
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Compares full and reduced image decoding for thumbnails.")
+    parser.add_argument("--repeats", type=int, default=3, help="Times to repeat each decode. The best time is reported.")
+    parser.add_argument("--corpus", default=None, help="A directory of images to use instead of the generated corpus.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tempDir:
+        # Collect the images
+        if args.corpus != None:
+            paths = sorted(os.path.join(args.corpus, name) for name in os.listdir(args.corpus))
+        else:
+            paths = makeCorpus(tempDir)
+
+        # Report
+        print(f"{'Image':<28}{'Full ms':>10}{'Reduced ms':>12}{'Speedup':>9}")
+        for path in paths:
+            try:
+                fullMs = timeDecode(fullDecode, path, args.repeats)
+            except OSError:
+                continue
+
+            reducedMs = timeDecode(reducedDecode, path, args.repeats)
+            print(f"{os.path.basename(path)[:27]:<28}{fullMs:>10.1f}{reducedMs:>12.1f}{fullMs / reducedMs:>8.1f}x")
@@ -1,5 +1,20 @@
 # Image Swipe 2
 __all__ = [
     "renderer",
-    "imguiImage"
+    "imguiImage",
+    "frameTiming",
+    "headless",
+    "imageLoader",
+    "textureCache",
+    "thumbnailCache",
+    "textureAtlas",
+    "animatedImage",
+    "tiledImage",
+    "streamImage",
+    "imageBatch",
+    "remoteSource",
+    "contentIndex",
+    "contentLayout",
+    "texturePool",
+    "prefetchController"
 ]
\ No newline at end of file
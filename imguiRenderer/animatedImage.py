@@ -0,0 +1,423 @@
+## Animated ImGui Image
+# An `ImguiImage` that plays animated GIF, APNG, and WebP files.
+
+## Imports
+import os
+import time
+from collections import deque
+from PIL import Image
+from pyglet import image as pygletImage
+
+from .imguiImage import ImguiImage
+from .textureCache import TextureCache
+from .texturePool import TexturePool
+from .imageLoader import ImageLoader, ImageJob, STATE_IDLE, STATE_QUEUED, STATE_DECODING, STATE_UPLOADED, STATE_FAILED
+
+## Constants
+DEFAULT_BUFFER_FRAMES = 4
+DEFAULT_FRAME_DURATION = 100
+MIN_FRAME_DURATION = 20
+MAX_CATCH_UP = 1.0
+
+## Classes
+class _AnimationFrame():
+    """
+    A single decoded frame of an animation waiting to be shown.
+    """
+    # Constructor
+    def __init__(self, index: int, size: tuple, pixels: bytes, duration: float):
+        """
+        index: The int index of the frame in the animation.
+        size: A tuple containing the frame size as (width, height).
+        pixels: The frame's RGBA pixels as bytes.
+        duration: A float number of seconds to show the frame for.
+        """
+        self.index = index
+        self.size = size
+        self.pixels = pixels
+        self.duration = duration
+
+class AnimatedImage(ImguiImage):
+    """
+    An `ImguiImage` that plays animated images.
+    Frames are decoded in order on an `ImageLoader` worker into a small ring of frames, then uploaded in place into a single texture as they are shown.
+    Memory use is bounded by `bufferFrames` regardless of the animation's length.
+    Playback follows the real time between draws. Frames that are already late when the render loop catches up are dropped instead of shown.
+    Images with a single frame are shown the same way as an `ImguiImage`.
+    """
+    ## Statics
+    _lastPlayedFrame = -1
+
+    # Constructor
+    def __init__(self, filepath: str, metadata=None, thumbLimit=(1280, 720), verbose=False, bufferFrames: int = DEFAULT_BUFFER_FRAMES, loop: bool = True, loader: ImageLoader = None, **kwargs):
+        """
+        path: A string filepath poiting to the image file.
+        metadata: A dict of additonal data for the item. Can also provided `None` for no additonal data.
+        thumbLimits: A tuple representing the maximum long and short sides of each displayed frame as (long side length, short side length). Provide `None` to use the image's real size.
+        verbose: If `True`, enables verbose output.
+        bufferFrames: An int number of decoded frames to hold ahead of the one shown.
+        loop: If `True`, the animation restarts after its last frame. Otherwise it stops on the last frame.
+        loader: The `ImageLoader` to decode frames with. Provide `None` to use the shared loader.
+        kwargs: Other keyword arguments for `ImguiImage`. Only used for images with a single frame.
+        """
+        super(AnimatedImage, self).__init__(filepath, metadata, thumbLimit, verbose, **kwargs)
+
+        # Provided
+        self.bufferFrames = max(1, bufferFrames)
+        self.loop = loop
+        self._loader = loader
+
+        # Assigned
+        self.animated = False
+        self.frameCount = 0
+        self.frameIndex = -1
+        self.droppedFrames = 0
+        self.playing = True
+        self._decoder = None
+        self._nextDecode = 0
+        self._frames = deque()
+        self._animTexture = None
+        self._animSize = None
+        self._frameEnd = 0.0
+        self._playhead = 0.0
+        self._lastTime = None
+        self._lastFrame = -1
+
+    # Functions
+    def load(self, skipTexture = False, background: tuple = None):
+        """
+        Opens the image and starts decoding its frames on a worker if it is animated.
+        Images with a single frame are loaded the same way as `ImguiImage.load(...)`.
+
+        skipTexture: If True, the display texture will not preloaded. Only used for images with a single frame.
+        background: A tuple containing a background color to fill behind the image when it is drawn as (r, g, b)[255]. Supply `None` to indicate no background should be added.
+        """
+        # Stop any previous playback
+        self.close()
+
+        # Check if animated
+        try:
+            decoder = Image.open(self.path)
+        except (OSError, ValueError):
+            decoder = None
+
+        if (decoder == None) or (not getattr(decoder, "is_animated", False)):
+            if decoder != None:
+                decoder.close()
+
+            self.animated = False
+            super(AnimatedImage, self).load(skipTexture, background)
+            return
+
+        # Prepare the animation
+        self.animated = True
+        self._decoder = decoder
+        self._size = decoder.size
+        self._mtime = os.path.getmtime(self.path)
+        self._background = background
+        self.frameCount = getattr(decoder, "n_frames", 1)
+        self.frameIndex = -1
+        self.droppedFrames = 0
+        self._nextDecode = 0
+        self._playhead = 0.0
+        self._frameEnd = 0.0
+        self._lastTime = None
+
+        # Start decoding
+        self.state = STATE_QUEUED
+        self._decodeNext()
+
+    def loadAsync(self, background: tuple = None, loader: ImageLoader = None):
+        """
+        Starts decoding the image on a worker.
+        Animated images always decode their frames on a worker, so this is the same as `load(...)` for them.
+
+        background: A tuple containing a background color to fill behind the image when it is drawn as (r, g, b)[255]. Supply `None` to indicate no background should be added.
+        loader: The `ImageLoader` to decode with. Provide `None` to use the shared loader.
+        """
+        # Check if already loading or loaded
+        if self.state != STATE_IDLE:
+            return
+
+        if loader != None:
+            self._loader = loader
+
+        # Check if animated
+        try:
+            with Image.open(self.path) as img:
+                animated = getattr(img, "is_animated", False)
+        except (OSError, ValueError):
+            animated = False
+
+        if animated:
+            self.load(background=background)
+        else:
+            super(AnimatedImage, self).loadAsync(background, loader)
+
+    def close(self, releaseTextures: bool = False):
+        """
+        Stops playback, closes the decoder, and releases the frames and texture.
+
+        releaseTextures: If `True`, also releases the textures of images with a single frame. See `ImguiImage.close(...)`. The animation texture is always released, on the render thread.
+        """
+        # Close the still image parts
+        job = self._job
+        super(AnimatedImage, self).close(releaseTextures)
+
+        # Close the decoder unless a running decode will close it when it finishes
+        if (self._decoder != None) and not ((job != None) and job.future.running()):
+            self._decoder.close()
+        self._decoder = None
+
+        # Release the frames and texture
+        self._frames.clear()
+        TexturePool.releaseTexture(self._animTexture)
+        self._animTexture = None
+        self._animSize = None
+
+        self.frameIndex = -1
+
+    def size(self):
+        """
+        Returns the size of the image as a tuple like (width, height).
+
+        If the image has not yet been loaded, it is loaded first.
+        """
+        if self.animated and (self._size != None):
+            return self._size
+
+        return super(AnimatedImage, self).size()
+
+    def getTexture(self):
+        """
+        Gets the texture showing the current frame.
+
+        Returns a GL compatible texture, or `None` if no frame has been decoded yet.
+        """
+        if not self.animated:
+            return super(AnimatedImage, self).getTexture()
+
+        if not self.loaded:
+            if self.state == STATE_IDLE:
+                self.load()
+            return None
+
+        return self._animTexture
+
+    def play(self):
+        """
+        Resumes playback.
+        """
+        self.playing = True
+
+    def pause(self):
+        """
+        Pauses playback on the current frame.
+        """
+        self.playing = False
+
+    ## Private functions
+    def _drawableTexture(self, drawSize: tuple = None):
+        """
+        Advances playback and returns the texture showing the current frame.
+
+        drawSize: A tuple containing the size the texture will be drawn at as (width, height). Only used for images with a single frame.
+        """
+        if not self.animated:
+            return super(AnimatedImage, self)._drawableTexture(drawSize)
+
+        # Advance once per frame
+        if self._lastFrame != TextureCache._frame:
+            self._lastFrame = TextureCache._frame
+            self._advance()
+
+        return self._animTexture
+
+    def _advance(self):
+        """
+        Moves the playhead forward by the real time since the last draw and shows the frame it lands on.
+        """
+        # Measure the time since the last draw
+        now = time.perf_counter()
+        elapsed = 0.0
+        if self._lastTime != None:
+            elapsed = min(now - self._lastTime, MAX_CATCH_UP)
+        self._lastTime = now
+
+        if self.playing and (self.frameIndex >= 0) and (not self._isFinished()):
+            self._playhead += elapsed
+            AnimatedImage._lastPlayedFrame = TextureCache._frame
+
+        # Start the schedule at the first frame
+        if self.frameIndex < 0:
+            self._frameEnd = self._playhead
+
+        # Find the frame to show, dropping any that are already late
+        shown = None
+        while (len(self._frames) > 0) and (self._playhead >= self._frameEnd):
+            if shown != None:
+                self.droppedFrames += 1
+
+            shown = self._frames.popleft()
+            self._frameEnd += shown.duration
+            self.frameIndex = shown.index
+
+        # Wait for the decoder without building up lag
+        if (len(self._frames) == 0) and (self._playhead > self._frameEnd):
+            self._playhead = self._frameEnd
+
+        # Show the frame
+        if shown != None:
+            self._showFrame(shown)
+
+        # Keep the ring full
+        self._decodeNext()
+
+    def _showFrame(self, frame: _AnimationFrame):
+        """
+        Uploads a frame into the animation texture in place.
+
+        frame: The `_AnimationFrame` to show.
+        """
+        imgData = pygletImage.ImageData(frame.size[0], frame.size[1], "RGBA", frame.pixels, pitch=(frame.size[0] * 4))
+
+        if self._animSize != frame.size:
+            # Swap the texture for one of the new size
+            TexturePool.releaseTexture(self._animTexture)
+            self._animTexture = self._getPool().acquire(imgData, self._useNpot())
+            self._animSize = frame.size
+        else:
+            # Update in place
+            TexturePool.upload(self._animTexture, imgData)
+
+        self.loaded = True
+        self.state = STATE_UPLOADED
+
+    def _decodeNext(self):
+        """
+        Queues the frames needed to refill the ring if it has room and no decode is running.
+        """
+        # Check if a decode is needed
+        count = self.bufferFrames - len(self._frames)
+        if (self._decoder == None) or (self._job != None) or (count <= 0):
+            return
+
+        # Check for the end
+        if self._nextDecode >= self.frameCount:
+            if not self.loop:
+                return
+            self._nextDecode = 0
+
+        # Pick the frames to decode
+        indices = []
+        index = self._nextDecode
+        while (len(indices) < count) and (index < self.frameCount):
+            indices.append(index)
+            index += 1
+            if (index >= self.frameCount) and self.loop:
+                index = 0
+
+        # Queue the decode
+        # NOTE: The whole gap is decoded in one job so a ring drained by a slow render loop refills within a single frame.
+        # NOTE: The background is filled in when drawing, so frames keep their transparency.
+        decoder = self._decoder
+        thumbLimit = self._thumbLimit
+
+        def decode(job):
+            try:
+                return [AnimatedImage.decodeFrame(decoder, i, thumbLimit) for i in indices]
+            finally:
+                # Close the decoder if the image was closed while decoding
+                if job.cancelled:
+                    decoder.close()
+
+        loader = self._loader if (self._loader != None) else ImageLoader.shared()
+        self._nextDecode = index
+        self._job = loader.submit(ImageJob(self, decode))
+
+    def _isFinished(self) -> bool:
+        """
+        Returns `True` if a non looping animation has shown its last frame.
+        """
+        return (not self.loop) and (self._nextDecode >= self.frameCount) and (len(self._frames) == 0) and (self._job == None)
+
+    def _onDecodeStarted(self, job: ImageJob):
+        """
+        Called on a worker thread when a frame decode starts.
+
+        job: The `ImageJob` being decoded.
+        """
+        if (job is self._job) and (not self.loaded):
+            self.state = STATE_DECODING
+
+    def _onDecodeFinished(self, job: ImageJob):
+        """
+        Called on the render thread when a frame decode has finished.
+        Adds the frames to the ring and queues more.
+
+        job: The decoded `ImageJob`.
+        """
+        if not self.animated:
+            super(AnimatedImage, self)._onDecodeFinished(job)
+            return
+
+        # Check the job is still wanted
+        if not (job is self._job):
+            return
+        self._job = None
+
+        # Check if the decode failed
+        if (job.error != None) or (job.result == None):
+            print(f"{self} could not decode a frame: {job.error}")
+            if not self.loaded:
+                self.state = STATE_FAILED
+            return
+
+        # Add the frames
+        self._frames.extend(job.result)
+
+        # Show the first frame right away
+        if not self.loaded:
+            self._advance()
+
+        self._decodeNext()
+
+    # Static Functions
+    def decodeFrame(decoder, index: int, thumbLimit: tuple, background: tuple = None) -> _AnimationFrame:
+        """
+        Decodes a single frame of an open animated image.
+        Safe to call from any thread, but only one thread may use the decoder at a time.
+
+        decoder: An open PIL image with multiple frames.
+        index: The int index of the frame.
+        thumbLimit: A tuple representing the maximum long and short sides of the frame as (long side length, short side length). Provide `None` to use the image's real size.
+        background: A tuple containing a background color to add behind the frame as (r, g, b)[255]. Supply `None` to indicate no background should be added.
+
+        Returns an `_AnimationFrame`.
+        """
+        # Decode the frame
+        decoder.seek(index)
+        frame = decoder.convert("RGBA")
+        duration = max(decoder.info.get("duration", DEFAULT_FRAME_DURATION) or DEFAULT_FRAME_DURATION, MIN_FRAME_DURATION) / 1000
+
+        # Add the background
+        if background != None:
+            backed = Image.new("RGBA", frame.size, background)
+            backed.alpha_composite(frame)
+            frame.close()
+            frame = backed
+
+        # Scale to the limit
+        if thumbLimit != None:
+            frame.thumbnail(ImguiImage.thumbnailBox(frame.size, thumbLimit))
+
+        result = _AnimationFrame(index, frame.size, frame.tobytes(), duration)
+        frame.close()
+        return result
+
+    def isAnyPlaying() -> bool:
+        """
+        Returns `True` if any `AnimatedImage` advanced its playback during the last frame.
+        `PygletImGui.isAnimating()` uses this to keep redrawing under the on demand redraw policies.
+        """
+        return AnimatedImage._lastPlayedFrame >= (TextureCache._frame - 1)
@@ -4,5 +4,8 @@ __all__ = [
     "alerts",
     "inputs",
     "fileSelect",
-    "generalUi"
+    "generalUi",
+    "frameHud",
+    "gallery",
+    "deepZoom"
 ]
\ No newline at end of file
@@ -6,9 +6,12 @@ from .alerts import AlertsComponents
 from .inputs import InputComponents
 from .fileSelect import FileSelectorComponent
 from .generalUi import GeneralUiFunctions
+from .frameHud import FrameHudComponent
+from .gallery import GalleryComponent
+from .deepZoom import DeepZoomComponent
 
 ## Classes
-class AllComponents(AlertsComponents, InputComponents, FileSelectorComponent, GeneralUiFunctions):
+class AllComponents(AlertsComponents, InputComponents, FileSelectorComponent, GeneralUiFunctions, FrameHudComponent, GalleryComponent, DeepZoomComponent):
     """
     Includes access to all components and their class components.
     """
@@ -18,3 +21,6 @@ class AllComponents(AlertsComponents, InputComponents, FileSelectorComponent, Ge
         super(InputComponents, self).__init__()
         super(FileSelectorComponent, self).__init__()
         super(GeneralUiFunctions, self).__init__()
+        super(FrameHudComponent, self).__init__()
+        super(GalleryComponent, self).__init__()
+        super(DeepZoomComponent, self).__init__()
@@ -0,0 +1,189 @@
+## ImGui Renderer Components: Deep Zoom
+## Tiled pan and zoom viewer component for images too large for a single texture.
+
+## Imports
+import imgui
+
+from ..imguiImage import ImguiImage
+from ..tiledImage import TiledImage
+
+## Classes
+class DeepZoomComponent():
+    """
+    Adds a pan and zoom viewer for `TiledImage` objects to the subclass.
+    Only the tiles of the level matching the current zoom that intersect the view are loaded and drawn.
+    Tiles that are not ready yet are covered by the closest coarser tile that is, so the view is never empty while zooming.
+    """
+    ## Statics
+    DEEP_ZOOM_STEP = 1.25
+    DEEP_ZOOM_EASE = 12.0
+    DEEP_ZOOM_MAX_SCALE = 8.0
+    DEEP_ZOOM_MIN_FIT = 0.5
+    DEEP_ZOOM_BACKGROUND = (0.1, 0.1, 0.1, 1.0)
+
+    ## Constructor
+    def __init__(self) -> None:
+        # Assign variables
+        self.deepZoomScale = 0.0
+        self.deepZoomCenter = (0.0, 0.0)
+        self._deepZoomImage = None
+        self._deepZoomTarget = 0.0
+        self._deepZoomAnchor = None
+
+    ## UI Functions
+    def uiDeepZoom(self, image: TiledImage, size: tuple = (0, 0), label: str = "##deepZoom"):
+        """
+        Renders a pan and zoom view of the provided tiled image.
+        Drag to pan, scroll to zoom around the mouse, and double click to fit the whole image.
+        The current zoom is accessible at `deepZoomScale` in screen pixels per image pixel and the image pixel at the center of the view at `deepZoomCenter`.
+
+        image: The `TiledImage` to show.
+        size: A tuple containing the size of the view as (width, height). Provide `0` for either side to fill the remaining space of the current window.
+        label: A string ImGui identifier for the view.
+
+        Returns the full resolution image pixel under the mouse as (x, y), or `None` if the mouse is not over the view.
+        """
+        # Begin the view
+        imgui.begin_child(label, size[0], size[1], border=False, flags=(imgui.WINDOW_NO_SCROLLBAR | imgui.WINDOW_NO_SCROLL_WITH_MOUSE))
+        viewW, viewH = imgui.get_content_region_available()
+        originX, originY = imgui.get_cursor_screen_pos()
+        imageW, imageH = image.size()
+
+        # Fit the image if it changed
+        if image is not self._deepZoomImage:
+            self._deepZoomImage = image
+            self.deepZoomFit(viewW, viewH)
+
+        # Capture the mouse
+        imgui.invisible_button("##canvas", max(1, viewW), max(1, viewH))
+        io = imgui.get_io()
+        mouseX = io.mouse_pos[0] - originX - (viewW * 0.5)
+        mouseY = io.mouse_pos[1] - originY - (viewH * 0.5)
+
+        # Handle input
+        if imgui.is_item_hovered() and imgui.is_mouse_double_clicked(0):
+            self.deepZoomFit(viewW, viewH)
+        elif imgui.is_item_active() and ((io.mouse_delta[0] != 0) or (io.mouse_delta[1] != 0)):
+            # Pan
+            self._deepZoomAnchor = None
+            self._deepZoomTarget = self.deepZoomScale
+            self.deepZoomCenter = (self.deepZoomCenter[0] - (io.mouse_delta[0] / self.deepZoomScale), self.deepZoomCenter[1] - (io.mouse_delta[1] / self.deepZoomScale))
+        elif imgui.is_item_hovered() and (io.mouse_wheel != 0):
+            # Zoom around the image pixel under the mouse
+            fitScale = min(viewW / imageW, viewH / imageH)
+            self._deepZoomTarget = min(max(self._deepZoomTarget * (DeepZoomComponent.DEEP_ZOOM_STEP ** io.mouse_wheel), fitScale * DeepZoomComponent.DEEP_ZOOM_MIN_FIT), DeepZoomComponent.DEEP_ZOOM_MAX_SCALE)
+            self._deepZoomAnchor = ((self.deepZoomCenter[0] + (mouseX / self.deepZoomScale), self.deepZoomCenter[1] + (mouseY / self.deepZoomScale)), (mouseX, mouseY))
+
+        # Ease toward the target zoom
+        if self.deepZoomScale != self._deepZoomTarget:
+            ease = min(1.0, io.delta_time * DeepZoomComponent.DEEP_ZOOM_EASE)
+            self.deepZoomScale *= (self._deepZoomTarget / self.deepZoomScale) ** ease
+            if abs((self.deepZoomScale / self._deepZoomTarget) - 1) < 0.001:
+                self.deepZoomScale = self._deepZoomTarget
+
+            # Keep the anchor under the mouse
+            if self._deepZoomAnchor != None:
+                (anchorX, anchorY), (offsetX, offsetY) = self._deepZoomAnchor
+                self.deepZoomCenter = (anchorX - (offsetX / self.deepZoomScale), anchorY - (offsetY / self.deepZoomScale))
+
+        # Draw the tiles
+        drawList = imgui.get_window_draw_list()
+        drawList.add_rect_filled(originX, originY, originX + viewW, originY + viewH, imgui.get_color_u32_rgba(*DeepZoomComponent.DEEP_ZOOM_BACKGROUND))
+        self._deepZoomDrawTiles(image, drawList, (originX, originY), (viewW, viewH))
+
+        # Find the image pixel under the mouse
+        hoveredPixel = None
+        if imgui.is_item_hovered():
+            hoveredPixel = (self.deepZoomCenter[0] + (mouseX / self.deepZoomScale), self.deepZoomCenter[1] + (mouseY / self.deepZoomScale))
+
+        imgui.end_child()
+        return hoveredPixel
+
+    ## Functions
+    def deepZoomFit(self, viewW: float, viewH: float):
+        """
+        Fits the whole image in a view of the provided size.
+
+        viewW: A float width of the view.
+        viewH: A float height of the view.
+        """
+        if self._deepZoomImage == None:
+            return
+
+        imageW, imageH = self._deepZoomImage.size()
+        self.deepZoomScale = min(max(1, viewW) / imageW, max(1, viewH) / imageH)
+        self.deepZoomCenter = (imageW * 0.5, imageH * 0.5)
+        self._deepZoomTarget = self.deepZoomScale
+        self._deepZoomAnchor = None
+
+    ## Private Functions
+    def _deepZoomDrawTiles(self, image: TiledImage, drawList, origin: tuple, viewSize: tuple):
+        """
+        Draws the tiles of the level matching the current zoom that intersect the view, and requests any that are missing.
+
+        image: The `TiledImage` to draw.
+        drawList: The ImGui draw list to draw into.
+        origin: A tuple containing the screen position of the view's top left corner as (x, y).
+        viewSize: A tuple containing the size of the view as (width, height).
+        """
+        # Find the visible area in image pixels
+        scale = self.deepZoomScale
+        imageW, imageH = image.size()
+        left = self.deepZoomCenter[0] - ((viewSize[0] * 0.5) / scale)
+        top = self.deepZoomCenter[1] - ((viewSize[1] * 0.5) / scale)
+        right = left + (viewSize[0] / scale)
+        bottom = top + (viewSize[1] / scale)
+
+        # Find the visible tiles of the matching level
+        level = image.levelForScale(scale * imgui.get_io().display_fb_scale[0])
+        tileSpan = image.tileSize << level
+        cols, rows = image.tileCount(level)
+        firstCol = max(0, int(left // tileSpan))
+        lastCol = min(cols - 1, int(right // tileSpan))
+        firstRow = max(0, int(top // tileSpan))
+        lastRow = min(rows - 1, int(bottom // tileSpan))
+
+        # Always keep the top tile as the last fallback
+        topLevel = image.levels - 1
+        image.getTile(topLevel, 0, 0)
+        wanted = {(topLevel, 0, 0)}
+
+        for row in range(firstRow, lastRow + 1):
+            for col in range(firstCol, lastCol + 1):
+                wanted.add((level, col, row))
+
+                # Find the area in image pixels
+                x0, y0, x1, y1 = image.tileRect(level, col, row)
+                area = (x0 << level, y0 << level, min(x1 << level, imageW), min(y1 << level, imageH))
+
+                # Find the tile, or the closest coarser tile that covers it
+                tex = image.getTile(level, col, row)
+                subRect = None
+                if tex == None:
+                    for ancestor in range(level + 1, image.levels):
+                        shift = ancestor - level
+                        tex = image.getTile(ancestor, col >> shift, row >> shift, request=False)
+                        if tex != None:
+                            ax0, ay0, ax1, ay1 = image.tileRect(ancestor, col >> shift, row >> shift)
+                            ax0, ay0, ax1, ay1 = (ax0 << ancestor, ay0 << ancestor, min(ax1 << ancestor, imageW), min(ay1 << ancestor, imageH))
+                            subRect = (
+                                ((area[0] - ax0) / (ax1 - ax0), (area[1] - ay0) / (ay1 - ay0)),
+                                ((area[2] - ax0) / (ax1 - ax0), (area[3] - ay0) / (ay1 - ay0))
+                            )
+                            break
+
+                if tex == None:
+                    continue
+
+                # Draw the tile
+                uv0, uv1 = ImguiImage.textureUv(tex, subRect=subRect)
+                drawList.add_image(
+                    tex.id,
+                    (origin[0] + ((area[0] - left) * scale), origin[1] + ((area[1] - top) * scale)),
+                    (origin[0] + ((area[2] - left) * scale), origin[1] + ((area[3] - top) * scale)),
+                    uv0,
+                    uv1
+                )
+
+        # Skip queued tiles that left the view
+        image.retainTiles(wanted)
@@ -0,0 +1,200 @@
+## ImGui Renderer Components: Frame HUD
+## Frame timing overlay component for ImGui.
+
+## Imports
+import time
+from array import array
+import imgui
+
+from ..frameTiming import FRAME_SPAN
+
+## Classes
+class FrameHudComponent():
+    """
+    Adds a frame timing overlay to the subclass.
+    The overlay is fed from a `FrameTimer` and keeps its own preallocated buffers so drawing it does not allocate per frame.
+    """
+    ## Statics
+    HUD_HISTORY = 240
+    HUD_HITCH_MS = 1000 / 60.
+    HUD_WIDTH = 280
+    HUD_GRAPH_HEIGHT = 48
+    HUD_BAR_HEIGHT = 12
+    HUD_TEXT_REFRESH = 15
+    HUD_PHASE_COLORS = (
+        (0.90, 0.40, 0.30, 1.0),
+        (0.30, 0.70, 0.95, 1.0),
+        (0.55, 0.85, 0.35, 1.0),
+        (0.95, 0.80, 0.30, 1.0),
+        (0.75, 0.45, 0.90, 1.0),
+        (0.35, 0.90, 0.80, 1.0),
+        (0.95, 0.55, 0.75, 1.0),
+        (0.65, 0.65, 0.65, 1.0)
+    )
+
+    ## Constructor
+    def __init__(self) -> None:
+        # Assign variables
+        self.hudVisible = False
+        self.hudHitches = 0
+        self._hudFrameTimes = array("f", bytes(4 * FrameHudComponent.HUD_HISTORY))
+        self._hudIntervals = array("f", bytes(4 * FrameHudComponent.HUD_HISTORY))
+        self._hudIndex = 0
+        self._hudSeenFrames = 0
+        self._hudLastTime = 0.0
+        self._hudIntervalSum = 0.0
+        self._hudIntervalCount = 0
+        self._hudPhases = ()
+        self._hudTopPhases = 0
+        self._hudSpanCount = 0
+        self._hudPhaseMs = array("f")
+        self._hudLegend = ()
+        self._hudHeader = ""
+        self._hudColors = None
+
+    ## UI Functions
+    def uiFrameHudMenu(self):
+        """
+        Adds a "View" menu with a frame timing HUD toggle.
+        Must be called while a menu bar is being built, like from `renderMenus(...)`.
+        """
+        if imgui.begin_menu("View", True):
+            clicked, self.hudVisible = imgui.menu_item("Frame Timing HUD", None, self.hudVisible, True)
+            imgui.end_menu()
+
+    def uiFrameHud(self, timer):
+        """
+        Renders the frame timing overlay if `hudVisible` is `True`.
+        Shows the FPS, a frame time graph, a stacked bar of the last frame's top level phases, and a count of hitches.
+        Spans nested inside a phase are listed after the phases but not stacked, as their time is already part of the phase's.
+
+        timer: The `FrameTimer` to read from. Provide `None` if frame timing is disabled.
+        """
+        # Check if the HUD should be drawn
+        if not self.hudVisible:
+            return
+
+        # Record the new frames
+        if timer != None:
+            self._hudUpdate(timer)
+
+        # Display the overlay window
+        winFlags = 0
+        winFlags |= imgui.WINDOW_NO_COLLAPSE
+        winFlags |= imgui.WINDOW_ALWAYS_AUTO_RESIZE
+        winFlags |= imgui.WINDOW_NO_FOCUS_ON_APPEARING
+        winFlags |= imgui.WINDOW_NO_NAV
+        imgui.set_next_window_bg_alpha(0.75)
+        _, self.hudVisible = imgui.begin(label="Frame Timing", closable=True, flags=winFlags)
+
+        if timer == None:
+            imgui.text("Frame timing is disabled.")
+            imgui.end()
+            return
+
+        # Show the rates
+        imgui.text(self._hudHeader)
+
+        # Show the frame time graph
+        imgui.plot_lines(
+            "##frameTimes",
+            self._hudFrameTimes,
+            values_offset=self._hudIndex,
+            scale_min=0.0,
+            scale_max=FrameHudComponent.HUD_HITCH_MS * 2,
+            graph_size=(FrameHudComponent.HUD_WIDTH, FrameHudComponent.HUD_GRAPH_HEIGHT)
+        )
+
+        # Show the phase bar
+        self._hudDrawPhaseBar()
+
+        imgui.end()
+
+    ## Private Functions
+    def _hudUpdate(self, timer):
+        """
+        Copies any frames recorded since the last update into the HUD's ring buffers.
+
+        timer: The `FrameTimer` to read from.
+        """
+        # Track the real time between frames
+        now = time.perf_counter()
+        if self._hudLastTime > 0:
+            interval = now - self._hudLastTime
+            self._hudIntervalSum += interval - self._hudIntervals[self._hudIndex]
+            self._hudIntervals[self._hudIndex] = interval
+            self._hudIntervalCount = min(self._hudIntervalCount + 1, FrameHudComponent.HUD_HISTORY)
+        self._hudLastTime = now
+
+        # Refresh the phase names if any were added
+        # NOTE: Top level phases come first so the bar can stack them without the nested spans they contain.
+        if self._hudSpanCount != timer.spanCount():
+            self._hudSpanCount = timer.spanCount()
+            topPhases = timer.topLevelNames()
+            self._hudPhases = tuple(topPhases) + tuple(name for name in timer.names() if (name != FRAME_SPAN) and timer.isNested(name))
+            self._hudTopPhases = len(topPhases)
+            self._hudPhaseMs = array("f", bytes(4 * len(self._hudPhases)))
+
+        # Check for a newly ended frame
+        if timer.frameCount == self._hudSeenFrames:
+            return
+        self._hudSeenFrames = timer.frameCount
+
+        # Record the frame
+        frameMs = timer.last(FRAME_SPAN) * 1000
+        self._hudFrameTimes[self._hudIndex] = frameMs
+        self._hudIndex = (self._hudIndex + 1) % FrameHudComponent.HUD_HISTORY
+
+        if frameMs > FrameHudComponent.HUD_HITCH_MS:
+            self.hudHitches += 1
+
+        # Record the phases
+        for i, name in enumerate(self._hudPhases):
+            self._hudPhaseMs[i] = timer.last(name) * 1000
+
+        # Rebuild the text periodically so it stays readable
+        if (self._hudSeenFrames % FrameHudComponent.HUD_TEXT_REFRESH) == 1:
+            if self._hudIntervalSum > 0:
+                fps = self._hudIntervalCount / self._hudIntervalSum
+            else:
+                fps = 0.0
+
+            self._hudHeader = f"{fps:.1f} FPS | {frameMs:.2f} ms | {self.hudHitches} hitches"
+            self._hudLegend = tuple(f"{'' if (i < self._hudTopPhases) else '  '}{name}: {self._hudPhaseMs[i]:.2f} ms" for i, name in enumerate(self._hudPhases))
+
+    def _hudDrawPhaseBar(self):
+        """
+        Draws a stacked bar showing each top level phase's share of the last frame followed by a legend.
+        """
+        # Resolve the colors once
+        if self._hudColors == None:
+            self._hudColors = tuple(imgui.get_color_u32_rgba(*c) for c in FrameHudComponent.HUD_PHASE_COLORS)
+
+        # Get the total of the top level phases
+        totalMs = 0.0
+        for i in range(self._hudTopPhases):
+            totalMs += self._hudPhaseMs[i]
+        if totalMs <= 0:
+            return
+
+        # Draw the segments
+        drawList = imgui.get_window_draw_list()
+        x, y = imgui.get_cursor_screen_pos()
+        width = FrameHudComponent.HUD_WIDTH
+        height = FrameHudComponent.HUD_BAR_HEIGHT
+        colorCount = len(self._hudColors)
+
+        for i in range(self._hudTopPhases):
+            segment = width * (self._hudPhaseMs[i] / totalMs)
+            drawList.add_rect_filled(x, y, x + segment, y + height, self._hudColors[i % colorCount])
+            x += segment
+
+        imgui.dummy(width, height)
+
+        # Draw the legend
+        for i, line in enumerate(self._hudLegend):
+            if i < self._hudTopPhases:
+                r, g, b, a = FrameHudComponent.HUD_PHASE_COLORS[i % colorCount]
+                imgui.text_colored(line, r, g, b, a)
+            else:
+                imgui.text_disabled(line)
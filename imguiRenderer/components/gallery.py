@@ -0,0 +1,251 @@
+## ImGui Renderer Components: Gallery
+## Virtualized image gallery component for ImGui.
+
+## Imports
+import math
+import imgui
+
+from ..imguiImage import ImguiImage
+from ..imageLoader import STATE_IDLE, STATE_FAILED
+
+## Classes
+class GalleryComponent():
+    """
+    Adds a virtualized, scrolling grid of `ImguiImage` thumbnails to the subclass.
+    Only the rows inside the visible scroll region are drawn, only those and a prefetch margin around them are loaded, and rows far outside it are unloaded.
+    Every cell has a fixed size so the scroll position stays stable as images load.
+    Images with known sizes can instead be shown in justified rows with `uiJustifiedGallery(...)`.
+    """
+    ## Statics
+    GALLERY_CELL_SIZE = (160, 120)
+    GALLERY_ROW_HEIGHT = 160
+    GALLERY_PREFETCH_ROWS = 2
+    GALLERY_UNLOAD_ROWS = 6
+    GALLERY_SELECTED_BORDER = (0.95, 0.80, 0.30, 1.0)
+
+    ## Constructor
+    def __init__(self) -> None:
+        # Assign variables
+        self.gallerySelected = None
+        self._galleryImages = None
+        self._galleryLoaded = set()
+        self._galleryColumns = 0
+        self._galleryFirstIndex = 0
+        self._galleryLayout = None
+        self._galleryRows = None
+
+    ## UI Functions
+    def uiGallery(self, images: list, cellSize: tuple = GALLERY_CELL_SIZE, prefetchRows: int = GALLERY_PREFETCH_ROWS, unloadRows: int = GALLERY_UNLOAD_ROWS, shouldFit: bool = True, label: str = "##gallery"):
+        """
+        Renders a scrolling grid of the provided images filling the remaining space of the current window.
+        Images are loaded asynchronously as they approach the visible region and closed once they are more than `unloadRows` rows away from it.
+        Their textures stay in the `TextureCache` until evicted, so scrolling back is fast.
+        The index of the last clicked image is accessible at `gallerySelected`.
+
+        images: A list of `ImguiImage` objects to show.
+        cellSize: A tuple containing the size of each grid cell as (width, height).
+        prefetchRows: An int number of rows above and below the visible region to load ahead of time.
+        unloadRows: An int number of rows above and below the visible region to keep loaded. Should be at least `prefetchRows`.
+        shouldFit: A boolean indicating if each image should fit within its cell or cover its cell. See `ImguiImage.calculateContentBestSize(...)`.
+        label: A string ImGui identifier for the scrolling region.
+
+        Returns the index of the image clicked this frame, or `None` if no image was clicked.
+        """
+        # Reset if the images changed
+        if images is not self._galleryImages:
+            self.galleryClose()
+            self._galleryImages = images
+            self.gallerySelected = None
+
+        # Begin the scrolling region
+        imgui.begin_child(label, 0, 0, border=False)
+
+        # Calculate the grid layout
+        spacingX, spacingY = imgui.get_style().item_spacing
+        cellW, cellH = cellSize
+        columns = max(1, int((imgui.get_content_region_available_width() + spacingX) // (cellW + spacingX)))
+        rowHeight = cellH + spacingY
+        rowCount = math.ceil(len(images) / columns)
+
+        # Keep the first visible image in view when the column count changes
+        if (columns != self._galleryColumns) and (self._galleryColumns > 0):
+            imgui.set_scroll_y((self._galleryFirstIndex // columns) * rowHeight)
+        self._galleryColumns = columns
+
+        # Find the visible rows
+        scrollY = imgui.get_scroll_y()
+        firstRow = min(int(scrollY // rowHeight), max(0, rowCount - 1))
+        lastRow = min(int((scrollY + imgui.get_window_height()) // rowHeight), rowCount - 1)
+        self._galleryFirstIndex = firstRow * columns
+
+        # Load the visible and prefetch rows
+        loadFirst = max(0, firstRow - prefetchRows) * columns
+        loadLast = min(len(images), (lastRow + prefetchRows + 1) * columns)
+        for i in range(loadFirst, loadLast):
+            if images[i].state == STATE_IDLE:
+                images[i].loadAsync()
+                self._galleryLoaded.add(i)
+
+        # Unload rows far outside the visible region
+        keepFirst = (firstRow - unloadRows) * columns
+        keepLast = (lastRow + unloadRows + 1) * columns
+        for i in [i for i in self._galleryLoaded if (i < keepFirst) or (i >= keepLast)]:
+            if i < len(images):
+                images[i].close()
+            self._galleryLoaded.discard(i)
+
+        # Draw the visible rows
+        clicked = None
+        for row in range(firstRow, lastRow + 1):
+            for i in range(row * columns, min(len(images), (row + 1) * columns)):
+                # Move to the cell
+                imgui.set_cursor_pos(((i - (row * columns)) * (cellW + spacingX), row * rowHeight))
+
+                # Draw the cell
+                imgui.push_id(str(i))
+                if self._galleryDrawCell(images[i], cellSize, shouldFit, i == self.gallerySelected):
+                    clicked = i
+                    self.gallerySelected = i
+                imgui.pop_id()
+
+        # Reserve the full height so the scrollbar covers every row
+        imgui.set_cursor_pos((0, rowCount * rowHeight))
+        imgui.dummy(0, 0)
+
+        imgui.end_child()
+        return clicked
+
+    def uiJustifiedGallery(self, images: list, contentSizes, rowHeight: float = GALLERY_ROW_HEIGHT, prefetchRows: int = GALLERY_PREFETCH_ROWS, unloadRows: int = GALLERY_UNLOAD_ROWS, label: str = "##justifiedGallery"):
+        """
+        Renders a scrolling view of the provided images in justified rows filling the remaining space of the current window.
+        Each row keeps its images' aspect ratios and is scaled to span the width exactly, so the sizes of every image must be known before they load.
+        Rows are laid out with a `JustifiedLayout` that keeps its results per width, so resizing the window back and forth does not lay them out again.
+        Loading, unloading, and selection work like `uiGallery(...)`. Requires NumPy.
+
+        images: A list of `ImguiImage` objects to show.
+        contentSizes: An array like shaped (images, 2) of each image's size as (width, height), like from a database or a catalog. Only aspect ratios are used.
+        rowHeight: A float target height for each row.
+        prefetchRows: An int number of rows above and below the visible region to load ahead of time.
+        unloadRows: An int number of rows above and below the visible region to keep loaded. Should be at least `prefetchRows`.
+        label: A string ImGui identifier for the scrolling region.
+
+        Returns the index of the image clicked this frame, or `None` if no image was clicked.
+        """
+        # NOTE: Imported here so the other components do not require NumPy.
+        from ..contentLayout import JustifiedLayout
+
+        # Reset if the images changed
+        if images is not self._galleryImages:
+            self.galleryClose()
+            self._galleryImages = images
+            self._galleryLayout = None
+            self.gallerySelected = None
+
+        # Begin the scrolling region
+        imgui.begin_child(label, 0, 0, border=False)
+
+        # Lay out the rows for this width
+        spacing = tuple(imgui.get_style().item_spacing)
+        if (self._galleryLayout == None) or (self._galleryLayout.rowHeight != rowHeight) or (self._galleryLayout.spacing != spacing):
+            self._galleryLayout = JustifiedLayout(contentSizes, rowHeight, spacing)
+            self._galleryRows = None
+        rows = self._galleryLayout.layout(imgui.get_content_region_available_width())
+
+        # Keep the first visible image in view when the rows change
+        if (rows is not self._galleryRows) and (self._galleryRows != None) and (rows.rowCount() > 0):
+            row = int(rows.rowStarts.searchsorted(self._galleryFirstIndex, side="right")) - 1
+            imgui.set_scroll_y(rows.rowY[max(0, row)])
+        self._galleryRows = rows
+
+        # Find the visible rows
+        scrollY = imgui.get_scroll_y()
+        firstRow, lastRow = rows.visibleRows(scrollY, scrollY + imgui.get_window_height())
+        if firstRow < rows.rowCount():
+            self._galleryFirstIndex = int(rows.rowStarts[firstRow])
+
+        # Load the visible and prefetch rows
+        loadFirst = int(rows.rowStarts[max(0, firstRow - prefetchRows)]) if (rows.rowCount() > 0) else 0
+        loadLast = rows.rowEnd(min(rows.rowCount(), lastRow + prefetchRows) - 1)
+        for i in range(loadFirst, loadLast):
+            if images[i].state == STATE_IDLE:
+                images[i].loadAsync()
+                self._galleryLoaded.add(i)
+
+        # Unload rows far outside the visible region
+        keepFirst = int(rows.rowStarts[max(0, firstRow - unloadRows)]) if (rows.rowCount() > 0) else 0
+        keepLast = rows.rowEnd(min(rows.rowCount(), lastRow + unloadRows) - 1)
+        for i in [i for i in self._galleryLoaded if (i < keepFirst) or (i >= keepLast)]:
+            if i < len(images):
+                images[i].close()
+            self._galleryLoaded.discard(i)
+
+        # Draw the visible rows
+        clicked = None
+        first, last = rows.visibleItems(scrollY, scrollY + imgui.get_window_height())
+        for i, position, size in zip(range(first, last), rows.positions[first:last].tolist(), rows.sizes[first:last].tolist()):
+            # Move to the cell
+            imgui.set_cursor_pos(position)
+
+            # Draw the cell
+            # NOTE: Cells match the images' aspect ratios to within a pixel, so fitting fills them without the clip rect covering needs.
+            imgui.push_id(str(i))
+            if self._galleryDrawCell(images[i], tuple(size), True, i == self.gallerySelected):
+                clicked = i
+                self.gallerySelected = i
+            imgui.pop_id()
+
+        # Reserve the full height so the scrollbar covers every row
+        imgui.set_cursor_pos((0, rows.height))
+        imgui.dummy(0, 0)
+
+        imgui.end_child()
+        return clicked
+
+    ## Functions
+    def galleryClose(self):
+        """
+        Closes every image the gallery loaded.
+        """
+        if self._galleryImages != None:
+            for i in self._galleryLoaded:
+                if i < len(self._galleryImages):
+                    self._galleryImages[i].close()
+
+        self._galleryLoaded.clear()
+
+    ## Private Functions
+    def _galleryDrawCell(self, image: ImguiImage, cellSize: tuple, shouldFit: bool, selected: bool) -> bool:
+        """
+        Draws a single image centered in its cell, or a placeholder if it is not loaded.
+        Returns `True` if the image was clicked.
+
+        image: The `ImguiImage` to draw.
+        cellSize: A tuple containing the size of the cell as (width, height).
+        shouldFit: A boolean indicating if the image should fit within its cell or cover its cell.
+        selected: A boolean indicating if the image should be drawn with the selected border.
+        """
+        # Check if the image can be drawn
+        if not image.loaded:
+            ImguiImage.drawPlaceholder(cellSize, "Failed" if (image.state == STATE_FAILED) else "Loading...")
+            return False
+
+        # Center the image in the cell
+        imgSize, _ = ImguiImage.calculateContentBestSize(image.size(), cellSize, shouldFit)
+        cellX, cellY = imgui.get_cursor_pos()
+        screenX, screenY = imgui.get_cursor_screen_pos()
+        imgui.set_cursor_pos((cellX + ((cellSize[0] - imgSize[0]) * 0.5), cellY + ((cellSize[1] - imgSize[1]) * 0.5)))
+
+        # Clip covering images to the cell
+        if not shouldFit:
+            imgui.push_clip_rect(screenX, screenY, screenX + cellSize[0], screenY + cellSize[1], True)
+
+        # Draw the image
+        # NOTE: A plain image is used over a button as button frames are drawn with the font texture, which would split the draws of images sharing a `TextureAtlas` page.
+        border = GalleryComponent.GALLERY_SELECTED_BORDER if selected else (0, 0, 0, 0)
+        image.draw(cellSize, shouldFit, center=False, border=border)
+        wasClicked = imgui.is_item_clicked()
+
+        if not shouldFit:
+            imgui.pop_clip_rect()
+
+        return wasClicked
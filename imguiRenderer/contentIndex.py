@@ -0,0 +1,181 @@
+## Content Index
+# Identifies image files by their contents so duplicates reached through different paths share one decode and one texture.
+
+## Imports
+import os
+import hashlib
+import threading
+
+## Constants
+DEFAULT_HASH = "sha1"
+CHUNK_SIZE = 1024 * 1024
+
+## Classes
+class ContentIndex():
+    """
+    Identifies image files by a hash of their bytes so `ImguiImage` instances with `dedup=True` showing the same picture share one decoded thumbnail and one GL texture.
+    Digests are remembered by device, inode, size, and modification time, so paths, symlinks, and hard links to a file that was already hashed only cost a `stat`.
+    Counts how many instances reference each content and what sharing saved.
+    Safe to use from multiple threads.
+    """
+    ## Statics
+    _shared = None
+    _processInstances = {}
+
+    # Constructor
+    def __init__(self, hashName: str = DEFAULT_HASH):
+        """
+        hashName: A string name of a `hashlib` algorithm to hash file bytes with.
+        """
+        # Provided
+        self.hashName = hashName
+
+        # Assigned
+        self.hashes = 0
+        self.hashedBytes = 0
+        self.statHits = 0
+        self.decodesSaved = 0
+        self.uploadsSaved = 0
+        self.bytesSaved = 0
+        self._digests = {}
+        self._refs = {}
+        self._lock = threading.Lock()
+
+    ## Internal
+    def __reduce__(self):
+        # Send only the settings to worker processes, which each reuse one index per algorithm
+        return (ContentIndex._forProcess, (self.hashName,))
+
+    # Functions
+    def digest(self, path: str) -> str:
+        """
+        Returns the hex digest of the file's bytes, hashing it only if this file has not been hashed since it last changed.
+        Safe to call from any thread.
+
+        path: A string filepath.
+        """
+        # Check for a known file
+        stat = os.stat(path)
+        fileKey = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            known = self._digests.get(fileKey)
+            if known != None:
+                self.statHits += 1
+                return known
+
+        # Hash the bytes
+        hasher = hashlib.new(self.hashName, usedforsecurity=False)
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+
+        # NOTE: The size is part of the digest so files can only match when their lengths do.
+        digest = f"{hasher.hexdigest()}-{stat.st_size}"
+        with self._lock:
+            self._digests[fileKey] = digest
+            self.hashes += 1
+            self.hashedBytes += stat.st_size
+
+        return digest
+
+    def retain(self, digest: str) -> int:
+        """
+        Counts one more instance referencing the content.
+
+        digest: A string digest from `digest(...)`.
+
+        Returns the number of instances now referencing it.
+        """
+        with self._lock:
+            self._refs[digest] = self._refs.get(digest, 0) + 1
+            return self._refs[digest]
+
+    def release(self, digest: str) -> int:
+        """
+        Reverses one call to `retain(...)`.
+
+        digest: A string digest from `digest(...)`.
+
+        Returns the number of instances still referencing it.
+        """
+        with self._lock:
+            refs = self._refs.get(digest, 0) - 1
+            if refs > 0:
+                self._refs[digest] = refs
+            else:
+                self._refs.pop(digest, None)
+                refs = 0
+
+            return refs
+
+    def refs(self, digest: str) -> int:
+        """
+        Returns the number of instances referencing the content.
+
+        digest: A string digest from `digest(...)`.
+        """
+        with self._lock:
+            return self._refs.get(digest, 0)
+
+    def countShared(self, textureBytes: int):
+        """
+        Counts a load that reused the texture of identical content instead of decoding and uploading its own.
+
+        textureBytes: An int number of bytes of texture memory the reused texture uses.
+        """
+        with self._lock:
+            self.decodesSaved += 1
+            self.uploadsSaved += 1
+            self.bytesSaved += textureBytes
+
+    def stats(self) -> dict:
+        """
+        Returns a dict of the index's counters.
+        Keys are `images`, the instances referencing any content, `contents`, the distinct contents they reference, `duplicates`, the instances sharing another's content, `hashes`, `hashedBytes`, `statHits`, `decodesSaved`, `uploadsSaved`, and `bytesSaved`, the texture bytes that were not uploaded again.
+        """
+        with self._lock:
+            images = sum(self._refs.values())
+            return {
+                "images": images,
+                "contents": len(self._refs),
+                "duplicates": images - len(self._refs),
+                "hashes": self.hashes,
+                "hashedBytes": self.hashedBytes,
+                "statHits": self.statHits,
+                "decodesSaved": self.decodesSaved,
+                "uploadsSaved": self.uploadsSaved,
+                "bytesSaved": self.bytesSaved
+            }
+
+    # Static Functions
+    def shared():
+        """
+        Returns the shared `ContentIndex`, creating it if needed.
+        """
+        if ContentIndex._shared == None:
+            ContentIndex._shared = ContentIndex()
+
+        return ContentIndex._shared
+
+    def setShared(index):
+        """
+        Sets the shared `ContentIndex` used by every `ImguiImage` that was not given its own.
+
+        index: A `ContentIndex`.
+        """
+        ContentIndex._shared = index
+
+    def _forProcess(hashName: str):
+        """
+        Returns this process' `ContentIndex` for the algorithm, creating it if needed.
+        Used to unpickle indexes sent to `ImageLoader` worker processes so each process remembers the files it hashed.
+
+        hashName: A string name of a `hashlib` algorithm.
+        """
+        if not (hashName in ContentIndex._processInstances):
+            ContentIndex._processInstances[hashName] = ContentIndex(hashName)
+
+        return ContentIndex._processInstances[hashName]
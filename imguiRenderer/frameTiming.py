@@ -0,0 +1,268 @@
+## Frame Timing
+# Records the duration of named phases of each rendered frame into fixed size ring buffers.
+
+## Imports
+import time
+from array import array
+from contextlib import nullcontext
+
+## Constants
+DEFAULT_CAPACITY = 240
+FRAME_SPAN = "frame"
+NULL_SPAN = nullcontext()
+
+## Classes
+class FrameTimer():
+    """
+    Records the duration of named spans within each frame into fixed size ring buffers.
+    All durations are in seconds and measured with a monotonic clock.
+    """
+    # Constructor
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        capacity: An int number of frames to keep in each ring buffer.
+        """
+        # Provided
+        self.capacity = capacity
+
+        # Assigned
+        self.frameCount = 0
+        self._spans = {}
+        self._current = {}
+        self._spanStarts = {}
+        self._openSpans = 0
+        self._nested = set()
+        self._spanContexts = {}
+        self._frameStart = 0.0
+
+        # Always track the whole frame
+        self._addSpan(FRAME_SPAN)
+
+    ## Frame Functions
+    def beginFrame(self):
+        """
+        Marks the start of a new frame.
+        """
+        self._frameStart = time.perf_counter()
+
+    def endFrame(self):
+        """
+        Marks the end of the current frame and writes every span's duration into its ring buffer.
+        Spans that did not run this frame are recorded as `0`.
+        """
+        # Record the full frame
+        self._current[FRAME_SPAN] = time.perf_counter() - self._frameStart
+
+        # Write the frame into the ring buffers
+        index = self.frameCount % self.capacity
+        for name, buffer in self._spans.items():
+            buffer[index] = self._current[name]
+            self._current[name] = 0.0
+
+        self.frameCount += 1
+
+    ## Span Functions
+    def startSpan(self, name: str):
+        """
+        Starts timing the named span.
+        A span started while another is still open is nested within it, and its time is already part of the outer span's.
+
+        name: A string name for the span.
+        """
+        # Note if the span is inside another
+        if self._openSpans > 0:
+            self._nested.add(name)
+        self._openSpans += 1
+
+        self._spanStarts[name] = time.perf_counter()
+
+    def endSpan(self, name: str):
+        """
+        Stops timing the named span and adds its duration to the current frame.
+        A span may be started and ended multiple times within one frame.
+
+        name: A string name for the span. Must have been started with `startSpan(...)`.
+        """
+        # Get the duration
+        duration = time.perf_counter() - self._spanStarts[name]
+        self._openSpans -= 1
+
+        # Add the span if it is new
+        if not (name in self._spans):
+            self._addSpan(name)
+
+        self._current[name] += duration
+
+    def span(self, name: str):
+        """
+        Returns a context manager that times the named span while entered.
+
+        name: A string name for the span.
+        """
+        # Reuse the context for this name
+        context = self._spanContexts.get(name)
+        if context == None:
+            context = _TimerSpan(self, name)
+            self._spanContexts[name] = context
+
+        return context
+
+    ## Query Functions
+    def names(self) -> list:
+        """
+        Returns a list of the names of all recorded spans in the order they were first seen.
+        """
+        return list(self._spans.keys())
+
+    def topLevelNames(self) -> list:
+        """
+        Returns a list of the names of recorded spans that were never started inside another span, excluding the whole frame, in the order they were first seen.
+        Their durations do not overlap, so they can be summed.
+        """
+        return [name for name in self._spans if (name != FRAME_SPAN) and not (name in self._nested)]
+
+    def isNested(self, name: str) -> bool:
+        """
+        Returns `True` if the named span has been started inside another span.
+
+        name: A string name for the span.
+        """
+        return name in self._nested
+
+    def spanCount(self) -> int:
+        """
+        Returns the number of recorded spans, including the whole frame.
+        """
+        return len(self._spans)
+
+    def recordedFrames(self) -> int:
+        """
+        Returns the number of frames currently held in the ring buffers.
+        """
+        return min(self.frameCount, self.capacity)
+
+    def last(self, name: str = FRAME_SPAN) -> float:
+        """
+        Returns the duration of the named span in the most recently ended frame.
+
+        name: A string name for the span.
+        """
+        if (self.frameCount == 0) or not (name in self._spans):
+            return 0.0
+
+        return self._spans[name][(self.frameCount - 1) % self.capacity]
+
+    def buffer(self, name: str = FRAME_SPAN):
+        """
+        Returns the raw ring buffer for the named span as an `array` of doubles, or `None` if the span has not been seen.
+        The most recent frame is at index `(frameCount - 1) % capacity`.
+
+        name: A string name for the span.
+        """
+        return self._spans.get(name)
+
+    def samples(self, name: str = FRAME_SPAN, window: int = None) -> list:
+        """
+        Returns a list of durations for the named span ordered from oldest to newest.
+
+        name: A string name for the span.
+        window: An int number of the most recent frames to return. Provide `None` for all recorded frames.
+        """
+        # Check the span exists
+        if not (name in self._spans):
+            return []
+
+        # Resolve the window
+        count = self.recordedFrames()
+        if (window != None) and (window < count):
+            count = window
+
+        # Read from the ring
+        buffer = self._spans[name]
+        start = self.frameCount - count
+        return [buffer[i % self.capacity] for i in range(start, self.frameCount)]
+
+    def stats(self, name: str = FRAME_SPAN, window: int = None) -> dict:
+        """
+        Returns a dict of statistics for the named span over the sliding window.
+        Keys are `p50`, `p95`, `p99`, `max`, `mean`, and `count`.
+
+        name: A string name for the span.
+        window: An int number of the most recent frames to include. Provide `None` for all recorded frames.
+        """
+        # Get the samples
+        values = sorted(self.samples(name, window))
+        count = len(values)
+
+        if count == 0:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0, "mean": 0.0, "count": 0}
+
+        return {
+            "p50": FrameTimer.percentile(values, 0.50),
+            "p95": FrameTimer.percentile(values, 0.95),
+            "p99": FrameTimer.percentile(values, 0.99),
+            "max": values[-1],
+            "mean": sum(values) / count,
+            "count": count
+        }
+
+    def summary(self, window: int = None) -> dict:
+        """
+        Returns a dict of `stats(...)` for every span keyed by span name.
+
+        window: An int number of the most recent frames to include. Provide `None` for all recorded frames.
+        """
+        return {name: self.stats(name, window) for name in self._spans}
+
+    def reset(self):
+        """
+        Clears all recorded frames while keeping the known spans.
+        """
+        self.frameCount = 0
+        for name, buffer in self._spans.items():
+            for i in range(self.capacity):
+                buffer[i] = 0.0
+            self._current[name] = 0.0
+
+    ## Private Functions
+    def _addSpan(self, name: str):
+        """
+        Allocates the ring buffer for a new span.
+
+        name: A string name for the span.
+        """
+        self._spans[name] = array("d", bytes(8 * self.capacity))
+        self._current[name] = 0.0
+
+    # Static Functions
+    def percentile(sortedValues: list, fraction: float) -> float:
+        """
+        Returns the nearest rank percentile of an already sorted list.
+
+        sortedValues: A sorted list of numbers. Must not be empty.
+        fraction: A float between 0 and 1 for the percentile to find.
+        """
+        index = min(len(sortedValues) - 1, max(0, round(fraction * len(sortedValues)) - 1))
+        return sortedValues[index]
+
+class _TimerSpan():
+    """
+    A reusable context manager that times a single named span of a `FrameTimer`.
+    """
+    # Constructor
+    def __init__(self, timer: FrameTimer, name: str):
+        """
+        timer: The `FrameTimer` to record into.
+        name: A string name for the span.
+        """
+        self.timer = timer
+        self.name = name
+
+    ## Internal
+    def __enter__(self):
+        self.timer.startSpan(self.name)
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.timer.endSpan(self.name)
+        return False
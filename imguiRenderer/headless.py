@@ -0,0 +1,198 @@
+## Headless Frame Builder
+# Builds ImGui frames without a window or GL context so the cost of UI code can be benchmarked.
+
+## Imports
+import time
+import imgui
+
+from .frameTiming import FrameTimer, FRAME_SPAN
+from .textureCache import TextureCache
+
+## Constants
+DEFAULT_DISPLAY_SIZE = (1280, 720)
+DEFAULT_WARMUP_FRAMES = 3
+SPAN_BUILD = "build"
+SPAN_RENDER = "render"
+
+## Classes
+class HeadlessTexture():
+    """
+    A stand-in for a GL texture that only carries the attributes `ImguiImage.drawTexture(...)` reads.
+    ImGui only stores the id in its draw commands so no GL texture is needed to build a frame.
+    """
+    # Constructor
+    def __init__(self, width: int, height: int, id: int = 1):
+        """
+        width: An int width in pixels.
+        height: An int height in pixels.
+        id: An int texture id to place in the draw commands.
+        """
+        self.width = width
+        self.height = height
+        self.id = id
+
+class HeadlessFrameBuilder():
+    """
+    Runs ImGui `new_frame()`, a provided build function, and `render()` in a private ImGui context with no window or GL.
+    Reports the Python CPU time of each frame and statistics of the produced draw data.
+    """
+    # Constructor
+    def __init__(self, displaySize: tuple = DEFAULT_DISPLAY_SIZE, deltaTime: float = 1/60.):
+        """
+        displaySize: A tuple containing the simulated display size as (width, height).
+        deltaTime: A float number of seconds ImGui should treat each frame as taking.
+        """
+        # Provided
+        self.displaySize = displaySize
+        self.deltaTime = deltaTime
+
+        # Assigned
+        self._context = None
+        self._prevContext = None
+
+    ## Internal
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+        return False
+
+    # Functions
+    def open(self):
+        """
+        Creates the private ImGui context and builds its font atlas on the CPU.
+        """
+        # Keep any existing context to restore later
+        self._prevContext = imgui.get_current_context()
+
+        # Create the context
+        self._context = imgui.create_context()
+        imgui.set_current_context(self._context)
+
+        # Configure the display
+        io = imgui.get_io()
+        io.display_size = self.displaySize
+        io.delta_time = self.deltaTime
+        io.ini_file_name = None
+
+        # Build the font atlas without uploading it
+        io.fonts.get_tex_data_as_rgba32()
+
+    def close(self):
+        """
+        Destroys the private ImGui context and restores the previous one.
+        """
+        if self._context != None:
+            imgui.destroy_context(self._context)
+            self._context = None
+
+        if self._prevContext != None:
+            imgui.set_current_context(self._prevContext)
+            self._prevContext = None
+
+    def run(self, build, frames: int, warmup: int = DEFAULT_WARMUP_FRAMES) -> dict:
+        """
+        Builds the provided number of frames and reports their costs.
+
+        build: A function with no parameters that issues ImGui calls for one frame.
+        frames: An int number of frames to measure.
+        warmup: An int number of unmeasured frames to build first so windows can settle their sizes.
+
+        Returns a dict with `frames`, `cpu` and `wall` timing statistics in milliseconds, and `vertices`, `indices`, `commands`, and `drawLists` statistics.
+        """
+        # Open if needed
+        if self._context == None:
+            self.open()
+        imgui.set_current_context(self._context)
+
+        # Warm up
+        for _ in range(warmup):
+            self._buildFrame(build)
+
+        # Prepare the counters
+        timer = FrameTimer(frames)
+        cpuTimes = []
+        vertices = []
+        indices = []
+        commands = []
+        drawLists = []
+
+        # Measure
+        for _ in range(frames):
+            # Build the frame
+            cpuStart = time.thread_time()
+            timer.beginFrame()
+
+            timer.startSpan(SPAN_BUILD)
+            TextureCache.advanceFrame()
+            imgui.new_frame()
+            build()
+            timer.endSpan(SPAN_BUILD)
+
+            timer.startSpan(SPAN_RENDER)
+            imgui.render()
+            timer.endSpan(SPAN_RENDER)
+
+            timer.endFrame()
+            cpuTimes.append(time.thread_time() - cpuStart)
+
+            # Count the draw data
+            drawData = imgui.get_draw_data()
+            vertices.append(drawData.total_vtx_count)
+            indices.append(drawData.total_idx_count)
+            commands.append(sum(len(cmdList.commands) for cmdList in drawData.commands_lists))
+            drawLists.append(drawData.cmd_count)
+
+        return {
+            "frames": frames,
+            "wall": HeadlessFrameBuilder._toMs(timer.stats(FRAME_SPAN)),
+            "build": HeadlessFrameBuilder._toMs(timer.stats(SPAN_BUILD)),
+            "render": HeadlessFrameBuilder._toMs(timer.stats(SPAN_RENDER)),
+            "cpu": HeadlessFrameBuilder._toMs(HeadlessFrameBuilder._stats(cpuTimes)),
+            "vertices": HeadlessFrameBuilder._stats(vertices),
+            "indices": HeadlessFrameBuilder._stats(indices),
+            "commands": HeadlessFrameBuilder._stats(commands),
+            "drawLists": HeadlessFrameBuilder._stats(drawLists)
+        }
+
+    ## Private functions
+    def _buildFrame(self, build):
+        """
+        Builds a single unmeasured frame.
+
+        build: A function with no parameters that issues ImGui calls for one frame.
+        """
+        TextureCache.advanceFrame()
+        imgui.new_frame()
+        build()
+        imgui.render()
+
+    # Static Functions
+    def _stats(values: list) -> dict:
+        """
+        Returns a dict of `mean`, `p50`, `p95`, `p99`, and `max` for the provided list of numbers.
+
+        values: A list of numbers.
+        """
+        # Check for values
+        if len(values) == 0:
+            return {"mean": 0, "p50": 0, "p95": 0, "p99": 0, "max": 0}
+
+        ordered = sorted(values)
+        return {
+            "mean": sum(ordered) / len(ordered),
+            "p50": FrameTimer.percentile(ordered, 0.50),
+            "p95": FrameTimer.percentile(ordered, 0.95),
+            "p99": FrameTimer.percentile(ordered, 0.99),
+            "max": ordered[-1]
+        }
+
+    def _toMs(stats: dict) -> dict:
+        """
+        Returns a copy of a statistics dict with every timing converted from seconds to milliseconds.
+
+        stats: A dict of statistics in seconds.
+        """
+        return {key: (value * 1000 if key != "count" else value) for key, value in stats.items()}
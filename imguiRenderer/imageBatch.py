@@ -0,0 +1,125 @@
+## Image Batch
+# Loads many images at once across a pool of worker processes and hands them back as they finish.
+
+## Imports
+import time
+from collections import deque
+
+from .imguiImage import ImguiImage
+from .imageLoader import ImageLoader, DEFAULT_UPLOAD_BUDGET, STATE_UPLOADED, STATE_FAILED
+
+## Classes
+class ImageBatch():
+    """
+    Loads a list of images together, decoding and thumbnailing them on an `ImageLoader`, by default the shared pool of worker processes.
+    Workers do all of the decoding and resizing, so only the GL uploads run on the render thread and loading scales with the number of cores.
+    Finished images are handed back through `ready()` from a render loop, or by iterating over `results()` outside of one.
+    """
+    # Constructor
+    def __init__(self, paths: list, thumbLimit=(1280, 720), background: tuple = None, ordered: bool = False, loader: ImageLoader = None, **kwargs):
+        """
+        paths: A list of string filepaths pointing to the image files.
+        thumbLimit: A tuple representing the maximum long and short sides of each thumbnail as (long side length, short side length). Provide `None` to use each image's real size.
+        background: A tuple containing a background color to add behind each image as (r, g, b)[255]. Supply `None` to indicate no background should be added.
+        ordered: If `True`, images are handed back in the order of `paths`, each waiting for those before it. Otherwise they are handed back as soon as they finish.
+        loader: The `ImageLoader` to decode with. Provide `None` to use `ImageLoader.sharedProcesses()`.
+        kwargs: Other keyword arguments for each `ImguiImage`.
+        """
+        # Provided
+        self.ordered = ordered
+        self._loader = loader if (loader != None) else ImageLoader.sharedProcesses()
+
+        # Assigned
+        self.images = [ImguiImage(path, thumbLimit=thumbLimit, **kwargs) for path in paths]
+        self.finished = 0
+        self.failed = 0
+        self._waiting = deque(range(len(self.images)))
+
+        # Queue every image
+        for img in self.images:
+            img.loadAsync(background, self._loader)
+
+    ## Internal
+    def __len__(self) -> int:
+        return len(self.images)
+
+    def __iter__(self):
+        return self.results()
+
+    # Functions
+    def ready(self) -> list:
+        """
+        Returns the images that finished loading since the last call, including those that failed.
+        Does not upload anything itself, so call from a render loop that calls `ImageLoader.processAll(...)`, as `PygletImGui` does every frame.
+        """
+        finished = []
+        if self.ordered:
+            # Hand back the finished images at the front
+            while (len(self._waiting) > 0) and ImageBatch._isFinished(self.images[self._waiting[0]]):
+                finished.append(self.images[self._waiting.popleft()])
+        else:
+            # Hand back every finished image
+            waiting = deque()
+            for i in self._waiting:
+                if ImageBatch._isFinished(self.images[i]):
+                    finished.append(self.images[i])
+                else:
+                    waiting.append(i)
+            self._waiting = waiting
+
+        # Count them
+        self.finished += len(finished)
+        self.failed += sum(1 for img in finished if img.state == STATE_FAILED)
+
+        return finished
+
+    def results(self, timeout: float = None):
+        """
+        Yields each image as it finishes loading, uploading textures on the calling thread while waiting.
+        Must be called from the thread that owns the GL context.
+
+        timeout: A float number of seconds to wait for the whole batch at most. Provide `None` to wait until every image has finished.
+        """
+        deadline = None if (timeout == None) else (time.monotonic() + timeout)
+        while not self.done():
+            # Upload any decoded images
+            self._loader.processUploads(DEFAULT_UPLOAD_BUDGET)
+            for img in self.ready():
+                yield img
+
+            if self.done():
+                return
+
+            # Wait for the workers
+            remaining = None if (deadline == None) else (deadline - time.monotonic())
+            if (remaining != None) and (remaining <= 0):
+                return
+
+            if (not self._loader.waitForReady(remaining)) and (self._loader.pending() == 0):
+                # Nothing left that could finish the remaining images
+                return
+
+    def done(self) -> bool:
+        """
+        Returns `True` once every image has been handed back.
+        """
+        return len(self._waiting) == 0
+
+    def cancel(self):
+        """
+        Cancels every image that has not finished loading.
+        Cancelled images are never handed back.
+        """
+        for i in self._waiting:
+            self.images[i].cancel()
+
+        self._waiting.clear()
+
+    # Static Functions
+    def _isFinished(img: ImguiImage) -> bool:
+        """
+        Returns `True` if the image has been uploaded or has failed.
+
+        img: The `ImguiImage` to check.
+        """
+        return img.state in (STATE_UPLOADED, STATE_FAILED)
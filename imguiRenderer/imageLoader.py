@@ -0,0 +1,260 @@
+## Image Loader
+# Decodes images on a pool of worker threads and hands them back to the render thread for GL upload.
+
+## Imports
+import os
+import time
+import weakref
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+## Constants
+DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 1)))
+DEFAULT_PROCESS_WORKERS = max(1, (os.cpu_count() or 1))
+DEFAULT_UPLOAD_BUDGET = 0.004
+
+STATE_IDLE = "idle"
+STATE_QUEUED = "queued"
+STATE_DECODING = "decoding"
+STATE_READY = "readyToUpload"
+STATE_UPLOADED = "uploaded"
+STATE_FAILED = "failed"
+
+## Classes
+class ImageJob():
+    """
+    A single request to decode an image on a worker.
+    """
+    # Constructor
+    def __init__(self, owner, decode, args: tuple = None):
+        """
+        owner: The object that requested the decode. Must provide `_onDecodeStarted(job)`, `_onDecodeFinished(job)`, and `_onUploadFailed(job)`.
+        decode: A function that takes this job and returns the decoded result. Runs on a worker thread and should return early if `cancelled` becomes `True`.
+        args: A tuple of arguments to call `decode` with in place of the job. Required by loaders using processes, where `decode` must be a module or class level function and the arguments and result must be picklable. `_onDecodeStarted(job)` is not called for these jobs.
+        """
+        # Provided
+        self.owner = owner
+        self.decode = decode
+        self.args = args
+
+        # Assigned
+        self.cancelled = False
+        self.result = None
+        self.error = None
+        self.future = None
+
+    # Functions
+    def cancel(self):
+        """
+        Cancels the job.
+        A job that has not started is removed from the queue. A running decode is discarded when it finishes.
+        """
+        self.cancelled = True
+        if self.future != None:
+            self.future.cancel()
+
+class ImageLoader():
+    """
+    Decodes images on a pool of worker threads, or worker processes.
+    Decoded results are held until `processUploads(...)` is called from the render thread, which hands them back to their owners for GL upload.
+    Processes avoid the GIL while decoding and resizing, so they scale with the number of cores, but each result is copied back to the render process.
+    """
+    ## Statics
+    _instances = weakref.WeakSet()
+    _shared = None
+    _sharedProcesses = None
+
+    # Constructor
+    def __init__(self, workers: int = DEFAULT_WORKERS, processes: bool = False):
+        """
+        workers: An int number of worker threads or processes.
+        processes: If `True`, jobs are decoded in worker processes and must be submitted with `args`. Processes are spawned rather than forked so they do not inherit the GL context, so the main script must be guarded by `if __name__ == "__main__":`.
+        """
+        # Provided
+        self.workers = workers
+        self.processes = processes
+
+        # Assigned
+        if processes:
+            self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ImageLoader")
+        self._ready = deque()
+        self._lock = threading.Lock()
+        self._readyCondition = threading.Condition(self._lock)
+        self._pending = 0
+
+        # Register for `processAll(...)`
+        ImageLoader._instances.add(self)
+
+    # Functions
+    def submit(self, job: ImageJob) -> ImageJob:
+        """
+        Queues the provided job for decoding.
+
+        job: The `ImageJob` to decode.
+
+        Returns the job.
+        """
+        with self._lock:
+            self._pending += 1
+
+        if self.processes:
+            job.future = self._executor.submit(job.decode, *job.args)
+        else:
+            job.future = self._executor.submit(self._runJob, job)
+        job.future.add_done_callback(lambda future: self._onFutureDone(job, future))
+        return job
+
+    def pending(self) -> int:
+        """
+        Returns the number of jobs that are queued, decoding, or waiting for upload.
+        """
+        with self._lock:
+            return self._pending + len(self._ready)
+
+    def waitForReady(self, timeout: float = None) -> bool:
+        """
+        Blocks until at least one decoded job is waiting for `processUploads(...)`.
+
+        timeout: A float number of seconds to wait at most. Provide `None` to wait until a job is ready or none are pending.
+
+        Returns `True` if a job is ready.
+        """
+        with self._readyCondition:
+            self._readyCondition.wait_for(lambda: (len(self._ready) > 0) or (self._pending == 0), timeout)
+            return len(self._ready) > 0
+
+    def processUploads(self, budget: float = DEFAULT_UPLOAD_BUDGET) -> int:
+        """
+        Hands decoded jobs back to their owners for upload.
+        Must be called from the render thread.
+
+        budget: A float number of seconds to spend before stopping. At least one job is always processed if any are ready. Provide `None` to process all ready jobs.
+
+        Returns the number of jobs processed.
+        """
+        start = time.perf_counter()
+        count = 0
+
+        while True:
+            # Get the next job
+            with self._lock:
+                if len(self._ready) == 0:
+                    break
+                job = self._ready.popleft()
+
+            # Finish the job
+            # NOTE: An upload that raises would otherwise stop the frame and leave the rest of the ready jobs waiting, so the owner is told the job failed instead.
+            if not job.cancelled:
+                try:
+                    job.owner._onDecodeFinished(job)
+                except Exception as e:
+                    job.error = e
+                    job.owner._onUploadFailed(job)
+            count += 1
+
+            # Check the budget
+            if (budget != None) and ((time.perf_counter() - start) >= budget):
+                break
+
+        return count
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stops the worker threads.
+        Queued jobs are cancelled.
+
+        wait: If `True`, waits for running decodes to finish.
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        ImageLoader._instances.discard(self)
+
+    ## Private Functions
+    def _runJob(self, job: ImageJob):
+        """
+        Decodes the provided job on a worker thread.
+
+        job: The `ImageJob` to decode.
+        """
+        # Check if cancelled while queued
+        if job.cancelled:
+            return
+
+        # Decode
+        job.owner._onDecodeStarted(job)
+        try:
+            job.result = job.decode(job)
+        except Exception as e:
+            job.error = e
+
+    def _onFutureDone(self, job: ImageJob, future):
+        """
+        Moves a finished job to the ready queue.
+
+        job: The finished `ImageJob`.
+        future: The job's `Future`.
+        """
+        # Collect the result from the worker process
+        if self.processes and not (job.cancelled or future.cancelled()):
+            try:
+                job.result = future.result()
+            except Exception as e:
+                job.error = e
+
+        with self._lock:
+            self._pending -= 1
+            if not (job.cancelled or future.cancelled()):
+                self._ready.append(job)
+            self._readyCondition.notify_all()
+
+    # Static Functions
+    def shared():
+        """
+        Returns the shared `ImageLoader`, creating it if needed.
+        """
+        if ImageLoader._shared == None:
+            ImageLoader._shared = ImageLoader()
+
+        return ImageLoader._shared
+
+    def sharedProcesses():
+        """
+        Returns the shared `ImageLoader` backed by worker processes, creating it if needed.
+        """
+        if ImageLoader._sharedProcesses == None:
+            ImageLoader._sharedProcesses = ImageLoader(DEFAULT_PROCESS_WORKERS, processes=True)
+
+        return ImageLoader._sharedProcesses
+
+    def processAll(budget: float = DEFAULT_UPLOAD_BUDGET) -> int:
+        """
+        Calls `processUploads(...)` on every live `ImageLoader`.
+        Must be called from the render thread.
+
+        budget: A float number of seconds to spend across all loaders. Provide `None` to process all ready jobs.
+
+        Returns the number of jobs processed.
+        """
+        start = time.perf_counter()
+        count = 0
+
+        for loader in list(ImageLoader._instances):
+            # Resolve the remaining budget
+            remaining = None
+            if budget != None:
+                remaining = budget - (time.perf_counter() - start)
+                if (remaining <= 0) and (count > 0):
+                    break
+
+            count += loader.processUploads(remaining)
+
+        return count
+
+    def pendingAll() -> int:
+        """
+        Returns the number of pending jobs across every live `ImageLoader`.
+        """
+        return sum(loader.pending() for loader in list(ImageLoader._instances))
@@ -4,33 +4,80 @@
 ## Imports
 import os
 import imgui
-from io import BytesIO
 from PIL import Image
+from pyglet import gl
 from pyglet import image as pygletImage
 
+from .textureCache import TextureCache, BYTES_PER_PIXEL
+from .texturePool import TexturePool
+from .thumbnailCache import ThumbnailCache
+from .textureAtlas import TextureAtlas
+from .remoteSource import RemoteSource
+from .contentIndex import ContentIndex
+from .imageLoader import ImageLoader, ImageJob, STATE_IDLE, STATE_QUEUED, STATE_DECODING, STATE_READY, STATE_UPLOADED, STATE_FAILED
+
 ## Classes
 class ImguiImage():
     """
     Object that contains information needed to render images within ImGui more easily.
     """
+    ## Statics
+    UPLOAD_MODES = ("RGBA", "RGB")
+    PLACEHOLDER_COLOR = (0.2, 0.2, 0.2, 1.0)
+    LOD_MAX_LEVEL = 4
+    _npotSupported = None
+    _contentLoads = {}
+
     # Constructor
-    def __init__(self, filepath: str, metadata=None, thumbLimit=(1280, 720), verbose=False):
+    def __init__(self, filepath: str, metadata=None, thumbLimit=(1280, 720), verbose=False, cache: TextureCache = None, thumbCache: ThumbnailCache = None, lean: bool = False, atlas: TextureAtlas = None, mipmaps: bool = False, lod: bool = False, npot: bool = None, remote: RemoteSource = None, dedup: bool = False, contentIndex: ContentIndex = None, pool: TexturePool = None):
         """
-        path: A string filepath poiting to the image file.
+        path: A string filepath poiting to the image file, or an `http://` or `https://` URL.
         metadata: A dict of additonal data for the item. Can also provided `None` for no additonal data.
         thumbLimits: A tuple representing the maximum long and short sides of the generated thumbnail display texture as (long side length, short side length). Provide `None` to use the image's real size.
         verbose: If `True`, enables verbose output.
+        cache: The `TextureCache` to keep the display texture in. Provide `None` to use the shared cache.
+        thumbCache: The `ThumbnailCache` to read and store thumbnails on disk with. Provide `None` to use the shared cache, if one has been set.
+        lean: If `True`, only the image's dimensions and display texture are kept after loading. The full resolution pixels are released as soon as the thumbnail is made and the image is decoded again if its texture is evicted.
+        atlas: The `TextureAtlas` to pack the display texture into if it is small enough. Provide `None` to use the shared atlas, if one has been set.
+        mipmaps: If `True`, mipmaps are generated for each uploaded texture so it is filtered smoothly when drawn smaller than its size. Uses a third more texture memory. Not applied to textures packed into an atlas.
+        lod: If `True`, drawing the image much smaller than its thumbnail switches to a smaller texture made at a lower level of detail, letting the full size texture be evicted. Smaller levels are made in the background and the full size texture is drawn until they are ready.
+        npot: If `True`, textures are uploaded at their exact size. If `False`, textures are padded up to power of two sizes. Provide `None` to use exact sizes when the GL context supports them.
+        remote: The `RemoteSource` to fetch URLs with. Provide `None` to use the shared source.
+        dedup: If `True`, local images are keyed by a hash of their contents instead of their path, so copies and links of the same picture share one decoded thumbnail and one texture. Asynchronous loads hash the file on a worker before decoding.
+        contentIndex: The `ContentIndex` to identify contents with. Provide `None` to use the shared index.
+        pool: The `TexturePool` to take textures from and return them to. Provide `None` to use the shared pool.
         """
         # Provided
         self.path = filepath
         self.metadata = metadata
         self.verbose = verbose
         self._thumbLimit = thumbLimit
+        self._cache = cache
+        self._thumbCache = thumbCache
+        self.lean = lean
+        self._atlas = atlas
+        self.mipmaps = mipmaps
+        self.lod = lod
+        self.npot = npot
+        self._remote = remote
+        self.dedup = dedup
+        self._contentIndex = contentIndex
+        self._pool = pool
 
         # Assigned
         self.loaded = False
+        self.state = STATE_IDLE
         self._tempFile = None
-        self._texture = None
+        self._size = None
+        self._job = None
+        self._mtime = None
+        self._background = None
+        self._opaque = False
+        self._loadedAsync = False
+        self._levelJobs = {}
+        self._digest = None
+        self._contentJob = None
+        self._loader = None
 
     ## Internal
     def __str__(self) -> str:
@@ -48,38 +95,85 @@ class ImguiImage():
     # Functions
     def load(self, skipTexture = False, background: tuple = None):
         """
-        Loads the image into a temporary file if it is remote.
-        If the file is local, the image is prepared.
+        Prepares the image, fetching it first if it is remote.
+        Remote images are decoded straight from memory and never written to a temporary file.
 
         skipTexture: If True, the display texture will not preloaded.
-        background: A tuple containing a background color to add behind the image as (r, g, b)[255]. Supply `None` to indicate no background should be added.
+        background: A tuple containing a background color to fill behind the image when it is drawn as (r, g, b)[255]. Supply `None` to indicate no background should be added. The texture does not include it, so it can be changed later with `setBackground(...)` without loading again.
         """
+        # Stop any asynchronous load
+        self.cancel()
+
         # Close if a previous exists
         if self._tempFile != None:
             self._tempFile.close()
 
-        # Check if the local file exists
-        if os.path.isfile(self.path):
-            # Check if background color provided
-            if background != None:
-                # Create background image
-                # Open the target image
-                with Image.open(self.path) as targetImg:
-                    # Create working image
-                    workingImg = Image.new("RGBA", targetImg.size, background)
-
-                    # Paste the target image into the background
-                    workingImg.paste(targetImg, (0, 0), targetImg)
-            else:
-                # Open the image
-                workingImg = Image.open(self.path)
+        # Fetch remote images
+        source = self.path
+        thumbCache = self._getThumbCache()
+        if RemoteSource.isRemote(self.path):
+            try:
+                source, self._mtime = self._getRemote().fetch(self.path)
+            except OSError as e:
+                print(f"{self} could not be fetched: {e}")
+                source = None
+
+            # NOTE: Thumbnails are cached by file, so remote images rely on the `RemoteSource` cache instead.
+            thumbCache = None
+        elif os.path.isfile(self.path):
+            self._mtime = os.path.getmtime(self.path)
+
+            # Identify the content
+            if self.dedup:
+                self._setDigest(self._getContentIndex().digest(self.path))
+        else:
+            print(f"{self} has been provided with incorrect path information.")
+            source = None
+
+        # Check if the image can be read
+        if source != None:
+            # Record what is being loaded
+            self._background = background
+            self._loadedAsync = False
+            self._tempFile = None
+            imgThumb = None
+
+            # Check for a texture made from identical content
+            shared = (self._digest != None) and (self.textureKey() in self._getCache())
+            if shared:
+                self._countShared()
+
+            # Check for a cached thumbnail
+            if self.lean or shared:
+                # Only decode what the texture needs
+                if skipTexture or (self.textureKey() in self._getCache()):
+                    with Image.open(source) as img:
+                        self._size = img.size
+                else:
+                    imgThumb, self._size = ImguiImage.decodeThumbnail(source, self._thumbLimit, None, thumbCache)
+            elif thumbCache != None:
+                cached = thumbCache.get(self.path, self._thumbLimit)
+                if cached != None:
+                    imgThumb, self._size = cached
+
+            if (imgThumb == None) and (not (self.lean or shared)):
+                # Keep the image for texture display, reduced where the decoder allows
+                # NOTE: Rows stay top to bottom. `_preloadTexture()` uploads them in that order so no flip is needed.
+                self._tempFile, self._size = ImguiImage.openReduced(source, self._thumbLimit)
 
-            # Flip the image for texture display
-            self._tempFile = workingImg.transpose(Image.FLIP_TOP_BOTTOM)
+                # Store the thumbnail for next time
+                if thumbCache != None:
+                    imgThumb = ImguiImage.makeThumbnail(self._tempFile, self._thumbLimit)
+                    thumbCache.put(self.path, self._thumbLimit, None, imgThumb, self._size)
 
-            # Preload the texture
-            if not skipTexture:
-                self._preloadTexture()
+            # Preload the texture if it is not already cached
+            if not (skipTexture or (self.textureKey() in self._getCache())):
+                if imgThumb != None:
+                    self._uploadTexture(imgThumb)
+                else:
+                    self._preloadTexture()
+            elif imgThumb != None:
+                imgThumb.close()
 
             # Verbose
             if self.verbose:
@@ -92,20 +186,112 @@ class ImguiImage():
 
             # Mark as loaded
             self.loaded = True
-            workingImg.close()
+            if self.textureKey() in self._getCache():
+                self.state = STATE_UPLOADED
         else:
-            # Report the problem and release the tempfile
-            print(f"{self} has been provided with incorrect path information.")
-
             # Mark as failed
             self.loaded = False
+            self.state = STATE_FAILED
+
+    def loadAsync(self, background: tuple = None, loader: ImageLoader = None):
+        """
+        Queues the image to be decoded and thumbnailed on a worker thread, or a worker process if the loader uses processes.
+        The texture is uploaded on the render thread when `ImageLoader.processAll(...)` is next called, which `PygletImGui` does every frame.
+        Until then `draw(...)` and `drawButton(...)` show a placeholder.
+        Progress can be followed through `state`.
 
-    def close(self):
+        background: A tuple containing a background color to fill behind the image when it is drawn as (r, g, b)[255]. Supply `None` to indicate no background should be added. The texture does not include it, so it can be changed later with `setBackground(...)` without loading again.
+        loader: The `ImageLoader` to decode with. Provide `None` to use the shared loader.
+        """
+        # Check if already loading or loaded
+        if self.state in (STATE_QUEUED, STATE_DECODING, STATE_READY, STATE_UPLOADED):
+            self._background = background
+            return
+
+        # Check the file
+        remote = None
+        if RemoteSource.isRemote(self.path):
+            # Fetch remote images on the worker, revalidating any cached copy
+            remote = self._getRemote()
+        elif not os.path.isfile(self.path):
+            print(f"{self} has been provided with incorrect path information.")
+            self.state = STATE_FAILED
+            return
+        else:
+            # Check if the texture is already cached
+            mtime = os.path.getmtime(self.path)
+            if (self._size != None) and (self._mtime == mtime) and (self.textureKey() in self._getCache()):
+                self._background = background
+                self.state = STATE_UPLOADED
+                self.loaded = True
+                return
+
+            self._mtime = mtime
+
+        # Resolve the loader
+        if loader == None:
+            loader = ImageLoader.shared()
+
+        # Record what is being loaded
+        self._background = background
+        self._loadedAsync = True
+        self._loader = loader
+
+        # Identify the content first so identical images share one decode
+        if self.dedup and (remote == None):
+            self._queueIdentify()
+            return
+
+        self._queueDecode()
+
+    def cancel(self):
+        """
+        Cancels any asynchronous load that has not yet been uploaded.
+        """
+        if self._job != None:
+            self._job.cancel()
+            self._job = None
+
+            if self.state != STATE_UPLOADED:
+                self.state = STATE_IDLE
+
+        if self._contentJob != None:
+            self._contentJob.cancel()
+            self._contentJob = None
+
+            if self.state != STATE_UPLOADED:
+                self.state = STATE_IDLE
+
+        # Stop waiting on identical content
+        if self._leaveContentLoad() and (self.state != STATE_UPLOADED):
+            self.state = STATE_IDLE
+
+        # Cancel any level of detail loads
+        for job in self._levelJobs.values():
+            if job != None:
+                job.cancel()
+        self._levelJobs.clear()
+
+    def close(self, releaseTextures: bool = False):
         """
         Explicitly closes any loaded temporary files.
+        Cancels any asynchronous load.
+
+        releaseTextures: If `True`, also releases the textures now with `releaseTextures()`. If `False`, they stay in the `TextureCache` until evicted so loading the image again is fast.
         """
+        # Stop any asynchronous load
+        self.cancel()
+
+        # Release the textures
+        if releaseTextures:
+            self.releaseTextures()
+
         # Mark as not loaded
         self.loaded = False
+        self.state = STATE_IDLE
+
+        # Stop referencing the content
+        self._setDigest(None)
 
         # Clean temp file
         if self._tempFile != None:
@@ -122,11 +308,13 @@ class ImguiImage():
         offset: A tuple containing points of offset for the image as (x, y).
         border: An RGBA tuple containing a border color as (r, g, b, a).
         """
-        # Check if image item was loaded
+        # Get the texture if loaded
+        tex = None
         if self.loaded:
-            # Get the texture
-            tex = self.getTexture()
+            tex = self._drawableTexture(self._drawSize(containerSize, shouldFit))
 
+        # Check if image item can be drawn
+        if tex != None:
             # Draw the texture
             ImguiImage.drawTexture(
                 tex,
@@ -135,8 +323,12 @@ class ImguiImage():
                 shouldFit,
                 center,
                 offset,
-                border
+                border,
+                background=self._drawBackground()
             )
+        elif self.state in (STATE_QUEUED, STATE_DECODING, STATE_READY):
+            # Draw a placeholder while loading
+            ImguiImage.drawPlaceholder(containerSize, "Loading...")
         else:
             # Draw text instead
             imgui.text("Image has not been loaded.")
@@ -149,13 +341,15 @@ class ImguiImage():
         shouldFit: A boolean indicating if the source image should fit within the content area or cover the content area. Fit is indicated by `True` and ensures the whole source image will be seen but some background color may be visible. Cover is indicated by `False` and ensures that the entirety of the content area will be covered but the source image will likely be cropped.
         center: A boolean indicating if the rendered image should be centered in the provided `containerSize`.
         offset: A tuple containing points of offset for the image as (x, y).
-        border: An RGBA tuple containing a border color as (r, g, b, a).
+        border: An RGBA tuple containing a color to fill behind the button's image as (r, g, b, a). Ignored if the image has a background color, which takes precedence.
         """
-        # Check if image item was loaded
+        # Get the texture if loaded
+        tex = None
         if self.loaded:
-            # Get the texture
-            tex = self.getTexture()
+            tex = self._drawableTexture(self._drawSize(containerSize, shouldFit))
 
+        # Check if image item can be drawn
+        if tex != None:
             # Draw the texture
             return ImguiImage.drawTexture(
                 tex,
@@ -165,8 +359,13 @@ class ImguiImage():
                 center,
                 offset,
                 border,
-                asButton=True
+                asButton=True,
+                background=self._drawBackground()
             )
+        elif self.state in (STATE_QUEUED, STATE_DECODING, STATE_READY):
+            # Draw a placeholder while loading
+            ImguiImage.drawPlaceholder(containerSize, "Loading...")
+            return False
         else:
             # Draw text instead
             imgui.text("Image has not been loaded.")
@@ -182,7 +381,7 @@ class ImguiImage():
         if not self.loaded:
             self.load()
 
-        return self._tempFile.size
+        return self._size
 
     def getTexture(self):
         """
@@ -196,44 +395,800 @@ class ImguiImage():
         if not self.loaded:
             self.load()
 
-        # Check if the texture is not loaded
-        if self._texture == None:
-            self._preloadTexture()
+        # Check the cache
+        tex = self._getCache().get(self.textureKey())
+        if tex == None:
+            tex = self._rebuildTexture()
+
+        return tex
+
+    def textureKey(self, level: int = 0) -> tuple:
+        """
+        Returns the key this image's display texture is stored under in the `TextureCache` as (path, mtime, thumbLimit).
+        Images keyed by content use ("content", digest, thumbLimit) instead, so identical images share a texture.
+        The background is filled in when drawing, so it is not part of the key.
+
+        level: An int level of detail. Each level halves the thumbnail limit. Provide `0` for the full size display texture.
+        """
+        if self._digest != None:
+            return ("content", self._digest, ImguiImage.levelLimit(self._thumbLimit, level))
+
+        return (self.path, self._mtime, ImguiImage.levelLimit(self._thumbLimit, level))
+
+    def pin(self):
+        """
+        Prevents this image's display texture from being evicted from the `TextureCache` until `unpin()` is called.
+        Textures drawn during the current or previous frame are never evicted, so this is only needed for images that are not drawn every frame.
+        """
+        self._getCache().pin(self.textureKey())
+
+    def unpin(self):
+        """
+        Reverses one call to `pin()`.
+        """
+        self._getCache().unpin(self.textureKey())
+
+    def releaseTextures(self):
+        """
+        Removes this image's display texture and any smaller levels of detail from the `TextureCache` now instead of when they are evicted.
+        Textures return to their `TexturePool` to be reused by the next upload of a similar size.
+        Safe to call from any thread. Off the render thread the textures are released at the start of the next frame.
+        Images keyed by content keep textures other instances with the same content still use.
+        """
+        # Keep textures identical images still show
+        if (self._digest != None) and (self._getContentIndex().refs(self._digest) > 1):
+            return
+
+        # Release every level on the render thread
+        cache = self._getCache()
+        keys = [self.textureKey(level) for level in range(ImguiImage.LOD_MAX_LEVEL + 1)]
+        def release():
+            for key in keys:
+                cache.release(key)
+
+        TexturePool.runOnRenderThread(release)
 
-        return self._texture
+    def setBackground(self, background: tuple):
+        """
+        Sets the background color filled behind the image when it is drawn.
+        Only changes how the image is drawn, so it costs nothing however many images are changed.
+
+        background: A tuple containing a background color as (r, g, b)[255]. Supply `None` to indicate no background should be added.
+        """
+        self._background = background
 
     ## Private functions
+    def _getCache(self) -> TextureCache:
+        """
+        Returns the `TextureCache` this image uses.
+        """
+        if self._cache == None:
+            self._cache = TextureCache.shared()
+
+        return self._cache
+
+    def _getPool(self) -> TexturePool:
+        """
+        Returns the `TexturePool` this image takes textures from.
+        """
+        if self._pool == None:
+            return TexturePool.shared()
+
+        return self._pool
+
+    def _getThumbCache(self) -> ThumbnailCache:
+        """
+        Returns the `ThumbnailCache` this image uses, or `None` if there is none.
+        """
+        if self._thumbCache == None:
+            return ThumbnailCache.shared()
+
+        return self._thumbCache
+
+    def _getRemote(self) -> RemoteSource:
+        """
+        Returns the `RemoteSource` this image fetches URLs with.
+        """
+        if self._remote == None:
+            return RemoteSource.shared()
+
+        return self._remote
+
+    def _getContentIndex(self) -> ContentIndex:
+        """
+        Returns the `ContentIndex` this image identifies its content with.
+        """
+        if self._contentIndex == None:
+            return ContentIndex.shared()
+
+        return self._contentIndex
+
+    def _getAtlas(self) -> TextureAtlas:
+        """
+        Returns the `TextureAtlas` this image uses, or `None` if there is none.
+        """
+        if self._atlas == None:
+            return TextureAtlas.shared()
+
+        return self._atlas
+
+    def _useNpot(self) -> bool:
+        """
+        Returns `True` if this image's textures should be uploaded at their exact size.
+        """
+        if self.npot == None:
+            return ImguiImage.supportsNpot()
+
+        return self.npot
+
+    def _drawSize(self, containerSize: tuple, shouldFit: bool) -> tuple:
+        """
+        Returns the size this image will be drawn at within the container if level of detail is enabled, or `None` otherwise.
+
+        containerSize: A tuple containing the container's size as (width, height).
+        shouldFit: A boolean indicating if the image should fit within or cover the container.
+        """
+        if not self.lod:
+            return None
+
+        return ImguiImage.calculateContentBestSize(self._size, containerSize, shouldFit)[0]
+
+    def _drawBackground(self) -> tuple:
+        """
+        Returns the background color to fill behind the image when drawing, or `None` if there is none or the texture is opaque.
+        """
+        if self._opaque:
+            return None
+
+        return self._background
+
+    def _lodLevel(self, drawSize: tuple) -> int:
+        """
+        Returns the smallest level of detail whose texture is still at least as large as the provided draw size on screen.
+
+        drawSize: A tuple containing the drawn size in ImGui units as (width, height). Provide `None` to use the full size texture.
+        """
+        # Check if a level can be chosen
+        if (drawSize == None) or (self._thumbLimit == None) or (drawSize[0] <= 0):
+            return 0
+
+        # Find the thumbnail's width
+        box = ImguiImage.thumbnailBox(self._size, self._thumbLimit)
+        thumbW = self._size[0] * min(1, box[0] / self._size[0], box[1] / self._size[1])
+
+        # Find how many times it can be halved while still covering the drawn pixels
+        ratio = int(thumbW / (drawSize[0] * imgui.get_io().display_fb_scale[0]))
+        if ratio < 2:
+            return 0
+
+        return min(ratio.bit_length() - 1, ImguiImage.LOD_MAX_LEVEL)
+
+    def _queueDecode(self):
+        """
+        Queues the image to be decoded and thumbnailed on `_loader`.
+        """
+        # Resolve what to decode
+        # NOTE: The background is filled in when drawing, so it is never composited into the texture.
+        path = self.path
+        thumbLimit = self._thumbLimit
+        thumbCache = self._getThumbCache()
+        remote = self._getRemote() if RemoteSource.isRemote(path) else None
+        loader = self._loader
+
+        def decode(job):
+            # Decode the thumbnail
+            if remote != None:
+                result = ImguiImage.decodeRemoteThumbnail(path, thumbLimit, None, remote, job)
+            else:
+                result = ImguiImage.decodeThumbnail(path, thumbLimit, None, thumbCache, job)
+            if result == None:
+                return None
+
+            # Mark as waiting for upload
+            if job is self._job:
+                self.state = STATE_READY
+
+            return result
+
+        self.state = STATE_QUEUED
+        if loader.processes and (remote != None):
+            # Fetch and decode in a worker process
+            self._job = loader.submit(ImageJob(self, ImguiImage.decodeRemoteThumbnail, (path, thumbLimit, None, remote)))
+        elif loader.processes:
+            # Decode in a worker process
+            self._job = loader.submit(ImageJob(self, ImguiImage.decodeThumbnail, (path, thumbLimit, None, thumbCache)))
+        else:
+            self._job = loader.submit(ImageJob(self, decode))
+
+    def _queueIdentify(self):
+        """
+        Queues the image's content to be identified on `_loader` before it is decoded.
+        """
+        path = self.path
+        index = self._getContentIndex()
+
+        def identify(job):
+            return ImguiImage.identifyContent(path, index)
+
+        self.state = STATE_QUEUED
+        if self._loader.processes:
+            # Hash in a worker process
+            self._contentJob = self._loader.submit(ImageJob(self, ImguiImage.identifyContent, (path, index)))
+        else:
+            self._contentJob = self._loader.submit(ImageJob(self, identify))
+
+    def _setDigest(self, digest: str):
+        """
+        Sets the content digest this image is keyed by, updating the reference counts in the `ContentIndex`.
+
+        digest: A string digest from `ContentIndex.digest(...)`, or `None` to key by path.
+        """
+        if digest == self._digest:
+            return
+
+        index = self._getContentIndex()
+        if self._digest != None:
+            index.release(self._digest)
+        if digest != None:
+            index.retain(digest)
+
+        self._digest = digest
+
+    def _countShared(self):
+        """
+        Counts this image's load as reusing the texture of identical content.
+        """
+        tex = self._getCache().get(self.textureKey())
+        if tex != None:
+            self._getContentIndex().countShared(TextureCache.textureBytes(tex))
+
+    def _leaveContentLoad(self) -> bool:
+        """
+        Stops sharing a decode of identical content.
+        If this image was the one decoding it, the decode is handed to the next waiting image.
+
+        Returns `True` if this image was sharing a decode.
+        """
+        if self._digest == None:
+            return False
+
+        # Find the shared decode
+        key = self.textureKey()
+        loads = ImguiImage._contentLoads.get(key)
+        if (loads == None) or not (self in loads):
+            return False
+
+        # Leave it
+        decoding = loads[0] is self
+        loads.remove(self)
+        if len(loads) == 0:
+            del ImguiImage._contentLoads[key]
+        elif decoding:
+            loads[0]._queueDecode()
+
+        return True
+
+    def _finishContentLoad(self, error: Exception = None):
+        """
+        Finishes every image waiting on this image's decode of identical content.
+        Must be called from the render thread after the texture was uploaded or the decode failed.
+
+        error: The exception the decode failed with. Provide `None` if the texture was uploaded.
+        """
+        if self._digest == None:
+            return
+
+        # Find the shared decode
+        key = self.textureKey()
+        loads = ImguiImage._contentLoads.get(key)
+        if (loads == None) or not (loads[0] is self):
+            return
+        del ImguiImage._contentLoads[key]
+
+        # Finish the waiting images
+        for img in loads[1:]:
+            if error != None:
+                print(f"{img} could not be loaded: {error}")
+                img.state = STATE_FAILED
+                img.loaded = False
+            else:
+                img._countShared()
+                img.state = STATE_UPLOADED
+                img.loaded = True
+
+    def _requestLevel(self, level: int):
+        """
+        Queues the texture for the provided level of detail to be made on a worker thread if it is not already.
+
+        level: An int level of detail greater than `0`.
+        """
+        # Check if already requested
+        if level in self._levelJobs:
+            return
+
+        # Queue the decode
+        path = self.path
+        levelLimit = ImguiImage.levelLimit(self._thumbLimit, level)
+        thumbCache = self._getThumbCache()
+        remote = self._getRemote() if RemoteSource.isRemote(path) else None
+
+        def decode(job):
+            if remote != None:
+                return ImguiImage.decodeRemoteThumbnail(path, levelLimit, None, remote, job)
+
+            return ImguiImage.decodeThumbnail(path, levelLimit, None, thumbCache, job)
+
+        self._levelJobs[level] = ImageLoader.shared().submit(ImageJob(self, decode))
+
+    def _drawableTexture(self, drawSize: tuple = None):
+        """
+        Returns the display texture for drawing, or `None` if it must be loaded first.
+        Images loaded asynchronously reload asynchronously if their texture was evicted, others reload immediately.
+
+        drawSize: A tuple containing the size the texture will be drawn at as (width, height), used to choose a level of detail. Provide `None` to use the full size texture.
+        """
+        # Use a smaller level of detail if it is ready
+        level = self._lodLevel(drawSize)
+        if level > 0:
+            tex = self._getCache().get(self.textureKey(level))
+            if tex != None:
+                return tex
+
+            self._requestLevel(level)
+
+        # Check the cache
+        tex = self._getCache().get(self.textureKey())
+        if tex != None:
+            return tex
+
+        # Reload in the background if that is how it was loaded
+        if self._loadedAsync and (self._tempFile == None):
+            self.loaded = False
+            self.state = STATE_IDLE
+            self.loadAsync(self._background)
+            return None
+
+        return self._rebuildTexture()
+
+    def _rebuildTexture(self):
+        """
+        Rebuilds and returns the display texture after it was evicted or never made.
+        """
+        # Decode again if the pixels were not kept
+        if self._tempFile == None:
+            if RemoteSource.isRemote(self.path):
+                imgThumb, self._size, self._mtime = ImguiImage.decodeRemoteThumbnail(self.path, self._thumbLimit, None, self._getRemote())
+            else:
+                imgThumb, self._size = ImguiImage.decodeThumbnail(self.path, self._thumbLimit, None, self._getThumbCache())
+            return self._uploadTexture(imgThumb)
+
+        return self._preloadTexture()
+
     def _preloadTexture(self):
         """
         Preloads the display texture for this image.
+
+        Returns the texture.
         """
-        # Create thumbnail
-        imgThumb = self._tempFile.copy()
+        return self._uploadTexture(ImguiImage.makeThumbnail(self._tempFile, self._thumbLimit))
 
-        if self._thumbLimit != None:
-            if imgThumb.size[0] > imgThumb.size[1]:
-                # Width > height
-                imgThumb.thumbnail((self._thumbLimit[0], self._thumbLimit[1]))
-            else:
-                # Height > width
-                imgThumb.thumbnail((self._thumbLimit[1], self._thumbLimit[0]))
+    def _uploadTexture(self, imgThumb, level: int = 0):
+        """
+        Uploads the provided thumbnail as the display texture for this image, stores it in the `TextureCache`, and closes the thumbnail.
+        Must be called from the render thread.
+
+        imgThumb: A PIL image in one of the `UPLOAD_MODES`.
+        level: An int level of detail the thumbnail was made for.
+
+        Returns the texture.
+        """
+        # Convert thumbnails cached in other modes
+        imgThumb = ImguiImage.convertForUpload(imgThumb)
 
-        # Get the image bytes
-        imgBytes = BytesIO()
-        imgThumb.save(imgBytes, "png")
-        imgBytes.seek(0)
+        # Record if a background could show through
+        self._opaque = (imgThumb.mode != "RGBA")
 
-        # Open pyglet image
-        # NOTE: This extension might need to be specific
-        imgPig = pygletImage.load("hint.png", file=imgBytes)
+        # Pack small thumbnails into the atlas
+        atlas = self._getAtlas()
+        size = None
+        savedBytes = 0
+        if (atlas != None) and atlas.fits(imgThumb.size):
+            tex = atlas.add(imgThumb)
+        else:
+            # Wrap the raw pixels
+            # NOTE: A positive pitch places the first (top) row at texture coordinate 0, which ImGui draws at the top.
+            imgPig = pygletImage.ImageData(
+                imgThumb.size[0],
+                imgThumb.size[1],
+                imgThumb.mode,
+                imgThumb.tobytes(),
+                pitch=(imgThumb.size[0] * len(imgThumb.mode))
+            )
+
+            # Get a texture from the pool
+            # NOTE: Pooled textures are rounded up to a size class, so the saving is measured against the texture rather than the thumbnail.
+            tex = self._getPool().acquire(imgPig, self._useNpot(), self.mipmaps)
+            savedBytes = ((ImguiImage.nearestPowerOfTwo(tex.width) * ImguiImage.nearestPowerOfTwo(tex.height)) - (tex.width * tex.height)) * BYTES_PER_PIXEL
 
-        # Get the texture
-        self._texture = imgPig.get_texture()
+            # Generate mipmaps
+            if self.mipmaps:
+                ImguiImage.generateMipmaps(tex)
+                size = (TextureCache.textureBytes(tex) * 4) // 3
+                savedBytes = (savedBytes * 4) // 3
+
+        self._getCache().put(self.textureKey(level), tex, size, savedBytes)
 
         # Close the thumbnail
         imgThumb.close()
 
+        return tex
+
+    def _onDecodeStarted(self, job: ImageJob):
+        """
+        Called on a worker thread when an asynchronous decode starts.
+
+        job: The `ImageJob` being decoded.
+        """
+        if job is self._job:
+            self.state = STATE_DECODING
+
+    def _onDecodeFinished(self, job: ImageJob):
+        """
+        Called on the render thread when an asynchronous decode has finished.
+        Uploads the decoded thumbnail as the display texture.
+
+        job: The decoded `ImageJob`.
+        """
+        # Check for identified content
+        if job is self._contentJob:
+            self._contentJob = None
+            self._onContentIdentified(job)
+            return
+
+        # Check for a level of detail
+        for level, levelJob in self._levelJobs.items():
+            if levelJob is job:
+                self._onLevelFinished(level, job)
+                return
+
+        # Check the job is still wanted
+        if not (job is self._job):
+            if job.result != None:
+                job.result[0].close()
+            return
+        self._job = None
+
+        # Check if the decode failed
+        if (job.error != None) or (job.result == None):
+            print(f"{self} could not be loaded: {job.error}")
+            self.state = STATE_FAILED
+            self.loaded = False
+            self._finishContentLoad(job.error)
+            return
+
+        # Upload the texture
+        # NOTE: Remote images also return the version they were fetched at, which their texture is keyed by.
+        imgThumb, self._size = job.result[:2]
+        if len(job.result) > 2:
+            self._mtime = job.result[2]
+        self._uploadTexture(imgThumb)
+
+        # Verbose
+        if self.verbose:
+            print(f"Loaded \"{self.path[:64]}\" asynchronously.")
+
+        # Mark as loaded
+        self.state = STATE_UPLOADED
+        self.loaded = True
+        self._finishContentLoad()
+
+    def _onContentIdentified(self, job: ImageJob):
+        """
+        Uses the texture of identical content if there is one, otherwise decodes the image once for every image with identical content.
+
+        job: The finished `ImageJob` from `_queueIdentify()`.
+        """
+        # Key by path if the content could not be identified
+        if (job.error != None) or (job.result == None):
+            self._setDigest(None)
+            self._queueDecode()
+            return
+
+        digest, self._size = job.result
+        self._setDigest(digest)
+        key = self.textureKey()
+
+        # Reuse the texture of identical content
+        if key in self._getCache():
+            self._countShared()
+            self.state = STATE_UPLOADED
+            self.loaded = True
+            return
+
+        # Wait for identical content that is already being decoded
+        loads = ImguiImage._contentLoads.get(key)
+        if loads != None:
+            loads.append(self)
+            return
+
+        # Decode it for every image with identical content
+        ImguiImage._contentLoads[key] = [self]
+        self._queueDecode()
+
+    def _onLevelFinished(self, level: int, job: ImageJob):
+        """
+        Uploads a decoded level of detail.
+
+        level: The int level of detail of the job.
+        job: The decoded `ImageJob`.
+        """
+        # Check if the decode failed
+        if (job.error != None) or (job.result == None):
+            # Keep the entry so the level is not requested again
+            self._levelJobs[level] = None
+            return
+
+        # Upload the level
+        # NOTE: The entry is kept until the upload succeeds so a level that fails to upload is not requested again.
+        self._levelJobs[level] = None
+        self._uploadTexture(job.result[0], level)
+        del self._levelJobs[level]
+
+    def _onUploadFailed(self, job: ImageJob):
+        """
+        Called on the render thread when finishing a decoded job raised an exception.
+        Marks the image as failed the same way a failed decode does.
+
+        job: The `ImageJob` with the exception as its `error`.
+        """
+        print(f"{self} could not be uploaded: {job.error}")
+
+        # Keep showing the loaded texture if only a level of detail failed
+        if self.state == STATE_UPLOADED:
+            return
+
+        # Mark as failed
+        self.state = STATE_FAILED
+        self.loaded = False
+        self._finishContentLoad(job.error)
+
     # Static Functions
+    def openImage(path: str, background: tuple = None):
+        """
+        Opens and fully decodes the image at the provided path.
+        Safe to call from any thread.
+
+        path: A string filepath pointing to the image file.
+        background: A tuple containing a background color to add behind the image as (r, g, b)[255]. Supply `None` to indicate no background should be added.
+
+        Returns a PIL image.
+        """
+        return ImguiImage.openReduced(path, None, background)[0]
+
+    def openReduced(path: str, thumbLimit: tuple, background: tuple = None):
+        """
+        Opens and decodes the image at the provided path at the smallest scale that still covers the thumbnail limit.
+        JPEG images are scaled by the decoder so most of their pixels are never decoded. Other formats are fully decoded.
+        Safe to call from any thread.
+
+        path: A string filepath pointing to the image file, or a seekable binary file object holding it.
+        thumbLimit: A tuple representing the maximum long and short sides of the thumbnail as (long side length, short side length). Provide `None` to fully decode.
+        background: A tuple containing a background color to add behind the image as (r, g, b)[255]. Supply `None` to indicate no background should be added.
+
+        Returns a tuple of (PIL image, source size).
+        """
+        # Open the target image
+        targetImg = Image.open(path)
+        sourceSize = targetImg.size
+
+        # Ask the decoder for a reduced scale if it supports one
+        if thumbLimit != None:
+            targetImg.draft(None, ImguiImage.thumbnailBox(sourceSize, thumbLimit))
+
+        # Check if background color provided
+        if background != None:
+            # Create working image
+            workingImg = Image.new("RGBA", targetImg.size, background)
+
+            # Paste the target image into the background, masked by its transparency if it has any
+            if (targetImg.mode in ("RGBA", "LA", "PA")) or ("transparency" in targetImg.info):
+                maskImg = targetImg.convert("RGBA")
+                workingImg.paste(maskImg, (0, 0), maskImg)
+                maskImg.close()
+            else:
+                workingImg.paste(targetImg, (0, 0))
+            targetImg.close()
+        else:
+            # Decode the image
+            workingImg = targetImg
+            workingImg.load()
+
+        return (workingImg, sourceSize)
+
+    def decodeThumbnail(path: str, thumbLimit: tuple, background: tuple = None, thumbCache: ThumbnailCache = None, job: ImageJob = None):
+        """
+        Returns a display ready thumbnail for the image at the provided path without keeping the full image.
+        Checks the thumbnail cache first and stores the thumbnail in it after decoding.
+        Safe to call from any thread.
+
+        path: A string filepath pointing to the image file, or a seekable binary file object holding it.
+        thumbLimit: A tuple representing the maximum long and short sides of the thumbnail as (long side length, short side length). Provide `None` to use the image's real size.
+        background: A tuple containing a background color to add behind the image as (r, g, b)[255]. Supply `None` to indicate no background should be added.
+        thumbCache: The `ThumbnailCache` to use. Provide `None` to skip the cache. Must be `None` for file objects.
+        job: The `ImageJob` this decode is for. Provide `None` if not decoding asynchronously.
+
+        Returns a tuple of (PIL image thumbnail, source size), or `None` if `job` was cancelled.
+        """
+        # Check for a cached thumbnail
+        if thumbCache != None:
+            cached = thumbCache.get(path, thumbLimit, background)
+            if cached != None:
+                return cached
+
+        # Decode the image
+        img, sourceSize = ImguiImage.openReduced(path, thumbLimit, background)
+        if (job != None) and job.cancelled:
+            img.close()
+            return None
+
+        # Make the thumbnail
+        imgThumb = ImguiImage.makeThumbnail(img, thumbLimit)
+        img.close()
+
+        # Store it for next time
+        if thumbCache != None:
+            thumbCache.put(path, thumbLimit, background, imgThumb, sourceSize)
+
+        return (imgThumb, sourceSize)
+
+    def decodeRemoteThumbnail(url: str, thumbLimit: tuple, background: tuple = None, remote: RemoteSource = None, job: ImageJob = None):
+        """
+        Fetches the image at the provided URL and returns a display ready thumbnail of it.
+        The body is decoded straight from memory, so JPEG images are still scaled by the decoder.
+        Safe to call from any thread.
+
+        url: A string `http://` or `https://` URL pointing to the image.
+        thumbLimit: A tuple representing the maximum long and short sides of the thumbnail as (long side length, short side length). Provide `None` to use the image's real size.
+        background: A tuple containing a background color to add behind the image as (r, g, b)[255]. Supply `None` to indicate no background should be added.
+        remote: The `RemoteSource` to fetch with. Provide `None` to use the shared source.
+        job: The `ImageJob` this decode is for. Provide `None` if not decoding asynchronously.
+
+        Returns a tuple of (PIL image thumbnail, source size, string version of the fetched image), or `None` if `job` was cancelled.
+        """
+        # Fetch the image
+        if remote == None:
+            remote = RemoteSource.shared()
+
+        stream, version = remote.fetch(url)
+        if (job != None) and job.cancelled:
+            return None
+
+        # Decode it
+        result = ImguiImage.decodeThumbnail(stream, thumbLimit, background, None, job)
+        if result == None:
+            return None
+
+        return (result[0], result[1], version)
+
+    def identifyContent(path: str, index: ContentIndex):
+        """
+        Returns the digest of the image file's content and the image's size without decoding it.
+        Safe to call from any thread.
+
+        path: A string filepath pointing to the image file.
+        index: The `ContentIndex` to hash with.
+
+        Returns a tuple of (string digest, source size).
+        """
+        digest = index.digest(path)
+        with Image.open(path) as img:
+            return (digest, img.size)
+
+    def makeThumbnail(img, thumbLimit: tuple):
+        """
+        Creates a thumbnail of the provided image that is ready for upload.
+        The original image will not be modified.
+        Safe to call from any thread.
+
+        img: A PIL image.
+        thumbLimit: A tuple representing the maximum long and short sides of the thumbnail as (long side length, short side length). Provide `None` to use the image's real size.
+
+        Returns a new PIL image in one of the `UPLOAD_MODES`.
+        """
+        # Create thumbnail
+        imgThumb = img.copy()
+
+        if thumbLimit != None:
+            imgThumb.thumbnail(ImguiImage.thumbnailBox(imgThumb.size, thumbLimit))
+
+        # Convert to a format GL can take directly
+        return ImguiImage.convertForUpload(imgThumb)
+
+    def convertForUpload(img):
+        """
+        Returns the image in one of the `UPLOAD_MODES`, converting it and closing the original if it is in another mode.
+        Images with transparency become `RGBA` and others `RGB`.
+        Safe to call from any thread.
+
+        img: A PIL image.
+        """
+        # Check if already uploadable
+        if img.mode in ImguiImage.UPLOAD_MODES:
+            return img
+
+        # Convert, keeping any transparency
+        # NOTE: Pyglet's core profile contexts have no single or two channel formats it can upload, so grayscale images are expanded too.
+        imgConverted = img.convert("RGBA" if (("A" in img.getbands()) or ("transparency" in img.info)) else "RGB")
+        img.close()
+        return imgConverted
+
+    def thumbnailBox(size: tuple, thumbLimit: tuple) -> tuple:
+        """
+        Returns the box a thumbnail of an image with the provided size must fit within as (width, height).
+
+        size: A tuple containing the image size as (width, height).
+        thumbLimit: A tuple representing the maximum long and short sides of the thumbnail as (long side length, short side length).
+        """
+        if size[0] > size[1]:
+            # Width > height
+            return (thumbLimit[0], thumbLimit[1])
+        else:
+            # Height > width
+            return (thumbLimit[1], thumbLimit[0])
+
+    def levelLimit(thumbLimit: tuple, level: int) -> tuple:
+        """
+        Returns the thumbnail limit for the provided level of detail, halving each side once per level.
+
+        thumbLimit: A tuple representing the maximum long and short sides of the thumbnail as (long side length, short side length), or `None`.
+        level: An int level of detail.
+        """
+        if (thumbLimit == None) or (level == 0):
+            return thumbLimit
+
+        return (max(1, thumbLimit[0] >> level), max(1, thumbLimit[1] >> level))
+
+    def supportsNpot() -> bool:
+        """
+        Returns `True` if the current GL context supports textures with sizes that are not powers of two.
+        Must be called from the render thread. The result is remembered after the first call.
+        """
+        if ImguiImage._npotSupported == None:
+            ImguiImage._npotSupported = gl.gl_info.have_version(2, 0) or gl.gl_info.have_extension("GL_ARB_texture_non_power_of_two")
+
+        return ImguiImage._npotSupported
+
+    def generateMipmaps(tex):
+        """
+        Generates mipmaps for the provided texture and enables trilinear filtering when it is minified.
+        Must be called from the render thread.
+
+        tex: A Pyglet texture.
+        """
+        gl.glBindTexture(tex.target, tex.id)
+        gl.glGenerateMipmap(tex.target)
+        gl.glTexParameteri(tex.target, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR_MIPMAP_LINEAR)
+
+    def drawPlaceholder(containerSize: tuple, label: str = None):
+        """
+        Draws a filled placeholder box the size of the container with an optional centered label.
+
+        containerSize: A tuple containing the container's size as (width, height).
+        label: A string to show in the center of the placeholder. Provide `None` for no label.
+        """
+        # Draw the box
+        drawList = imgui.get_window_draw_list()
+        x, y = imgui.get_cursor_screen_pos()
+        drawList.add_rect_filled(x, y, x + containerSize[0], y + containerSize[1], imgui.get_color_u32_rgba(*ImguiImage.PLACEHOLDER_COLOR))
+
+        # Draw the label
+        if label != None:
+            textW, textH = imgui.calc_text_size(label)
+            drawList.add_text(x + ((containerSize[0] - textW) * 0.5), y + ((containerSize[1] - textH) * 0.5), imgui.get_color_u32_rgba(1, 1, 1, 1), label)
+
+        # Reserve the space
+        imgui.dummy(containerSize[0], containerSize[1])
+
     def nearestPowerOfTwo(x):
         """
         Calculates the nearest power of two (+ or -) for `x`.
@@ -245,6 +1200,7 @@ class ImguiImage():
     def calculateContentBestSize(contentSize: tuple, containerSize: tuple, shouldFit: bool):
         """
         Calculates the ideal size and center anchor point for the provided content size within the specified width and height.
+        To lay out many contents at once, use `ContentLayout.calculateContentBestSizes(...)`.
 
         contentSize: A tuple containing the source content's size as (width, height).
         containerSize: A tuple containing the container's size as (width, height).
@@ -281,7 +1237,47 @@ class ImguiImage():
             (pasteOffsetX, pasteOffsetY)
         )
 
-    def drawTexture(tex, size: tuple, containerSize: tuple, shouldFit: bool, center: bool, offset: tuple, border: tuple, asButton: bool = False):
+    def textureUv(tex, uvRect: tuple = None, flipY: bool = False, subRect: tuple = None) -> tuple:
+        """
+        Returns the texture coordinates that cover the image held by the provided texture as ((u0, v0), (u1, v1)).
+
+        tex: A GL compatible texture.
+        uvRect: A tuple of the texture coordinates to use as ((u0, v0), (u1, v1)). Provide `None` to use the texture's own `uvRect` if it has one, like an `AtlasRegion`, then its Pyglet `tex_coords`, and otherwise the image area of a texture padded to a power of two.
+        flipY: If `True`, the vertical texture coordinates are swapped.
+        subRect: A tuple of the part of the image to cover as fractions of its size as ((x0, y0), (x1, y1)). Provide `None` to cover the whole image.
+        """
+        if uvRect == None:
+            uvRect = getattr(tex, "uvRect", None)
+
+        if uvRect != None:
+            uv0, uv1 = uvRect
+        elif hasattr(tex, "tex_coords"):
+            # Use the area the texture covers
+            uv0 = (tex.tex_coords[0], tex.tex_coords[1])
+            uv1 = (tex.tex_coords[6], tex.tex_coords[7])
+        else:
+            # Assume the texture is padded to a power of two
+            uv0 = (0, 0)
+            uv1 = (
+                tex.width / ImguiImage.nearestPowerOfTwo(tex.width),
+                tex.height / ImguiImage.nearestPowerOfTwo(tex.height)
+            )
+
+        # Narrow to part of the image
+        if subRect != None:
+            uvW = uv1[0] - uv0[0]
+            uvH = uv1[1] - uv0[1]
+            uv0, uv1 = (
+                (uv0[0] + (subRect[0][0] * uvW), uv0[1] + (subRect[0][1] * uvH)),
+                (uv0[0] + (subRect[1][0] * uvW), uv0[1] + (subRect[1][1] * uvH))
+            )
+
+        if flipY:
+            uv0, uv1 = ((uv0[0], uv1[1]), (uv1[0], uv0[1]))
+
+        return (uv0, uv1)
+
+    def drawTexture(tex, size: tuple, containerSize: tuple, shouldFit: bool, center: bool, offset: tuple, border: tuple, asButton: bool = False, flipY: bool = False, uvRect: tuple = None, background: tuple = None):
         """
         Draws the provided texture into an ImGui window as an ImGui Image.
 
@@ -291,17 +1287,17 @@ class ImguiImage():
         shouldFit: A boolean indicating if the source image should fit within the content area or cover the content area. Fit is indicated by `True` and ensures the whole source image will be seen but some background color may be visible. Cover is indicated by `False` and ensures that the entirety of the content area will be covered but the source image will likely be cropped.
         center: A boolean indicating if the rendered image should be centered in the provided `containerSize`.
         offset: A tuple containing points of offset for the image as (x, y).
-        border: An RGBA tuple containing a border color as (r, g, b, a).
+        border: An RGBA tuple containing a border color as (r, g, b, a). Buttons have no border, so PyImGui fills this color behind the button's image instead. If `background` is also provided, the background takes precedence and this is ignored for buttons.
         asButton: If the texture should be drawn as a button. If the texture should be drawn as a button, will return `True` if the image is clicked. In all other cases, returns `False`.
+        flipY: If `True`, the texture's rows are drawn in reverse by swapping its vertical texture coordinates. Use for textures stored bottom row first, like those from `pyglet.image.load(...)`. Textures made by `ImguiImage` are stored top row first and do not need this.
+        uvRect: A tuple of the texture coordinates to draw as ((u0, v0), (u1, v1)). Provide `None` to use the texture's own `uvRect` if it has one, like an `AtlasRegion`, then its Pyglet `tex_coords`, and otherwise the image area of a texture padded to a power of two.
+        background: A tuple containing a color to fill behind the texture as (r, g, b)[255], shown through its transparent pixels. Supply `None` to indicate no background should be added.
         """
         # Calculate the image size
         modImgSize, imgAnchor = ImguiImage.calculateContentBestSize(size, containerSize, shouldFit)
 
-        # Calculate texture offset
-        texOffset = (
-            tex.width / ImguiImage.nearestPowerOfTwo(tex.width),
-            tex.height / ImguiImage.nearestPowerOfTwo(tex.height)
-        )
+        # Calculate texture coordinates
+        uv0, uv1 = ImguiImage.textureUv(tex, uvRect, flipY)
 
         # Calculate position
         cursorX = 0
@@ -318,25 +1314,37 @@ class ImguiImage():
         if not ((cursorX == 0) and (cursorY == 0)):
             imgui.set_cursor_pos((cursorX, cursorY))
 
+        # Resolve the background color
+        # NOTE: ImGui blends textures over what is behind them by their alpha, matching a composite made when decoding.
+        backgroundColor = None
+        if background != None:
+            backgroundColor = (background[0] / 255, background[1] / 255, background[2] / 255, 1.0)
+
         # Check if button or image
         if not asButton:
+            # Fill the background behind the image
+            if backgroundColor != None:
+                x, y = imgui.get_cursor_screen_pos()
+                imgui.get_window_draw_list().add_rect_filled(x, y, x + modImgSize[0], y + modImgSize[1], imgui.get_color_u32_rgba(*backgroundColor))
+
             # Display image
             imgui.image(
                 texture_id=tex.id,
                 width=modImgSize[0],
                 height=modImgSize[1],
-                uv0=(0, 0),
-                uv1=texOffset,
+                uv0=uv0,
+                uv1=uv1,
                 border_color=border
             )
             return False
         else:
             # Display button
+            # NOTE: PyImGui passes `border_color` to ImGui as the button's `bg_col`, which ImGui fills exactly behind the image inside the frame padding, so it carries the background.
             return imgui.image_button(
                 texture_id=tex.id,
                 width=modImgSize[0],
                 height=modImgSize[1],
-                uv0=(0, 0),
-                uv1=texOffset,
-                border_color=border
+                uv0=uv0,
+                uv1=uv1,
+                border_color=(backgroundColor if (backgroundColor != None) else border)
             )
@@ -0,0 +1,305 @@
+## Prefetch Controller
+# Loads the images around a cursor in an ordered list ahead of time so stepping to the next or previous image shows it without waiting.
+
+## Imports
+import time
+
+from .imageLoader import ImageLoader, STATE_IDLE, STATE_QUEUED, STATE_DECODING, STATE_READY, STATE_UPLOADED
+
+## Constants
+DEFAULT_AHEAD = 3
+DEFAULT_BEHIND = 1
+DEFAULT_MAX_AHEAD = 12
+DEFAULT_KEEP = 2
+DEFAULT_LEAD_TIME = 0.5
+DEFAULT_PAUSE_TIME = 1.0
+
+## Classes
+class PrefetchController():
+    """
+    Keeps the images around a cursor in an ordered list loaded, like a viewer stepping through images with the arrow keys.
+    Images `ahead` of the cursor in the direction of travel and `behind` it are loaded asynchronously, nearest first, so stepping to them shows them without waiting on `ImguiImage.load()`.
+    Stepping quickly loads further ahead, up to `maxAhead`. Images more than `keep` past the window are closed, cancelling their loads if they have not finished, so jumping does not wait on loads that are no longer near the cursor.
+    Must be used from the render thread. Call `update()` once per frame.
+    """
+    # Constructor
+    def __init__(self, images: list, cursor: int = 0, ahead: int = DEFAULT_AHEAD, behind: int = DEFAULT_BEHIND, maxAhead: int = DEFAULT_MAX_AHEAD, keep: int = DEFAULT_KEEP, leadTime: float = DEFAULT_LEAD_TIME, background: tuple = None, loader: ImageLoader = None, pin: bool = True, releaseTextures: bool = False):
+        """
+        images: A list of `ImguiImage` objects in the order they are stepped through.
+        cursor: An int index of the image shown first.
+        ahead: An int number of images to load past the cursor in the direction of travel.
+        behind: An int number of images to load before the cursor, against the direction of travel.
+        maxAhead: An int number of images to load ahead at most while stepping quickly.
+        keep: An int number of images past either end of the window to keep loaded, so stepping back and forth at its edge does not close and load them again.
+        leadTime: A float number of seconds of stepping at the current pace to load ahead, on top of `ahead`. Should be about how long an image takes to load.
+        background: A tuple containing a background color to fill behind each image as (r, g, b)[255]. Supply `None` to indicate no background should be added.
+        loader: The `ImageLoader` to decode with. Provide `None` to use the shared loader.
+        pin: If `True`, the textures of images in the window are pinned in the `TextureCache` so they are not evicted before they are shown.
+        releaseTextures: If `True`, images closed outside the window also release their textures. If `False`, their textures stay in the `TextureCache` until evicted so stepping back to them is fast.
+        """
+        # Provided
+        self.images = images
+        self.ahead = ahead
+        self.behind = behind
+        self.maxAhead = maxAhead
+        self.keep = keep
+        self.leadTime = leadTime
+        self.background = background
+        self._loader = loader
+        self.pin = pin
+        self.releaseTextures = releaseTextures
+
+        # Assigned
+        self.cursor = min(max(0, cursor), max(0, len(images) - 1))
+        self.direction = 1
+        self.lead = ahead
+        self.steps = 0
+        self.hits = 0
+        self.misses = 0
+        self.jumps = 0
+        self.prefetched = 0
+        self.cancelled = 0
+        self.evicted = 0
+        self.waitTime = 0.0
+        self._window = (self.cursor, self.cursor)
+        self._loaded = set()
+        self._pinned = {}
+        self._interval = None
+        self._lastStep = None
+        self._reversing = 0
+        self._waitStart = None
+
+        # Load around the first image
+        if len(images) > 0:
+            self._plan()
+
+    ## Internal
+    def __len__(self) -> int:
+        return len(self.images)
+
+    # Functions
+    def current(self):
+        """
+        Returns the `ImguiImage` at the cursor, or `None` if there are no images.
+        """
+        if len(self.images) == 0:
+            return None
+
+        return self.images[self.cursor]
+
+    def setCursor(self, index: int):
+        """
+        Moves the cursor to the image, loading around it and closing images left far behind.
+        Moving by one image at a time follows the direction and pace of stepping. Moving outside the loaded window counts as a jump, which forgets the pace and cancels the loads left far behind.
+
+        index: An int index of the image to show. Clamped to the list.
+
+        Returns the `ImguiImage` at the cursor, or `None` if there are no images.
+        """
+        # Check the move
+        if len(self.images) == 0:
+            return None
+        index = min(max(0, index), len(self.images) - 1)
+        delta = index - self.cursor
+        if delta == 0:
+            return self.current()
+
+        # Follow the direction and pace
+        now = time.perf_counter()
+        first, last = self._window
+        jumped = not (first <= index < last)
+        self._followStep(delta, jumped, now)
+
+        # Load around the new cursor
+        self.cursor = index
+        self.steps += 1
+        self._plan()
+
+        # Count whether the image was ready
+        if self.current().state == STATE_UPLOADED:
+            self.hits += 1
+            self._waitStart = None
+        else:
+            self.misses += 1
+            self._waitStart = now
+
+        return self.current()
+
+    def step(self, delta: int = 1):
+        """
+        Moves the cursor by the number of images, like for an arrow key.
+
+        delta: An int number of images to move. Negative values move backwards.
+
+        Returns the `ImguiImage` at the cursor, or `None` if there are no images.
+        """
+        return self.setCursor(self.cursor + delta)
+
+    def next(self):
+        """
+        Moves the cursor to the next image.
+
+        Returns the `ImguiImage` at the cursor, or `None` if there are no images.
+        """
+        return self.step(1)
+
+    def previous(self):
+        """
+        Moves the cursor to the previous image.
+
+        Returns the `ImguiImage` at the cursor, or `None` if there are no images.
+        """
+        return self.step(-1)
+
+    def update(self):
+        """
+        Pins the textures of images in the window that finished loading and records how long the image at the cursor took to show.
+        Call once per frame after `ImageLoader.processAll(...)`, which `PygletImGui` does before building each frame.
+        """
+        # Check the image at the cursor
+        if (self._waitStart != None) and (self.current().state == STATE_UPLOADED):
+            self.waitTime += time.perf_counter() - self._waitStart
+            self._waitStart = None
+
+        # Pin what finished loading
+        if self.pin:
+            first, last = self._window
+            for i in range(first, last):
+                if (i not in self._pinned) and (self.images[i].state == STATE_UPLOADED):
+                    self._pinned[i] = self.images[i].textureKey()
+                    self.images[i]._getCache().pin(self._pinned[i])
+
+    def window(self) -> tuple:
+        """
+        Returns the images being loaded as a tuple of (first index, last index + 1).
+        """
+        return self._window
+
+    def stats(self) -> dict:
+        """
+        Returns a dict of the controller's counters.
+        Keys are `steps`, `hits`, the steps that landed on an image already loaded, `misses`, `hitRate`, `jumps`, `averageWait`, the float seconds misses took to show, `prefetched`, the loads started, `cancelled`, the loads cancelled before finishing, `evicted`, the images closed outside the window, `direction`, `lead`, the images currently loaded ahead, `stepRate`, the float steps per second at the current pace, and `window`.
+        """
+        return {
+            "steps": self.steps,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": (self.hits / self.steps) if (self.steps > 0) else 0.0,
+            "jumps": self.jumps,
+            "averageWait": (self.waitTime / self.misses) if (self.misses > 0) else 0.0,
+            "prefetched": self.prefetched,
+            "cancelled": self.cancelled,
+            "evicted": self.evicted,
+            "direction": self.direction,
+            "lead": self.lead,
+            "stepRate": (1 / self._interval) if (self._interval != None) else 0.0,
+            "window": self._window
+        }
+
+    def close(self):
+        """
+        Cancels every load and closes every image the controller loaded, unpinning their textures.
+        """
+        for i in list(self._loaded):
+            self._evict(i)
+
+        self._window = (self.cursor, self.cursor)
+
+    ## Private Functions
+    def _followStep(self, delta: int, jumped: bool, now: float):
+        """
+        Updates the direction of travel and the pace of stepping from a move of the cursor.
+
+        delta: An int number of images the cursor moved.
+        jumped: If `True`, the cursor moved outside the loaded window.
+        now: A float `time.perf_counter()` time of the move.
+        """
+        # Forget the pace after a jump
+        sign = 1 if (delta > 0) else -1
+        if jumped:
+            self.jumps += 1
+            self.direction = sign
+            self._interval = None
+            self._lastStep = now
+            self._reversing = 0
+            return
+
+        # Turn around after two steps back
+        # NOTE: A single step back is usually a second look, so the window only turns once stepping back continues.
+        if sign != self.direction:
+            self._reversing += 1
+            if self._reversing >= 2:
+                self.direction = sign
+                self._reversing = 0
+        else:
+            self._reversing = 0
+
+        # Average the time between steps
+        if self._lastStep != None:
+            interval = (now - self._lastStep) / abs(delta)
+            if interval >= DEFAULT_PAUSE_TIME:
+                self._interval = None
+            elif self._interval == None:
+                self._interval = interval
+            else:
+                self._interval = (self._interval + interval) / 2
+        self._lastStep = now
+
+    def _plan(self):
+        """
+        Loads the images in the window around the cursor, nearest first, and cancels or closes those outside it.
+        """
+        # Size the window for the pace
+        # NOTE: Stepping faster than images load would outrun a fixed window, so the lead covers `leadTime` of stepping.
+        self.lead = self.ahead
+        if self._interval != None:
+            self.lead = min(max(self.ahead, self.maxAhead), self.ahead + int(self.leadTime / max(self._interval, 0.001)))
+
+        # Find the window
+        count = len(self.images)
+        if self.direction > 0:
+            first, last = self.cursor - self.behind, self.cursor + self.lead + 1
+        else:
+            first, last = self.cursor - self.lead, self.cursor + self.behind + 1
+        first, last = max(0, first), min(count, last)
+        self._window = (first, last)
+
+        # Cancel loads and close images past the margin around the window
+        for i in list(self._loaded):
+            if (i < (first - self.keep)) or (i >= (last + self.keep)):
+                if self.images[i].state in (STATE_QUEUED, STATE_DECODING, STATE_READY):
+                    self.cancelled += 1
+                else:
+                    self.evicted += 1
+                self._evict(i)
+
+        # Load the cursor first, then by distance relative to each side's length
+        ahead = (last - self.cursor - 1) if (self.direction > 0) else (self.cursor - first)
+        behind = (self.cursor - first) if (self.direction > 0) else (last - self.cursor - 1)
+        def priority(i):
+            distance = (i - self.cursor) * self.direction
+            if distance >= 0:
+                return distance / max(1, ahead)
+            return -distance / max(1, behind)
+
+        for i in sorted(range(first, last), key=priority):
+            img = self.images[i]
+            if img.state == STATE_IDLE:
+                img.loadAsync(self.background, self._loader)
+                self.prefetched += 1
+            self._loaded.add(i)
+
+    def _evict(self, index: int):
+        """
+        Unpins and closes the image, cancelling any load.
+
+        index: An int index of the image.
+        """
+        # Unpin the texture
+        key = self._pinned.pop(index, None)
+        if key != None:
+            self.images[index]._getCache().unpin(key)
+
+        # Close the image
+        self.images[index].close(self.releaseTextures)
+        self._loaded.discard(index)
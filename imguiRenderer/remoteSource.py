@@ -0,0 +1,380 @@
+## Remote Source
+# Fetches remote images over HTTP with pooled keep alive connections and an on disk cache revalidated with ETag and Last-Modified.
+
+## Imports
+import io
+import os
+import json
+import hashlib
+import threading
+import http.client
+from urllib.parse import urlsplit, urljoin
+
+## Constants
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_DIRECTORY = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "imguiRenderer", "remote")
+BODY_EXTENSION = ".body"
+META_EXTENSION = ".meta"
+CHUNK_SIZE = 64 * 1024
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+REMOTE_SCHEMES = ("http://", "https://")
+
+## Classes
+class RemoteSource():
+    """
+    Fetches remote images over HTTP and HTTPS.
+    Connections are kept alive and reused per host, and at most `maxConnections` downloads run at once across every thread using the source.
+    Bodies are kept in memory for the decoder and also stored on disk with their `ETag` and `Last-Modified` validators, so later fetches only download an image again if it changed.
+    Safe to use from multiple threads.
+    """
+    ## Statics
+    _shared = None
+    _processInstances = {}
+
+    # Constructor
+    def __init__(self, directory: str = DEFAULT_DIRECTORY, maxConnections: int = DEFAULT_MAX_CONNECTIONS, timeout: float = DEFAULT_TIMEOUT, headers: dict = None):
+        """
+        directory: A string directory path to store fetched images in. Created if it does not exist. Provide `None` to keep nothing on disk and download every time.
+        maxConnections: An int number of downloads allowed at once.
+        timeout: A float number of seconds to wait on a connection before failing.
+        headers: A dict of extra headers to send with every request, like authorization. Provide `None` for no extra headers.
+        """
+        # Provided
+        self.directory = None if (directory == None) else os.path.abspath(os.path.expanduser(directory))
+        self.maxConnections = maxConnections
+        self.timeout = timeout
+        self.headers = dict(headers) if (headers != None) else {}
+
+        # Assigned
+        self.requests = 0
+        self.downloads = 0
+        self.revalidated = 0
+        self.bytesDownloaded = 0
+        self.connectionsOpened = 0
+        self._slots = threading.BoundedSemaphore(maxConnections)
+        self._idle = {}
+        self._lock = threading.Lock()
+
+        # Prepare the directory
+        if self.directory != None:
+            os.makedirs(self.directory, exist_ok=True)
+
+    ## Internal
+    def __reduce__(self):
+        # Send only the settings to worker processes, which each reuse one source per directory
+        return (RemoteSource._forProcess, (self.directory, self.maxConnections, self.timeout, self.headers))
+
+    # Functions
+    def fetch(self, url: str):
+        """
+        Returns the body of the URL, downloading it only if the cached copy is missing or out of date.
+        Blocks while `maxConnections` downloads are already running.
+
+        url: A string `http://` or `https://` URL.
+
+        Returns a tuple of (seekable in memory stream of the body, string version of the body from its validators).
+        """
+        # Read the cached validators
+        meta = self._readMeta(url)
+        headers = dict(self.headers)
+        if meta != None:
+            if meta.get("etag") != None:
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("lastModified") != None:
+                headers["If-Modified-Since"] = meta["lastModified"]
+
+        # Request the URL
+        with self._slots:
+            status, responseHeaders, body = self._request(url, headers)
+
+        with self._lock:
+            self.requests += 1
+
+        # Use the cached copy if it is still current
+        if (status == 304) and (meta != None):
+            cached = self._readBody(url)
+            if cached != None:
+                with self._lock:
+                    self.revalidated += 1
+                return (io.BytesIO(cached), RemoteSource._version(meta))
+
+            # The cached copy is gone so download it again
+            with self._slots:
+                status, responseHeaders, body = self._request(url, dict(self.headers))
+
+            with self._lock:
+                self.requests += 1
+
+        if status != 200:
+            raise OSError(f"Fetching \"{url}\" failed with HTTP {status}.")
+
+        # Store the body for next time
+        meta = {
+            "url": url,
+            "etag": responseHeaders.get("etag"),
+            "lastModified": responseHeaders.get("last-modified")
+        }
+        self._writeCache(url, body, meta)
+
+        with self._lock:
+            self.downloads += 1
+            self.bytesDownloaded += len(body)
+
+        return (io.BytesIO(body), RemoteSource._version(meta))
+
+    def close(self):
+        """
+        Closes every idle connection.
+        """
+        with self._lock:
+            idle = self._idle
+            self._idle = {}
+
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    def clear(self):
+        """
+        Deletes every image stored on disk.
+        """
+        if self.directory == None:
+            return
+
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and (entry.name.endswith(BODY_EXTENSION) or entry.name.endswith(META_EXTENSION)):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def stats(self) -> dict:
+        """
+        Returns a dict of the source's counters.
+        Keys are `requests`, `downloads`, `revalidated` for requests answered from the disk cache, `bytesDownloaded`, `connectionsOpened`, and `idleConnections`.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "downloads": self.downloads,
+                "revalidated": self.revalidated,
+                "bytesDownloaded": self.bytesDownloaded,
+                "connectionsOpened": self.connectionsOpened,
+                "idleConnections": sum(len(connections) for connections in self._idle.values())
+            }
+
+    ## Private Functions
+    def _request(self, url: str, headers: dict):
+        """
+        Sends a GET request on a pooled connection, following redirects, and reads the whole body.
+        A reused connection the server already closed is retried once on a new connection.
+
+        url: A string URL.
+        headers: A dict of headers to send.
+
+        Returns a tuple of (int status, dict of lowercase response headers, body bytes).
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            # Resolve the connection
+            parts = urlsplit(url)
+            host = (parts.scheme, parts.hostname, parts.port)
+            target = parts.path or "/"
+            if parts.query:
+                target += f"?{parts.query}"
+
+            # Send the request
+            for attempt in range(2):
+                conn, reused = self._acquire(host)
+                try:
+                    conn.request("GET", target, headers=headers)
+                    response = conn.getresponse()
+
+                    # Stream the body in
+                    buffer = io.BytesIO()
+                    while True:
+                        chunk = response.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        buffer.write(chunk)
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    conn.close()
+                    if reused and (attempt == 0):
+                        continue
+                    raise
+                except http.client.HTTPException as e:
+                    conn.close()
+                    raise OSError(f"Fetching \"{url}\" failed: {e!r}") from e
+                except OSError:
+                    conn.close()
+                    raise
+                break
+
+            # Return the connection to the pool
+            responseHeaders = {key.lower(): value for key, value in response.getheaders()}
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(host, conn)
+
+            # Follow redirects
+            if (response.status in REDIRECT_STATUSES) and ("location" in responseHeaders):
+                url = urljoin(url, responseHeaders["location"])
+                continue
+
+            return (response.status, responseHeaders, buffer.getvalue())
+
+        raise OSError(f"Fetching \"{url}\" redirected more than {MAX_REDIRECTS} times.")
+
+    def _acquire(self, host: tuple):
+        """
+        Returns an idle connection to the host, or opens a new one.
+
+        host: A tuple of (scheme, hostname, port).
+
+        Returns a tuple of (connection, `True` if it was reused).
+        """
+        with self._lock:
+            connections = self._idle.get(host)
+            if connections:
+                return (connections.pop(), True)
+            self.connectionsOpened += 1
+
+        scheme, hostname, port = host
+        if scheme == "https":
+            return (http.client.HTTPSConnection(hostname, port, timeout=self.timeout), False)
+
+        return (http.client.HTTPConnection(hostname, port, timeout=self.timeout), False)
+
+    def _release(self, host: tuple, conn):
+        """
+        Returns a connection to the pool for reuse.
+        At most `maxConnections` idle connections are kept per host.
+
+        host: A tuple of (scheme, hostname, port).
+        conn: The connection to return.
+        """
+        with self._lock:
+            connections = self._idle.setdefault(host, [])
+            if len(connections) < self.maxConnections:
+                connections.append(conn)
+                return
+
+        conn.close()
+
+    def _cachePath(self, url: str, extension: str) -> str:
+        """
+        Returns the filepath the URL's body or validators are stored at.
+
+        url: A string URL.
+        extension: The string file extension.
+        """
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + extension)
+
+    def _readMeta(self, url: str) -> dict:
+        """
+        Returns the stored validators for the URL, or `None` if there are none.
+
+        url: A string URL.
+        """
+        if self.directory == None:
+            return None
+
+        try:
+            with open(self._cachePath(url, META_EXTENSION), "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Check it is for this URL and can be revalidated
+        if (meta.get("url") != url) or ((meta.get("etag") == None) and (meta.get("lastModified") == None)):
+            return None
+
+        return meta
+
+    def _readBody(self, url: str) -> bytes:
+        """
+        Returns the stored body for the URL, or `None` if there is none.
+
+        url: A string URL.
+        """
+        try:
+            with open(self._cachePath(url, BODY_EXTENSION), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _writeCache(self, url: str, body: bytes, meta: dict):
+        """
+        Stores the body and validators for the URL atomically.
+        Bodies without validators are not stored as they could never be revalidated.
+
+        url: A string URL.
+        body: The body bytes.
+        meta: A dict of the URL and its validators.
+        """
+        if (self.directory == None) or ((meta["etag"] == None) and (meta["lastModified"] == None)):
+            return
+
+        # Write the body before its validators so they never describe a missing body
+        for path, data, mode in ((self._cachePath(url, BODY_EXTENSION), body, "wb"), (self._cachePath(url, META_EXTENSION), json.dumps(meta), "w")):
+            tempPath = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tempPath, mode) as f:
+                    f.write(data)
+                os.replace(tempPath, path)
+            except OSError:
+                if os.path.exists(tempPath):
+                    os.remove(tempPath)
+                return
+
+    # Static Functions
+    def shared():
+        """
+        Returns the shared `RemoteSource`, creating it if needed.
+        """
+        if RemoteSource._shared == None:
+            RemoteSource._shared = RemoteSource()
+
+        return RemoteSource._shared
+
+    def setShared(source):
+        """
+        Sets the shared `RemoteSource` used by every `ImguiImage` that was not given its own.
+
+        source: A `RemoteSource`.
+        """
+        RemoteSource._shared = source
+
+    def isRemote(path) -> bool:
+        """
+        Returns `True` if the provided path is an `http://` or `https://` URL.
+
+        path: A string filepath or URL.
+        """
+        return isinstance(path, str) and path.lower().startswith(REMOTE_SCHEMES)
+
+    def _version(meta: dict) -> str:
+        """
+        Returns a string identifying the version of a body from its validators.
+
+        meta: A dict of the URL and its validators.
+        """
+        return meta.get("etag") or meta.get("lastModified")
+
+    def _forProcess(directory: str, maxConnections: int, timeout: float, headers: dict):
+        """
+        Returns this process' `RemoteSource` with the provided settings, creating it if needed.
+        Used to unpickle sources sent to `ImageLoader` worker processes so each process keeps its own connection pool.
+
+        directory: A string directory path, or `None`.
+        maxConnections: An int number of downloads allowed at once.
+        timeout: A float number of seconds to wait on a connection.
+        headers: A dict of extra headers.
+        """
+        key = (directory, maxConnections, timeout, tuple(sorted(headers.items())))
+        if not (key in RemoteSource._processInstances):
+            RemoteSource._processInstances[key] = RemoteSource(directory, maxConnections, timeout, headers)
+
+        return RemoteSource._processInstances[key]
@@ -3,6 +3,7 @@
 
 ## Imports
 import os
+import time
 import pyglet
 from pyglet import gl, image
 import imgui
@@ -11,6 +12,11 @@ from imgui.integrations.pyglet import create_renderer
 from .testwindow import show_test_window
 from .components.all import AllComponents
 from .imguiImage import ImguiImage
+from .animatedImage import AnimatedImage
+from .streamImage import StreamImage
+from .imageLoader import ImageLoader, DEFAULT_UPLOAD_BUDGET
+from .textureCache import TextureCache
+from .frameTiming import FrameTimer, NULL_SPAN, DEFAULT_CAPACITY as DEFAULT_TIMING_CAPACITY
 
 ## Constants
 DEFAULT_WIN_WIDTH = 1280
@@ -19,6 +25,25 @@ DEFAULT_WIN_SIZE = (DEFAULT_WIN_WIDTH, DEFAULT_WIN_HEIGHT)
 DEFAULT_FULLSCREEN = False
 DEFAULT_MAXIMIZE = False
 
+REDRAW_CONTINUOUS = "continuous"
+REDRAW_ON_DEMAND = "onDemand"
+REDRAW_HYBRID = "hybrid"
+DEFAULT_REDRAW_POLICY = REDRAW_CONTINUOUS
+DEFAULT_FRAME_INTERVAL = 1/120.
+DEFAULT_KEEP_ALIVE = 0.5
+DEFAULT_IDLE_INTERVAL = 1/4.
+
+PHASE_UPLOAD = "upload"
+PHASE_BACKGROUND = "background"
+PHASE_IMGUI = "imgui"
+PHASE_CLEAR = "clear"
+PHASE_RENDER = "render"
+PHASE_RENDERER = "renderer"
+PHASE_FLIP = "flip"
+PHASE_FINISH = "finish"
+
+RUN_WARMUP_FRAMES = 3
+
 ## Classes
 class PygletImGui():
     # Support Docs: https://pyglet.readthedocs.io/en/latest/programming_guide/windowing.html
@@ -38,8 +63,24 @@ class PygletImGui():
         self.window = None
         self._renderer = None
 
+        # Redraw policy
+        self.redrawPolicy = DEFAULT_REDRAW_POLICY
+        self.frameInterval = DEFAULT_FRAME_INTERVAL
+        self.keepAlive = DEFAULT_KEEP_ALIVE
+        self.idleInterval = DEFAULT_IDLE_INTERVAL
+        self._redrawUntil = 0.0
+        self._redrawScheduled = False
+        self._flipAfterDraw = False
+        self._finishAfterDraw = False
+
+        # Image uploads
+        self.uploadBudget = DEFAULT_UPLOAD_BUDGET
+
+        # Frame timing
+        self.frameTimer = None
+
     ## Methods
-    def present(self, title, maximize = DEFAULT_MAXIMIZE, fullscreen = DEFAULT_FULLSCREEN, size = DEFAULT_WIN_SIZE, iconsPath = None):
+    def present(self, title, maximize = DEFAULT_MAXIMIZE, fullscreen = DEFAULT_FULLSCREEN, size = DEFAULT_WIN_SIZE, iconsPath = None, redrawPolicy = DEFAULT_REDRAW_POLICY, frameLimit: int = None):
         """
         When called, opens the Pyglet window and renders the configured content.
 
@@ -47,12 +88,19 @@ class PygletImGui():
         fullscreen: A bool inidicating if the window should start in fullscreen.
         size: A tuple representing the initial window size as (width, height).
         iconsPath: A string directory path indicating where the 16x16, 32x32, 64x64, and 128x128 PNG icon images are stored. Supply `None` to resolve the two default locations. These being any encompasing package's icons at `../icons` and this package's included default icons at `./icons`.
+        redrawPolicy: When frames are drawn. `REDRAW_CONTINUOUS` draws every `frameInterval` seconds. `REDRAW_ON_DEMAND` only draws after input events, while `isAnimating()` is `True`, or when `requestRedraw()` is called. `REDRAW_HYBRID` is on demand but also draws every `idleInterval` seconds while idle.
+        frameLimit: An int number of frames to draw and time as fast as possible before closing the window. `RUN_WARMUP_FRAMES` untimed frames are drawn first. Frame timing is enabled and vsync is disabled. Provide `None` to run until the window is closed. To run without a display, set `pyglet.options["headless"] = True` before importing this module.
+
+        Returns the `frameTimer.summary()` dict of the run if `frameLimit` is provided, otherwise `None`.
         """
         # Get the directory of the package
         packageDir = os.path.split(__file__)[0]
 
         # Create the render window
-        self.window = pyglet.window.Window(width=size[0], height=size[1], resizable=True, caption=title)
+        if frameLimit == None:
+            self.window = pyglet.window.Window(width=size[0], height=size[1], resizable=True, caption=title)
+        else:
+            self.window = pyglet.window.Window(width=size[0], height=size[1], resizable=True, caption=title, vsync=False)
         gl.glClearColor(0, 0, 0, 0)
 
         # Setup events
@@ -92,12 +140,103 @@ class PygletImGui():
         # Setup rendering
         imgui.create_context()
         self._renderer = create_renderer(self.window)
-        pyglet.clock.schedule_interval(self._draw, 1/120.)
+        self.redrawPolicy = redrawPolicy
+
+        # Check the redraw policy
+        if frameLimit != None:
+            # Draw the fixed number of frames
+            return self._runFrames(frameLimit)
+        elif self.redrawPolicy == REDRAW_CONTINUOUS:
+            # Draw on a fixed timer
+            pyglet.clock.schedule_interval(self._draw, self.frameInterval)
+
+            # Open the window
+            pyglet.app.run()
+        else:
+            # Redraw whenever the window receives input
+            # NOTE: Handlers return `None` so the ImGui renderer and `on...` methods still receive the events.
+            onEvent = lambda *args: self.requestRedraw(self.keepAlive)
+            self.window.push_handlers(
+                on_mouse_motion=onEvent,
+                on_mouse_drag=onEvent,
+                on_mouse_press=onEvent,
+                on_mouse_release=onEvent,
+                on_mouse_scroll=onEvent,
+                on_mouse_enter=onEvent,
+                on_mouse_leave=onEvent,
+                on_key_press=onEvent,
+                on_key_release=onEvent,
+                on_text=onEvent,
+                on_text_motion=onEvent,
+                on_resize=onEvent,
+                on_expose=onEvent,
+                on_activate=onEvent,
+                on_deactivate=onEvent
+            )
+
+            # Slowly refresh while idle if hybrid
+            if self.redrawPolicy == REDRAW_HYBRID:
+                pyglet.clock.schedule_interval(self._idleRedraw, self.idleInterval)
+
+            # Draw the first frame
+            self._flipAfterDraw = True
+            self.requestRedraw(self.keepAlive)
+
+            # Open the window without Pyglet's own redraw timer
+            pyglet.app.run(None)
 
-        # Open the window
-        pyglet.app.run()
         self._renderer.shutdown()
 
+    def requestRedraw(self, keepAlive = 0.0):
+        """
+        Requests that a new frame is drawn as soon as possible.
+        Has no effect when using `REDRAW_CONTINUOUS`.
+
+        keepAlive: A float number of seconds to keep drawing at `frameInterval` after this frame so ImGui hover and animation state can settle.
+        """
+        # Extend the keep alive window
+        self._redrawUntil = max(self._redrawUntil, time.monotonic() + keepAlive)
+
+        # Schedule a frame if one is not already pending
+        if (self.redrawPolicy != REDRAW_CONTINUOUS) and (self.window != None) and (not self._redrawScheduled):
+            self._redrawScheduled = True
+            pyglet.clock.schedule_once(self._drawOnDemand, 0)
+
+    def enableFrameTiming(self, capacity: int = DEFAULT_TIMING_CAPACITY):
+        """
+        Starts recording the duration of each phase of `_draw` into `frameTimer`.
+
+        capacity: An int number of frames to keep in each ring buffer.
+        """
+        self.frameTimer = FrameTimer(capacity)
+
+    def disableFrameTiming(self):
+        """
+        Stops recording frame timings and releases `frameTimer`.
+        """
+        self.frameTimer = None
+
+    def timeSpan(self, name: str):
+        """
+        Returns a context manager that records the enclosed code as the named span of the current frame.
+        Does nothing when frame timing is disabled.
+
+        name: A string name for the span.
+        """
+        if self.frameTimer == None:
+            return NULL_SPAN
+
+        return self.frameTimer.span(name)
+
+    def isAnimating(self) -> bool:
+        """
+        Returns `True` if frames should keep being drawn under the on demand redraw policies.
+        By default this is `True` while any `AnimatedImage` is playing or any `StreamImage` is receiving frames.
+
+        Overide this function to keep redrawing while other content is animating.
+        """
+        return AnimatedImage.isAnyPlaying() or StreamImage.isAnyStreaming()
+
     def setTitle(self, title):
         """
         Sets the title of the window to the new `title`.
@@ -147,6 +286,9 @@ class PygletImGui():
                     exit(1)
 
                 imgui.end_menu()
+
+            # Add any other menus
+            self.renderMenus(data)
             imgui.end_main_menu_bar()
 
         # Run the default ImGui test window
@@ -162,6 +304,16 @@ class PygletImGui():
 
         imgui.end() # Ends building of "Custom Window". Does _not_ end the frame.
 
+    def renderMenus(self, data):
+        """
+        Configures what menus will be shown in the main menu bar after the "File" menu.
+
+        Overide this function to add menus.
+
+        data: Some number?
+        """
+        pass
+
     def renderBackground(self, data):
         """
         Configures what regular render content will be shown.
@@ -232,18 +384,149 @@ class PygletImGui():
 
         data: Some number?
         """
+        # Check if timing is enabled
+        timer = self.frameTimer
+        if timer != None:
+            self._drawTimed(data, timer)
+            return
+
+        # Start the texture cache frame
+        TextureCache.advanceFrame()
+
+        # Upload asynchronously loaded images
+        ImageLoader.processAll(self.uploadBudget)
+
+        # Display pregui render
+        self.renderBackground(data)
+
+        # Display ImGui
+        self.renderImgui(data)
+
+        # Reset window
+        self.window.clear()
+
+        # Render the frame
+        imgui.render()
+        self._renderer.render(imgui.get_draw_data())
+
+        # Present the frame if Pyglet will not
+        if self._flipAfterDraw:
+            self.window.flip()
+
+    def _drawTimed(self, data, timer: FrameTimer):
+        """
+        Runs the same phases as `_draw` while recording each into the provided timer.
+
+        data: Some number?
+        timer: The `FrameTimer` to record into.
+        """
+        timer.beginFrame()
+        TextureCache.advanceFrame()
+
+        # Upload asynchronously loaded images
+        timer.startSpan(PHASE_UPLOAD)
+        ImageLoader.processAll(self.uploadBudget)
+        timer.endSpan(PHASE_UPLOAD)
+
         # Display pregui render
+        timer.startSpan(PHASE_BACKGROUND)
         self.renderBackground(data)
+        timer.endSpan(PHASE_BACKGROUND)
 
         # Display ImGui
+        timer.startSpan(PHASE_IMGUI)
         self.renderImgui(data)
+        timer.endSpan(PHASE_IMGUI)
 
         # Reset window
+        timer.startSpan(PHASE_CLEAR)
         self.window.clear()
+        timer.endSpan(PHASE_CLEAR)
 
         # Render the frame
+        timer.startSpan(PHASE_RENDER)
         imgui.render()
+        timer.endSpan(PHASE_RENDER)
+
+        timer.startSpan(PHASE_RENDERER)
         self._renderer.render(imgui.get_draw_data())
+        timer.endSpan(PHASE_RENDERER)
+
+        # Present the frame if Pyglet will not
+        if self._flipAfterDraw:
+            timer.startSpan(PHASE_FLIP)
+            self.window.flip()
+            timer.endSpan(PHASE_FLIP)
+
+        # Wait for the GPU if requested
+        if self._finishAfterDraw:
+            timer.startSpan(PHASE_FINISH)
+            gl.glFinish()
+            timer.endSpan(PHASE_FINISH)
+
+        timer.endFrame()
+
+    def _drawOnDemand(self, data):
+        """
+        Draws and presents a single frame for the on demand redraw policies.
+        Schedules the next frame if the keep alive window is open, `isAnimating()` is `True`, or images are still loading.
+
+        data: The time in seconds since the frame was requested.
+        """
+        # Draw the frame
+        self._redrawScheduled = False
+        self._draw(data)
+
+        # Schedule the next frame if still active or images are still loading
+        if (time.monotonic() < self._redrawUntil) or self.isAnimating() or (ImageLoader.pendingAll() > 0):
+            self._redrawScheduled = True
+            pyglet.clock.schedule_once(self._drawOnDemand, self.frameInterval)
+
+    def _runFrames(self, frameLimit: int) -> dict:
+        """
+        Draws and presents the provided number of frames back to back after `RUN_WARMUP_FRAMES` untimed frames, then closes the window.
+
+        frameLimit: An int number of frames to draw.
+
+        Returns the `frameTimer.summary()` dict of the run.
+        """
+        # Record every frame
+        if (self.frameTimer == None) or (self.frameTimer.capacity < frameLimit):
+            self.enableFrameTiming(frameLimit)
+        self._flipAfterDraw = True
+
+        # Keep runs from reading or writing the window layout file
+        imgui.get_io().ini_file_name = None
+
+        # Draw the warm up frames
+        # NOTE: The first frames build the font atlas and lay out every window, so they would skew the timings.
+        for _ in range(RUN_WARMUP_FRAMES):
+            self.window.dispatch_events()
+            self._draw(pyglet.clock.tick())
+        self.frameTimer.reset()
+
+        # Draw the frames
+        # NOTE: The last frame waits for the GPU so the timings include all queued work.
+        for i in range(frameLimit):
+            self._finishAfterDraw = (i == (frameLimit - 1))
+            self.window.dispatch_events()
+            self._draw(pyglet.clock.tick())
+        self._finishAfterDraw = False
+
+        # Close the window
+        summary = self.frameTimer.summary()
+        self._renderer.shutdown()
+        self.window.close()
+
+        return summary
+
+    def _idleRedraw(self, data):
+        """
+        Requests a single frame while idle for the hybrid redraw policy.
+
+        data: The time in seconds since the last idle frame.
+        """
+        self.requestRedraw()
 
 class PygletImGuiFull(PygletImGui, AllComponents):
     """
@@ -260,6 +543,20 @@ class PygletImGuiFull(PygletImGui, AllComponents):
         super(PygletImGuiFull, self).__init__()
 
     ## Render Methods
+    def renderMenus(self, data):
+        """
+        Configures what menus will be shown in the main menu bar after the "File" menu.
+
+        Overide this function to add menus.
+
+        data: Some number?
+        """
+        # Run the super
+        super(PygletImGuiFull, self).renderMenus(data)
+
+        # Add the frame timing HUD toggle
+        self.uiFrameHudMenu()
+
     def renderImgui(self, data):
         """
         Configures what ImGui content will be shown.
@@ -271,6 +568,11 @@ class PygletImGuiFull(PygletImGui, AllComponents):
         # Run the super
         super(PygletImGuiFull, self).renderImgui(data)
 
+        # Show the frame timing HUD
+        if self.hudVisible and (self.frameTimer == None):
+            self.enableFrameTiming()
+        self.uiFrameHud(self.frameTimer)
+
         # Show the test windows
         self.uiError("This is a demo error.")
 
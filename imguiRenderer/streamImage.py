@@ -0,0 +1,244 @@
+## Stream ImGui Image
+# An `ImguiImage` whose pixels are pushed from memory, like camera frames or simulation buffers, instead of loaded from a file.
+
+## Imports
+import time
+import ctypes
+import threading
+from pyglet import image as pygletImage
+
+from .imguiImage import ImguiImage
+from .textureCache import TextureCache
+from .texturePool import TexturePool
+from .imageLoader import STATE_READY, STATE_UPLOADED
+
+## Constants
+STREAM_MODES = {3: "RGB", 4: "RGBA"}
+STREAM_IDLE_TIMEOUT = 1.0
+
+## Classes
+class _StreamFrame():
+    """
+    A reusable buffer holding a single pushed frame.
+    """
+    # Constructor
+    def __init__(self, size: tuple, mode: str):
+        """
+        size: A tuple containing the frame size as (width, height).
+        mode: A string pixel mode from `STREAM_MODES`.
+        """
+        self.size = size
+        self.mode = mode
+        self.pixels = bytearray(size[0] * size[1] * len(mode))
+        self.pointer = (ctypes.c_ubyte * len(self.pixels)).from_buffer(self.pixels)
+
+class StreamImage(ImguiImage):
+    """
+    An `ImguiImage` that shows frames pushed from memory, such as a NumPy array or any other object supporting the buffer protocol.
+    Frames can be pushed from any thread at any rate. Each push is copied into a spare buffer and swapped in under a lock, so the render loop never waits on the producer.
+    Once per drawn frame, the newest pushed frame is uploaded in place with a sub-image update into whichever of two textures was not drawn last, so the upload never writes a texture a queued draw still reads.
+    Frames replaced by a newer push before they were uploaded are counted in `droppedFrames`.
+    """
+    ## Statics
+    _lastUploadTime = 0.0
+
+    # Constructor
+    def __init__(self, name: str = "stream", metadata=None, verbose=False):
+        """
+        name: A string name for the stream used in place of a filepath.
+        metadata: A dict of additonal data for the item. Can also provided `None` for no additonal data.
+        verbose: If `True`, enables verbose output.
+        """
+        super(StreamImage, self).__init__(name, metadata, None, verbose)
+
+        # Assigned
+        self.framesPushed = 0
+        self.framesUploaded = 0
+        self.droppedFrames = 0
+        self._lock = threading.Lock()
+        self._back = None
+        self._pending = None
+        self._front = None
+        self._fresh = False
+        self._textures = [None, None]
+        self._texture = None
+        self._lastFrame = -1
+
+    # Functions
+    def push(self, data, size: tuple = None, mode: str = None):
+        """
+        Copies a frame in to be shown from the next drawn frame on.
+        Safe to call from any one thread at a time. The provided data can be reused as soon as this returns.
+
+        data: An object supporting the buffer protocol holding 8 bit pixels top row first, like a C contiguous `numpy.uint8` array shaped (height, width, channels).
+        size: A tuple containing the frame size as (width, height). Provide `None` to read it from the data's shape.
+        mode: A string pixel mode of either `RGB` or `RGBA`. Provide `None` to choose from the data's channels.
+        """
+        # Resolve the layout
+        view = memoryview(data)
+        if not view.c_contiguous:
+            raise ValueError(f"{self} can only stream C contiguous data.")
+
+        if view.itemsize != 1:
+            raise ValueError(f"{self} can only stream 8 bit pixels, not {view.itemsize * 8} bit.")
+
+        if size == None:
+            if view.ndim < 2:
+                raise ValueError(f"{self} needs a size for data without a (height, width, channels) shape.")
+            size = (view.shape[1], view.shape[0])
+
+        if mode == None:
+            channels = view.shape[2] if (view.ndim == 3) else (view.nbytes // (size[0] * size[1]))
+            if not (channels in STREAM_MODES):
+                raise ValueError(f"{self} can only stream 3 or 4 channel pixels, not {channels}.")
+            mode = STREAM_MODES[channels]
+
+        if not (mode in STREAM_MODES.values()):
+            raise ValueError(f"{self} can only stream RGB or RGBA pixels, not {mode}.")
+
+        if view.nbytes != (size[0] * size[1] * len(mode)):
+            raise ValueError(f"{self} was given {view.nbytes} bytes for a {size[0]}x{size[1]} {mode} frame.")
+
+        # Copy into the spare buffer
+        frame = self._back
+        if (frame == None) or (frame.size != tuple(size)) or (frame.mode != mode):
+            frame = _StreamFrame(tuple(size), mode)
+        frame.pixels[:] = view.cast("B")
+
+        # Swap it in for the render thread
+        with self._lock:
+            self._back = self._pending
+            self._pending = frame
+            if self._fresh:
+                self.droppedFrames += 1
+            self._fresh = True
+            self.framesPushed += 1
+
+        if self.state != STATE_UPLOADED:
+            self.state = STATE_READY
+        self.loaded = True
+
+    def load(self, skipTexture = False, background: tuple = None):
+        """
+        Does nothing as streams receive their frames through `push(...)`.
+
+        skipTexture: Unused.
+        background: Unused.
+        """
+        pass
+
+    def loadAsync(self, background: tuple = None, loader = None):
+        """
+        Does nothing as streams receive their frames through `push(...)`.
+
+        background: Unused.
+        loader: Unused.
+        """
+        pass
+
+    def close(self, releaseTextures: bool = False):
+        """
+        Releases the frames and textures.
+        Pushing again restarts the stream.
+
+        releaseTextures: Unused. The textures of a stream are always released, on the render thread.
+        """
+        super(StreamImage, self).close()
+
+        # Release the frames
+        with self._lock:
+            self._back = None
+            self._pending = None
+            self._front = None
+            self._fresh = False
+
+        # Release the textures
+        for entry in self._textures:
+            if entry != None:
+                TexturePool.releaseTexture(entry[0])
+
+        self._textures = [None, None]
+        self._texture = None
+        self._size = None
+
+    def size(self):
+        """
+        Returns the size of the frame being shown as a tuple like (width, height).
+        Before the first upload, the size of the newest pushed frame is returned, or `None` if no frame has been pushed.
+        """
+        if self._size != None:
+            return self._size
+
+        with self._lock:
+            if self._pending != None:
+                return self._pending.size
+
+        return None
+
+    def getTexture(self):
+        """
+        Gets the texture showing the newest uploaded frame.
+
+        Returns a GL compatible texture, or `None` if no frame has been uploaded yet.
+        """
+        return self._drawableTexture()
+
+    ## Private functions
+    def _drawableTexture(self, drawSize: tuple = None):
+        """
+        Uploads the newest pushed frame once per drawn frame and returns the texture showing it.
+
+        drawSize: Unused.
+        """
+        if self._lastFrame != TextureCache._frame:
+            self._lastFrame = TextureCache._frame
+            self._uploadFrame()
+
+        return self._texture
+
+    def _uploadFrame(self):
+        """
+        Uploads the newest pushed frame if it has not been uploaded yet.
+        Must be called from the render thread.
+        """
+        # Take the newest frame
+        with self._lock:
+            if not self._fresh:
+                return
+
+            self._front, self._pending = self._pending, self._front
+            self._fresh = False
+
+        frame = self._front
+        imgData = pygletImage.ImageData(frame.size[0], frame.size[1], frame.mode, frame.pointer, pitch=(frame.size[0] * len(frame.mode)))
+
+        # Swap to the texture the last frame did not draw
+        self._textures.reverse()
+        entry = self._textures[0]
+
+        if (entry == None) or (entry[1] != frame.size) or (entry[2] != frame.mode):
+            # Swap the texture for one of the new size
+            if entry != None:
+                TexturePool.releaseTexture(entry[0])
+            tex = self._getPool().acquire(imgData, ImguiImage.supportsNpot())
+            self._textures[0] = (tex, frame.size, frame.mode)
+        else:
+            # Update in place
+            tex = entry[0]
+            TexturePool.upload(tex, imgData)
+
+        # Show the frame
+        self._texture = tex
+        self._size = frame.size
+        self.framesUploaded += 1
+        self.state = STATE_UPLOADED
+        StreamImage._lastUploadTime = time.monotonic()
+
+    # Static Functions
+    def isAnyStreaming() -> bool:
+        """
+        Returns `True` if any `StreamImage` uploaded a frame within the last `STREAM_IDLE_TIMEOUT` seconds.
+        `PygletImGui.isAnimating()` uses this to keep redrawing under the on demand redraw policies while frames arrive.
+        A stream that resumes after going idle needs a call to `PygletImGui.requestRedraw()` from the render thread to be drawn again.
+        """
+        return (time.monotonic() - StreamImage._lastUploadTime) < STREAM_IDLE_TIMEOUT
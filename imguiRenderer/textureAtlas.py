@@ -0,0 +1,347 @@
+## Texture Atlas
+# Packs small thumbnails into shared GL textures so ImGui can draw many of them with a single texture bind.
+
+## Imports
+from ctypes import byref
+from pyglet import gl
+from pyglet import image as pygletImage
+
+## Constants
+DEFAULT_PAGE_SIZE = 2048
+DEFAULT_MAX_ITEM_SIZE = 256
+DEFAULT_PADDING = 1
+
+## Classes
+class AtlasRegion():
+    """
+    A rectangle of a `TextureAtlas` page holding a single image.
+    Provides the `id`, `width`, and `height` of a GL texture plus `uvRect`, so it can be drawn with `ImguiImage.drawTexture(...)` and stored in a `TextureCache`.
+    Deleting the region frees its space in the atlas.
+    """
+    # Constructor
+    def __init__(self, atlas, page, x: int, y: int, width: int, height: int):
+        """
+        atlas: The `TextureAtlas` the region belongs to.
+        page: The `_AtlasPage` the region is on.
+        x: An int left edge of the region on the page in pixels.
+        y: An int top edge of the region on the page in pixels.
+        width: An int width of the region in pixels.
+        height: An int height of the region in pixels.
+        """
+        # Provided
+        self.atlas = atlas
+        self.page = page
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+        # Assigned
+        self.uvRect = None
+        self._updateUv()
+
+    ## Properties
+    @property
+    def id(self) -> int:
+        return self.page.texture.id
+
+    # Functions
+    def delete(self):
+        """
+        Frees the region's space in its atlas.
+        """
+        if self.atlas != None:
+            self.atlas.free(self)
+
+    ## Private Functions
+    def _updateUv(self):
+        """
+        Recalculates `uvRect` from the region's position on its page.
+        """
+        pageW = self.page.texture.width
+        pageH = self.page.texture.height
+        self.uvRect = (
+            (self.x / pageW, self.y / pageH),
+            ((self.x + self.width) / pageW, (self.y + self.height) / pageH)
+        )
+
+class _AtlasPage():
+    """
+    A single GL texture of a `TextureAtlas` packed with shelves.
+    Each shelf is a row of regions sharing a height. New regions go on the shelf that wastes the least height, or on a new shelf at the bottom.
+    """
+    # Constructor
+    def __init__(self, size: int, padding: int):
+        """
+        size: An int width and height of the page in pixels.
+        padding: An int number of empty pixels to leave around each region.
+        """
+        # Provided
+        self.size = size
+        self.padding = padding
+
+        # Assigned
+        self.texture = pygletImage.Texture.create(size, size)
+        self.shelves = []
+        self.bottom = 0
+        self.regions = set()
+        self.usedPixels = 0
+
+    # Functions
+    def allocate(self, width: int, height: int):
+        """
+        Finds space for a region of the provided size.
+
+        width: An int width in pixels.
+        height: An int height in pixels.
+
+        Returns the (x, y) of the space, or `None` if the page is full.
+        """
+        # Include the padding
+        paddedW = width + self.padding
+        paddedH = height + self.padding
+
+        # Find the shelf that wastes the least height
+        best = None
+        for shelf in self.shelves:
+            if (shelf[1] >= paddedH) and ((self.size - shelf[2]) >= paddedW):
+                if (best == None) or (shelf[1] < best[1]):
+                    best = shelf
+
+        # Open a new shelf if needed
+        if best == None:
+            if (self.size - self.bottom) < paddedH:
+                return None
+
+            best = [self.bottom, paddedH, 0]
+            self.shelves.append(best)
+            self.bottom += paddedH
+
+        # Place on the shelf
+        x = best[2]
+        best[2] += paddedW
+        return (x, best[0])
+
+    def reset(self):
+        """
+        Forgets every shelf so the whole page can be reused.
+        """
+        self.shelves = []
+        self.bottom = 0
+
+    def occupancy(self) -> float:
+        """
+        Returns the fraction of the page covered by live regions.
+        """
+        return self.usedPixels / (self.size * self.size)
+
+class TextureAtlas():
+    """
+    Packs small images into large shared GL textures called pages.
+    Images drawn from the same page share a texture, so ImGui merges their draws into one command.
+    Freed space is reused once its whole page is empty, or immediately after `compact()`.
+    Must only be used from the render thread.
+    """
+    ## Statics
+    _shared = None
+
+    # Constructor
+    def __init__(self, pageSize: int = DEFAULT_PAGE_SIZE, maxItemSize: int = DEFAULT_MAX_ITEM_SIZE, padding: int = DEFAULT_PADDING):
+        """
+        pageSize: An int width and height of each page texture in pixels.
+        maxItemSize: An int largest width or height of an image the atlas will accept.
+        padding: An int number of empty pixels to leave around each image so filtering does not bleed between neighbors.
+        """
+        # Provided
+        self.pageSize = pageSize
+        self.maxItemSize = min(maxItemSize, pageSize - padding)
+        self.padding = padding
+
+        # Assigned
+        self.pages = []
+        self.compactions = 0
+
+    # Functions
+    def fits(self, size: tuple) -> bool:
+        """
+        Returns `True` if an image of the provided size can be added to the atlas.
+
+        size: A tuple containing the image size as (width, height).
+        """
+        return (size[0] <= self.maxItemSize) and (size[1] <= self.maxItemSize)
+
+    def add(self, img) -> AtlasRegion:
+        """
+        Uploads the provided image into the atlas.
+        A new page is created if no existing page has room.
+
+        img: A PIL image no larger than `maxItemSize` on either side.
+
+        Returns the `AtlasRegion` holding the image, or `None` if the image is too large.
+        """
+        # Check the size
+        if not self.fits(img.size):
+            return None
+
+        # Find space
+        page, position = self._allocate(img.size[0], img.size[1])
+
+        # Upload the pixels
+        # NOTE: Pages are RGBA so other modes are converted to keep their channels in place.
+        if img.mode != "RGBA":
+            imgRgba = img.convert("RGBA")
+        else:
+            imgRgba = img
+
+        page.texture.blit_into(
+            pygletImage.ImageData(img.size[0], img.size[1], "RGBA", imgRgba.tobytes(), pitch=(img.size[0] * 4)),
+            position[0],
+            position[1],
+            0
+        )
+
+        if imgRgba is not img:
+            imgRgba.close()
+
+        # Record the region
+        region = AtlasRegion(self, page, position[0], position[1], img.size[0], img.size[1])
+        self._track(region, page)
+        return region
+
+    def free(self, region: AtlasRegion):
+        """
+        Frees the provided region.
+        Its page is reused once it has no regions left.
+
+        region: The `AtlasRegion` to free.
+        """
+        # Check the region is live
+        page = region.page
+        if not (region in page.regions):
+            return
+
+        # Forget the region
+        page.regions.discard(region)
+        page.usedPixels -= region.width * region.height
+        region.atlas = None
+
+        # Reuse the page once empty
+        if len(page.regions) == 0:
+            page.reset()
+
+    def compact(self) -> int:
+        """
+        Repacks every live region into as few pages as possible on the GPU and deletes the emptied pages.
+        Existing `AtlasRegion` objects are updated in place so anything holding them stays valid.
+
+        Returns the number of pages released.
+        """
+        # Collect the live regions, tallest first for tighter shelves
+        oldPages = self.pages
+        regions = sorted((region for page in oldPages for region in page.regions), key=lambda region: region.height, reverse=True)
+
+        # Repack into new pages
+        self.pages = []
+        framebuffer = gl.GLuint()
+        gl.glGenFramebuffers(1, byref(framebuffer))
+        gl.glBindFramebuffer(gl.GL_READ_FRAMEBUFFER, framebuffer)
+
+        for region in regions:
+            page, position = self._allocate(region.width, region.height)
+
+            # Copy the pixels from the old page
+            gl.glFramebufferTexture2D(gl.GL_READ_FRAMEBUFFER, gl.GL_COLOR_ATTACHMENT0, gl.GL_TEXTURE_2D, region.page.texture.id, 0)
+            gl.glBindTexture(gl.GL_TEXTURE_2D, page.texture.id)
+            gl.glCopyTexSubImage2D(gl.GL_TEXTURE_2D, 0, position[0], position[1], region.x, region.y, region.width, region.height)
+
+            # Move the region
+            region.page.regions.discard(region)
+            region.page = page
+            region.x, region.y = position
+            region._updateUv()
+            self._track(region, page)
+
+        gl.glBindFramebuffer(gl.GL_READ_FRAMEBUFFER, 0)
+        gl.glDeleteFramebuffers(1, byref(framebuffer))
+
+        # Release the old pages
+        for page in oldPages:
+            page.texture.delete()
+
+        self.compactions += 1
+        return max(0, len(oldPages) - len(self.pages))
+
+    def clear(self):
+        """
+        Deletes every page.
+        Any remaining regions become invalid.
+        """
+        for page in self.pages:
+            for region in page.regions:
+                region.atlas = None
+            page.texture.delete()
+
+        self.pages = []
+
+    def stats(self) -> dict:
+        """
+        Returns a dict of the atlas' counters.
+        Keys are `pages`, `regions`, `usedPixels`, `pagePixels`, `occupancy` as a fraction of all page area covered by live regions, `pageOccupancy` as a list of each page's fraction, and `compactions`.
+        """
+        pagePixels = len(self.pages) * self.pageSize * self.pageSize
+        usedPixels = sum(page.usedPixels for page in self.pages)
+        return {
+            "pages": len(self.pages),
+            "regions": sum(len(page.regions) for page in self.pages),
+            "usedPixels": usedPixels,
+            "pagePixels": pagePixels,
+            "occupancy": (usedPixels / pagePixels) if pagePixels > 0 else 0.0,
+            "pageOccupancy": [page.occupancy() for page in self.pages],
+            "compactions": self.compactions
+        }
+
+    ## Private Functions
+    def _allocate(self, width: int, height: int):
+        """
+        Finds space for a region of the provided size, creating a page if needed.
+
+        width: An int width in pixels.
+        height: An int height in pixels.
+
+        Returns a tuple of the (`_AtlasPage`, (x, y)).
+        """
+        # Try the existing pages
+        for page in self.pages:
+            position = page.allocate(width, height)
+            if position != None:
+                return (page, position)
+
+        # Add a page
+        page = _AtlasPage(self.pageSize, self.padding)
+        self.pages.append(page)
+        return (page, page.allocate(width, height))
+
+    def _track(self, region: AtlasRegion, page: _AtlasPage):
+        """
+        Records a region as live on its page.
+
+        region: The `AtlasRegion` to record.
+        page: The `_AtlasPage` it is on.
+        """
+        page.regions.add(region)
+        page.usedPixels += region.width * region.height
+
+    # Static Functions
+    def shared():
+        """
+        Returns the shared `TextureAtlas`, or `None` if one has not been set with `setShared(...)`.
+        """
+        return TextureAtlas._shared
+
+    def setShared(atlas):
+        """
+        Sets the shared `TextureAtlas` used by every `ImguiImage` that was not given its own.
+
+        atlas: A `TextureAtlas`, or `None` to disable the shared atlas.
+        """
+        TextureAtlas._shared = atlas
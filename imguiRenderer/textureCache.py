@@ -0,0 +1,246 @@
+## Texture Cache
+# A least recently used cache of GL textures with a memory budget.
+
+## Imports
+from collections import OrderedDict
+
+from .texturePool import TexturePool, BYTES_PER_PIXEL
+
+## Constants
+DEFAULT_BUDGET = 512 * 1024 * 1024
+
+## Classes
+class _CacheEntry():
+    """
+    A single texture held by a `TextureCache`.
+    """
+    # Constructor
+    def __init__(self, texture, size: int, savedBytes: int = 0):
+        """
+        texture: A GL compatible texture.
+        size: An int number of bytes the texture uses.
+        savedBytes: An int number of bytes saved by not padding the texture to a power of two.
+        """
+        self.texture = texture
+        self.size = size
+        self.savedBytes = savedBytes
+        self.pins = 0
+        self.lastFrame = -1
+
+class TextureCache():
+    """
+    Holds GL textures by key up to a byte budget.
+    When over budget, the least recently used textures are released first, returning to their `TexturePool` if they came from one and deleted otherwise.
+    Textures that are pinned, or that were used during the current or previous frame, are never evicted.
+    The previous frame is included as uploads run at the start of a frame, before anything has been drawn in it.
+    Must only be used from the render thread.
+    """
+    ## Statics
+    _shared = None
+    _frame = 0
+
+    # Constructor
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        """
+        budget: An int number of bytes of texture memory to keep before evicting.
+        """
+        # Provided
+        self.budget = budget
+
+        # Assigned
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    ## Internal
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    # Functions
+    def get(self, key):
+        """
+        Returns the texture stored for the key and marks it as used this frame, or `None` if it is not cached.
+
+        key: A hashable key.
+        """
+        entry = self._entries.get(key)
+        if entry == None:
+            self.misses += 1
+            return None
+
+        # Mark as recently used
+        self.hits += 1
+        entry.lastFrame = TextureCache._frame
+        self._entries.move_to_end(key)
+        return entry.texture
+
+    def put(self, key, texture, size: int = None, savedBytes: int = 0):
+        """
+        Stores the texture for the key, replacing and releasing any texture already stored for it.
+        Evicts other textures if over budget.
+
+        key: A hashable key.
+        texture: A GL compatible texture.
+        size: An int number of bytes the texture uses. Provide `None` to estimate from the texture's dimensions.
+        savedBytes: An int number of bytes saved by not padding the texture to a power of two.
+        """
+        # Estimate the size
+        if size == None:
+            size = TextureCache.textureBytes(texture)
+
+        # Replace any previous entry
+        previous = self._entries.pop(key, None)
+        pins = 0
+        if previous != None:
+            self.bytes -= previous.size
+            pins = previous.pins
+            if previous.texture is not texture:
+                TextureCache._deleteTexture(previous.texture)
+
+        # Add the entry
+        entry = _CacheEntry(texture, size, savedBytes)
+        entry.pins = pins
+        entry.lastFrame = TextureCache._frame
+        self._entries[key] = entry
+        self.bytes += size
+
+        # Stay in budget
+        self.trim()
+
+    def pin(self, key):
+        """
+        Prevents the texture for the key from being evicted until `unpin(...)` is called the same number of times.
+
+        key: A hashable key.
+        """
+        entry = self._entries.get(key)
+        if entry != None:
+            entry.pins += 1
+
+    def unpin(self, key):
+        """
+        Reverses one call to `pin(...)` for the key.
+
+        key: A hashable key.
+        """
+        entry = self._entries.get(key)
+        if (entry != None) and (entry.pins > 0):
+            entry.pins -= 1
+
+    def release(self, key) -> bool:
+        """
+        Removes and releases the texture for the key, even if it is pinned.
+
+        key: A hashable key.
+
+        Returns `True` if a texture was released.
+        """
+        entry = self._entries.pop(key, None)
+        if entry == None:
+            return False
+
+        self.bytes -= entry.size
+        TextureCache._deleteTexture(entry.texture)
+        return True
+
+    def trim(self, budget: int = None) -> int:
+        """
+        Evicts least recently used textures until the cache is within budget.
+        Pinned textures and textures used this frame or the previous frame are skipped, so the cache may stay over budget.
+
+        budget: An int number of bytes to trim to. Provide `None` to use `budget`.
+
+        Returns the number of textures evicted.
+        """
+        # Resolve the budget
+        if budget == None:
+            budget = self.budget
+
+        # Evict from the least recently used end
+        evicted = 0
+        if self.bytes > budget:
+            for key in list(self._entries.keys()):
+                if self.bytes <= budget:
+                    break
+
+                entry = self._entries[key]
+                if (entry.pins > 0) or (entry.lastFrame >= (TextureCache._frame - 1)):
+                    continue
+
+                del self._entries[key]
+                self.bytes -= entry.size
+                TextureCache._deleteTexture(entry.texture)
+                evicted += 1
+
+        self.evictions += evicted
+        return evicted
+
+    def clear(self):
+        """
+        Removes and releases every texture, including pinned textures.
+        """
+        for entry in self._entries.values():
+            TextureCache._deleteTexture(entry.texture)
+
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Returns a dict of the cache's counters.
+        Keys are `entries`, `bytes`, `budget`, `hits`, `misses`, `evictions`, `pinned`, `frameBytes`, the bytes of the textures used during the current frame, and `savedBytes` and `savedBytesPerTexture`, the bytes saved by exact size textures over power of two padding.
+        """
+        savedBytes = sum(entry.savedBytes for entry in self._entries.values())
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "pinned": sum(1 for entry in self._entries.values() if entry.pins > 0),
+            "frameBytes": sum(entry.size for entry in self._entries.values() if entry.lastFrame == TextureCache._frame),
+            "savedBytes": savedBytes,
+            "savedBytesPerTexture": (savedBytes / len(self._entries)) if len(self._entries) > 0 else 0.0
+        }
+
+    # Static Functions
+    def shared():
+        """
+        Returns the shared `TextureCache`, creating it if needed.
+        """
+        if TextureCache._shared == None:
+            TextureCache._shared = TextureCache()
+
+        return TextureCache._shared
+
+    def advanceFrame():
+        """
+        Starts a new frame.
+        Textures not used in this frame or the previous frame become eligible for eviction again.
+        Also starts the frame of the `TexturePool`, running texture releases queued from other threads.
+        `PygletImGui` calls this once per frame.
+        """
+        TextureCache._frame += 1
+        TexturePool.advanceFrame()
+
+    def textureBytes(texture) -> int:
+        """
+        Returns an estimate of the bytes of GL memory the texture uses.
+
+        texture: A GL compatible texture.
+        """
+        return texture.width * texture.height * BYTES_PER_PIXEL
+
+    def _deleteTexture(texture):
+        """
+        Releases the GL texture back to its `TexturePool`, or deletes it if it did not come from one.
+
+        texture: A GL compatible texture.
+        """
+        TexturePool.releaseTexture(texture)
@@ -0,0 +1,359 @@
+## Texture Pool
+# Recycles GL textures by size class so textures released by one image are reused by the next instead of being deleted and created again.
+
+## Imports
+import sys
+import weakref
+import threading
+from collections import OrderedDict, deque
+from pyglet import gl
+from pyglet import image as pygletImage
+
+## Constants
+DEFAULT_BUDGET = 64 * 1024 * 1024
+DEFAULT_GRANULARITY = 64
+BYTES_PER_PIXEL = 4
+INTERNAL_FORMATS = {
+    "RGBA": "GL_RGBA",
+    "RGB": "GL_RGB"
+}
+
+## Classes
+class TexturePool():
+    """
+    Hands out GL textures for images and takes them back once they are released, keeping up to `budget` bytes of free textures to reuse.
+    Textures are grouped by pixel mode and size class. Each side is rounded up to a multiple of `granularity`, or to a power of two if that is smaller, so images of similar sizes share textures. Images are uploaded into the corner of their texture and the texture's `tex_coords` cover only the image.
+    A released texture is not handed out again until the next frame, as draws queued in the frame it was released in may still read it.
+    Textures can be released from any thread with `TexturePool.releaseTexture(...)`. Releases off the render thread happen at the start of the next frame.
+    Must otherwise only be used from the render thread.
+    """
+    ## Statics
+    _shared = None
+    _frame = 0
+    _renderThread = None
+    _pending = deque()
+
+    # Constructor
+    def __init__(self, budget: int = DEFAULT_BUDGET, granularity: int = DEFAULT_GRANULARITY):
+        """
+        budget: An int number of bytes of free textures to keep for reuse. Textures released past it are deleted, oldest first. Provide `0` to delete every released texture.
+        granularity: An int number of pixels each side of a texture is rounded up to a multiple of. Provide `1` to only reuse textures of exactly the same size.
+        """
+        # Provided
+        self.budget = budget
+        self.granularity = granularity
+
+        # Assigned
+        self.liveTextures = 0
+        self.liveBytes = 0
+        self.freeBytes = 0
+        self.created = 0
+        self.reused = 0
+        self.recycled = 0
+        self.deleted = 0
+        self.collected = 0
+        self._free = OrderedDict()
+        self._freeByClass = {}
+        self._lock = threading.Lock()
+
+    ## Internal
+    def __len__(self) -> int:
+        return len(self._free)
+
+    # Functions
+    def acquire(self, imgData, npot: bool = True, mipmaps: bool = False):
+        """
+        Uploads the image into a free texture of its size class, or into a new one if none is free.
+        Must be called from the render thread.
+
+        imgData: A Pyglet `ImageData`.
+        npot: If `True`, textures may have sizes that are not powers of two. If `False`, textures are padded up to powers of two.
+        mipmaps: If `True`, the texture is kept apart from those without mipmaps and sized exactly when `npot` is `True`, as mipmaps would blend in the padding. The caller generates the mipmaps after each upload.
+
+        Returns the texture.
+        """
+        # Find the size class
+        width, height = imgData.width, imgData.height
+        classKey = (imgData.format, self.classSize(width, npot, mipmaps), self.classSize(height, npot, mipmaps), mipmaps)
+
+        # Reuse a texture released before this frame
+        tex = None
+        free = self._freeByClass.get(classKey)
+        if free:
+            texId, tex = next(iter(free.items()))
+            if self._free[texId][2] < TexturePool._frame:
+                del free[texId]
+                del self._free[texId]
+                tex._poolFree = False
+                self.freeBytes -= TexturePool.textureBytes(tex)
+                self.reused += 1
+            else:
+                tex = None
+
+        # Create a texture
+        if tex == None:
+            tex = self._create(classKey)
+
+        # Upload the pixels
+        TexturePool.upload(tex, imgData)
+        return tex
+
+    def trim(self, budget: int = None) -> int:
+        """
+        Deletes free textures, oldest first, until they are within budget.
+        Must be called from the render thread.
+
+        budget: An int number of bytes to trim to. Provide `None` to use `budget`.
+
+        Returns the number of textures deleted.
+        """
+        # Resolve the budget
+        if budget == None:
+            budget = self.budget
+
+        # Delete from the oldest end
+        deleted = 0
+        while (self.freeBytes > budget) and (len(self._free) > 0):
+            texId, (tex, classKey, _) = self._free.popitem(last=False)
+            del self._freeByClass[classKey][texId]
+            self.freeBytes -= TexturePool.textureBytes(tex)
+            self._delete(tex)
+            deleted += 1
+
+        return deleted
+
+    def clear(self):
+        """
+        Deletes every free texture.
+        Textures still in use are kept and can be released later.
+        """
+        self.trim(0)
+
+    def stats(self) -> dict:
+        """
+        Returns a dict of the pool's counters.
+        Keys are `liveTextures` and `liveBytes`, the textures made by the pool that still exist whether in use or free, `inUseTextures`, `freeTextures`, `freeBytes`, `budget`, `created`, `reused`, `recycled`, the textures released back into the pool, `deleted`, `collected`, the textures garbage collected without being released, and `pendingReleases`, releases waiting for the render thread.
+        """
+        with self._lock:
+            return {
+                "liveTextures": self.liveTextures,
+                "liveBytes": self.liveBytes,
+                "inUseTextures": self.liveTextures - len(self._free),
+                "freeTextures": len(self._free),
+                "freeBytes": self.freeBytes,
+                "budget": self.budget,
+                "created": self.created,
+                "reused": self.reused,
+                "recycled": self.recycled,
+                "deleted": self.deleted,
+                "collected": self.collected,
+                "pendingReleases": len(TexturePool._pending)
+            }
+
+    def classSize(self, length: int, npot: bool = True, exact: bool = False) -> int:
+        """
+        Returns the texture side length the provided image side length is pooled under.
+
+        length: An int image side length in pixels.
+        npot: If `True`, lengths that are not powers of two may be returned. If `False`, the next power of two is returned.
+        exact: If `True` and `npot` is `True`, the length itself is returned.
+        """
+        power = 1
+        while power < length:
+            power *= 2
+
+        if not npot:
+            return power
+        if exact:
+            return length
+
+        return min(power, -(-length // self.granularity) * self.granularity)
+
+    ## Private Functions
+    def _create(self, classKey: tuple):
+        """
+        Creates a texture for the size class without uploading any pixels.
+
+        classKey: A tuple of (mode, width, height, mipmaps).
+
+        Returns the texture.
+        """
+        # Look up the internal format
+        # NOTE: Looked up here rather than on import, as reading `gl.GL_*` names creates Pyglet's shadow window and fails without a display.
+        mode, width, height, mipmaps = classKey
+        internalFormat = getattr(gl, INTERNAL_FORMATS.get(mode, "GL_RGBA"))
+        tex = pygletImage.Texture.create(width, height, gl.GL_TEXTURE_2D, internalFormat, blank_data=False)
+
+        # Track it until it is deleted or collected
+        size = TexturePool.textureBytes(tex)
+        tex._texturePool = self
+        tex._poolClass = classKey
+        tex._poolFree = False
+        tex._poolFinalizer = weakref.finalize(tex, self._onCollected, size)
+
+        with self._lock:
+            self.liveTextures += 1
+            self.liveBytes += size
+            self.created += 1
+
+        return tex
+
+    def _recycle(self, tex):
+        """
+        Takes a texture back to be reused, then trims the free textures to the budget.
+        Must be called from the render thread.
+
+        tex: A texture made by this pool.
+        """
+        if tex._poolFree or (tex.id == None):
+            return
+
+        # Add to the newest end
+        texId = id(tex)
+        tex._poolFree = True
+        self._free[texId] = (tex, tex._poolClass, TexturePool._frame)
+        self._freeByClass.setdefault(tex._poolClass, OrderedDict())[texId] = tex
+        self.freeBytes += TexturePool.textureBytes(tex)
+        self.recycled += 1
+
+        # Stay in budget
+        self.trim()
+
+    def _delete(self, tex):
+        """
+        Deletes a texture made by this pool.
+        Must be called from the render thread.
+
+        tex: A texture made by this pool.
+        """
+        tex._poolFinalizer.detach()
+        tex.delete()
+
+        with self._lock:
+            self.liveTextures -= 1
+            self.liveBytes -= TexturePool.textureBytes(tex)
+            self.deleted += 1
+
+    def _onCollected(self, size: int):
+        """
+        Called from any thread when a texture made by this pool is garbage collected without being released.
+        Pyglet deletes the GL texture itself.
+
+        size: An int number of bytes the texture used.
+        """
+        with self._lock:
+            self.liveTextures -= 1
+            self.liveBytes -= size
+            self.collected += 1
+
+    # Static Functions
+    def shared():
+        """
+        Returns the shared `TexturePool`, creating it if needed.
+        """
+        if TexturePool._shared == None:
+            TexturePool._shared = TexturePool()
+
+        return TexturePool._shared
+
+    def setShared(pool):
+        """
+        Sets the shared `TexturePool` used by every image that was not given its own.
+
+        pool: A `TexturePool`.
+        """
+        TexturePool._shared = pool
+
+    def advanceFrame():
+        """
+        Starts a new frame on the render thread, running the releases requested from other threads since the last frame.
+        Textures released before this frame can be handed out again.
+        `TextureCache.advanceFrame()` calls this once per frame.
+        """
+        TexturePool._frame += 1
+        TexturePool._renderThread = threading.get_ident()
+
+        # Run the releases queued from other threads
+        pending = TexturePool._pending
+        for _ in range(len(pending)):
+            pending.popleft()()
+
+    def isRenderThread() -> bool:
+        """
+        Returns `True` if called from the render thread, the thread that last started a frame, or the main thread before the first frame.
+        """
+        if TexturePool._renderThread == None:
+            return threading.current_thread() is threading.main_thread()
+
+        return threading.get_ident() == TexturePool._renderThread
+
+    def runOnRenderThread(fn):
+        """
+        Calls the function now if on the render thread, or at the start of the next frame otherwise.
+
+        fn: A function taking no arguments.
+        """
+        if TexturePool.isRenderThread():
+            fn()
+        else:
+            TexturePool._pending.append(fn)
+
+    def releaseTexture(texture):
+        """
+        Releases the texture on the render thread, returning it to its `TexturePool` if it came from one and deleting it otherwise.
+        Safe to call from any thread. The texture must not be drawn after it is released.
+
+        texture: A GL compatible texture, or `None` to do nothing.
+        """
+        # NOTE: GL calls are unsafe while the interpreter shuts down, so Pyglet is left to delete textures once collected.
+        if (texture == None) or sys.is_finalizing():
+            return
+
+        # Release on the render thread
+        if not TexturePool.isRenderThread():
+            TexturePool._pending.append(lambda: TexturePool.releaseTexture(texture))
+            return
+
+        # Return it to its pool
+        pool = getattr(texture, "_texturePool", None)
+        if pool != None:
+            pool._recycle(texture)
+            return
+
+        # Delete it if it supports deletion
+        delete = getattr(texture, "delete", None)
+        if delete != None:
+            delete()
+
+    def upload(tex, imgData):
+        """
+        Uploads the image into the corner of a pooled texture at least as large and points the texture's `tex_coords` at it.
+        Used to update textures from `acquire(...)` in place. Must be called from the render thread.
+
+        tex: A texture from `acquire(...)`.
+        imgData: A Pyglet `ImageData` no larger than the texture.
+        """
+        # Upload into the corner
+        width, height = imgData.width, imgData.height
+        tex.blit_into(imgData, 0, 0, 0)
+
+        # Repeat the last column and row so filtering at the image's edges does not blend in the padding
+        # NOTE: Pyglet loses the offset of regions of modes it converts before uploading, so only modes it uploads directly are repeated.
+        if imgData.format in INTERNAL_FORMATS:
+            if width < tex.width:
+                tex.blit_into(imgData.get_region(width - 1, 0, 1, height), width, 0, 0)
+            if height < tex.height:
+                tex.blit_into(imgData.get_region(0, height - 1, width, 1), 0, height, 0)
+
+        # Cover only the image
+        u = width / tex.width
+        v = height / tex.height
+        tex.tex_coords = (0, 0, 0, u, 0, 0, u, v, 0, 0, v, 0)
+
+    def textureBytes(texture) -> int:
+        """
+        Returns an estimate of the bytes of GL memory the texture uses.
+
+        texture: A GL compatible texture.
+        """
+        return texture.width * texture.height * BYTES_PER_PIXEL
@@ -0,0 +1,350 @@
+## Thumbnail Cache
+# A persistent, size bounded, on disk cache of display ready image thumbnails.
+
+## Imports
+import os
+import time
+import zlib
+import struct
+import hashlib
+import threading
+from PIL import Image
+
+## Constants
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_DIRECTORY = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "imguiRenderer", "thumbnails")
+FILE_EXTENSION = ".thumb"
+MAGIC = b"IITC"
+VERSION = 1
+HEADER_FORMAT = "<4sHB4sIIIIH"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+TRIM_RATIO = 0.9
+
+## Classes
+class ThumbnailCache():
+    """
+    Stores display ready thumbnails on disk so images do not need to be fully decoded again.
+    Entries are keyed by the source path, file size, modification time, thumbnail limit, and background color.
+    Each entry is validated against its key when read and the total size of the directory is bounded with least recently used eviction.
+    Safe to use from multiple threads.
+    """
+    ## Statics
+    _shared = None
+    _processInstances = {}
+
+    # Constructor
+    def __init__(self, directory: str = DEFAULT_DIRECTORY, maxBytes: int = DEFAULT_MAX_BYTES, compress: bool = False):
+        """
+        directory: A string directory path to store the thumbnails in. Created if it does not exist.
+        maxBytes: An int number of bytes the directory may hold before the least recently used thumbnails are deleted.
+        compress: If `True`, pixels are stored zlib compressed. Smaller on disk but slower to read.
+        """
+        # Provided
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.maxBytes = maxBytes
+        self.compress = compress
+
+        # Assigned
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._index = {}
+        self._lock = threading.Lock()
+
+        # Index the existing thumbnails
+        os.makedirs(self.directory, exist_ok=True)
+        self._scan()
+
+    ## Internal
+    def __reduce__(self):
+        # Send only the settings to worker processes, which each reuse one cache per directory
+        return (ThumbnailCache._forProcess, (self.directory, self.maxBytes, self.compress))
+
+    # Functions
+    def get(self, path: str, thumbLimit: tuple, background: tuple = None):
+        """
+        Returns the cached thumbnail for the image as a tuple of (PIL image, source size), or `None` if there is no valid entry.
+
+        path: A string filepath pointing to the source image.
+        thumbLimit: The thumbnail limit tuple the thumbnail was made with.
+        background: The background color tuple the thumbnail was made with, or `None`.
+        """
+        # Resolve the entry
+        key = ThumbnailCache.makeKey(path, thumbLimit, background)
+        if key == None:
+            self._countMiss()
+            return None
+
+        filename = ThumbnailCache._filename(key)
+        filepath = os.path.join(self.directory, filename)
+
+        # Read the entry
+        try:
+            with open(filepath, "rb") as f:
+                data = f.read()
+        except OSError:
+            self._countMiss()
+            return None
+
+        # Validate and decode the entry
+        result = self._decode(data, key)
+        if result == None:
+            self._remove(filename)
+            self._countMiss()
+            return None
+
+        # Mark as recently used
+        with self._lock:
+            self.hits += 1
+            if filename in self._index:
+                self._index[filename] = (self._index[filename][0], time.time())
+
+        return result
+
+    def put(self, path: str, thumbLimit: tuple, background: tuple, thumb, sourceSize: tuple) -> bool:
+        """
+        Stores the thumbnail for the image, then deletes the least recently used thumbnails if over `maxBytes`.
+
+        path: A string filepath pointing to the source image.
+        thumbLimit: The thumbnail limit tuple the thumbnail was made with.
+        background: The background color tuple the thumbnail was made with, or `None`.
+        thumb: The PIL image thumbnail. Its mode must be 4 characters or less.
+        sourceSize: A tuple containing the source image's size as (width, height).
+
+        Returns `True` if the thumbnail was stored.
+        """
+        # Resolve the entry
+        key = ThumbnailCache.makeKey(path, thumbLimit, background)
+        if key == None:
+            return False
+
+        filename = ThumbnailCache._filename(key)
+        filepath = os.path.join(self.directory, filename)
+
+        # Encode the entry
+        pixels = thumb.tobytes()
+        if self.compress:
+            pixels = zlib.compress(pixels, 1)
+
+        keyBytes = key.encode("utf-8")
+        header = struct.pack(
+            HEADER_FORMAT,
+            MAGIC,
+            VERSION,
+            1 if self.compress else 0,
+            thumb.mode.encode("ascii").ljust(4, b"\0"),
+            thumb.size[0],
+            thumb.size[1],
+            sourceSize[0],
+            sourceSize[1],
+            len(keyBytes)
+        )
+
+        # Write atomically
+        tempPath = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tempPath, "wb") as f:
+                f.write(header)
+                f.write(keyBytes)
+                f.write(pixels)
+            os.replace(tempPath, filepath)
+        except OSError:
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+            return False
+
+        # Index the entry
+        size = HEADER_SIZE + len(keyBytes) + len(pixels)
+        with self._lock:
+            previous = self._index.get(filename)
+            if previous != None:
+                self.bytes -= previous[0]
+            self._index[filename] = (size, time.time())
+            self.bytes += size
+
+        # Stay in bounds
+        if self.bytes > self.maxBytes:
+            self.trim()
+
+        return True
+
+    def trim(self, maxBytes: int = None) -> int:
+        """
+        Deletes the least recently used thumbnails until the cache holds less than `TRIM_RATIO` of the limit.
+
+        maxBytes: An int number of bytes to trim to. Provide `None` to use `maxBytes`.
+
+        Returns the number of thumbnails deleted.
+        """
+        # Resolve the limit
+        if maxBytes == None:
+            maxBytes = self.maxBytes
+        target = maxBytes * TRIM_RATIO
+
+        # Find the oldest entries
+        with self._lock:
+            ordered = sorted(self._index.items(), key=lambda item: item[1][1])
+
+        # Delete them
+        removed = 0
+        for filename, _ in ordered:
+            if self.bytes <= target:
+                break
+
+            self._remove(filename)
+            removed += 1
+
+        with self._lock:
+            self.evictions += removed
+
+        return removed
+
+    def clear(self):
+        """
+        Deletes every thumbnail in the cache.
+        """
+        with self._lock:
+            filenames = list(self._index.keys())
+
+        for filename in filenames:
+            self._remove(filename)
+
+    def stats(self) -> dict:
+        """
+        Returns a dict of the cache's counters.
+        Keys are `entries`, `bytes`, `maxBytes`, `hits`, `misses`, and `evictions`.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "bytes": self.bytes,
+                "maxBytes": self.maxBytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    ## Private Functions
+    def _scan(self):
+        """
+        Indexes the thumbnails already in the directory.
+        """
+        with self._lock:
+            self._index.clear()
+            self.bytes = 0
+
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.endswith(FILE_EXTENSION):
+                    stat = entry.stat()
+                    self._index[entry.name] = (stat.st_size, stat.st_mtime)
+                    self.bytes += stat.st_size
+
+    def _decode(self, data: bytes, key: str):
+        """
+        Validates and decodes a stored entry.
+
+        data: The bytes of the entry file.
+        key: The string key the entry must have been stored under.
+
+        Returns a tuple of (PIL image, source size), or `None` if the entry is invalid.
+        """
+        # Check the header
+        if len(data) < HEADER_SIZE:
+            return None
+
+        magic, version, compressed, mode, width, height, sourceW, sourceH, keyLength = struct.unpack_from(HEADER_FORMAT, data)
+        if (magic != MAGIC) or (version != VERSION):
+            return None
+
+        # Check the key
+        keyEnd = HEADER_SIZE + keyLength
+        if data[HEADER_SIZE:keyEnd] != key.encode("utf-8"):
+            return None
+
+        # Read the pixels
+        mode = mode.rstrip(b"\0").decode("ascii")
+        pixels = data[keyEnd:]
+        try:
+            if compressed:
+                pixels = zlib.decompress(pixels)
+
+            return (Image.frombytes(mode, (width, height), pixels), (sourceW, sourceH))
+        except (zlib.error, ValueError):
+            return None
+
+    def _remove(self, filename: str):
+        """
+        Deletes a thumbnail file and removes it from the index.
+
+        filename: The string filename of the thumbnail within the directory.
+        """
+        with self._lock:
+            previous = self._index.pop(filename, None)
+            if previous != None:
+                self.bytes -= previous[0]
+
+        try:
+            os.remove(os.path.join(self.directory, filename))
+        except OSError:
+            pass
+
+    def _countMiss(self):
+        """
+        Counts a cache miss.
+        """
+        with self._lock:
+            self.misses += 1
+
+    # Static Functions
+    def shared():
+        """
+        Returns the shared `ThumbnailCache`, or `None` if one has not been set with `setShared(...)`.
+        """
+        return ThumbnailCache._shared
+
+    def setShared(cache):
+        """
+        Sets the shared `ThumbnailCache` used by every `ImguiImage` that was not given its own.
+
+        cache: A `ThumbnailCache`, or `None` to disable the shared cache.
+        """
+        ThumbnailCache._shared = cache
+
+    def _forProcess(directory: str, maxBytes: int, compress: bool):
+        """
+        Returns this process' `ThumbnailCache` for the directory, creating it if needed.
+        Used to unpickle caches sent to `ImageLoader` worker processes so each process only indexes the directory once.
+
+        directory: A string directory path.
+        maxBytes: An int number of bytes the directory may hold.
+        compress: If `True`, pixels are stored zlib compressed.
+        """
+        key = (directory, maxBytes, compress)
+        if not (key in ThumbnailCache._processInstances):
+            ThumbnailCache._processInstances[key] = ThumbnailCache(directory, maxBytes, compress)
+
+        return ThumbnailCache._processInstances[key]
+
+    def makeKey(path: str, thumbLimit: tuple, background: tuple = None) -> str:
+        """
+        Returns the string key for the image's thumbnail, or `None` if the image cannot be found.
+
+        path: A string filepath pointing to the source image.
+        thumbLimit: The thumbnail limit tuple.
+        background: The background color tuple, or `None`.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        return repr((os.path.abspath(path), stat.st_size, stat.st_mtime_ns, thumbLimit, background))
+
+    def _filename(key: str) -> str:
+        """
+        Returns the filename an entry with the key is stored under.
+
+        key: A string key from `makeKey(...)`.
+        """
+        return hashlib.sha1(key.encode("utf-8")).hexdigest() + FILE_EXTENSION
@@ -0,0 +1,424 @@
+## Tiled Image
+# A tile pyramid of an image too large for a single texture that is built on demand, cached on disk, and uploaded tile by tile.
+
+## Imports
+import os
+import shutil
+import hashlib
+import threading
+from PIL import Image
+from pyglet import image as pygletImage
+
+from .imguiImage import ImguiImage
+from .textureCache import TextureCache
+from .texturePool import TexturePool
+from .imageLoader import ImageLoader, ImageJob
+
+## Constants
+DEFAULT_TILE_SIZE = 256
+DEFAULT_TILE_BUDGET = 256 * 1024 * 1024
+DEFAULT_DIRECTORY = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "imguiRenderer", "tiles")
+TILE_EXTENSION = ".png"
+TILE_COMPRESS_LEVEL = 1
+MAX_DRAFT_SHIFT = 3
+SOURCE_MODES = ("RGBA", "RGB", "LA", "L")
+
+## Classes
+class TiledImage():
+    """
+    A very large image split into a pyramid of square tiles.
+    Level `0` is the full resolution image and each level above it halves both sides, up to a top level that fits in a single tile.
+    Tiles are made on an `ImageLoader` worker only when requested, stored on disk so they are never made twice, and uploaded into a `TextureCache` that evicts the least recently drawn tiles once over its budget.
+    Making tiles decodes the source image into memory, about width x height x 4 bytes for full resolution tiles, or 4 GB for a gigapixel image. JPEG sources are decoded at a half, a quarter, or an eighth of their size for coarser levels, so zoomed out views need far less. The decoded source is dropped once no tiles are being made, so making tiles again later decodes it again.
+    Pillow refuses to open images larger than `PIL.Image.MAX_IMAGE_PIXELS`. Raise it before opening gigapixel images.
+    """
+    # Constructor
+    def __init__(self, filepath: str, tileSize: int = DEFAULT_TILE_SIZE, budget: int = DEFAULT_TILE_BUDGET, directory: str = DEFAULT_DIRECTORY, background: tuple = None, loader: ImageLoader = None, verbose: bool = False):
+        """
+        filepath: A string filepath pointing to the image file.
+        tileSize: An int width and height of each tile in pixels.
+        budget: An int number of bytes of tile textures to keep before evicting.
+        directory: A string directory path to store the tiles in. Each image gets its own subdirectory.
+        background: A tuple containing a background color to add behind the image as (r, g, b)[255]. Supply `None` to indicate no background should be added.
+        loader: The `ImageLoader` to make tiles with. Provide `None` to use the shared loader.
+        verbose: If `True`, enables verbose output.
+        """
+        # Provided
+        self.path = filepath
+        self.tileSize = tileSize
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.background = background
+        self.verbose = verbose
+        self._loader = loader
+
+        # Assigned
+        self.cache = TextureCache(budget)
+        self.levels = 0
+        self.tilesMade = 0
+        self.tilesRead = 0
+        self._size = None
+        self._tileDir = None
+        self._sources = {}
+        self._draftable = False
+        self._sourceLock = threading.Lock()
+        self._jobs = {}
+        self._failed = set()
+
+    ## Internal
+    def __str__(self) -> str:
+        return f"TiledImage(\"{self.path}\")"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    # Functions
+    def open(self):
+        """
+        Reads the image's size and prepares its tile directory.
+        Only the file's header is read.
+        """
+        # Read the size
+        with Image.open(self.path) as img:
+            self._size = img.size
+            self._draftable = (img.format == "JPEG")
+
+        # Find the top level
+        self.levels = 1
+        while (self.levelSize(self.levels - 1)[0] > self.tileSize) or (self.levelSize(self.levels - 1)[1] > self.tileSize):
+            self.levels += 1
+
+        # Resolve the tile directory
+        stat = os.stat(self.path)
+        key = repr((os.path.abspath(self.path), stat.st_size, stat.st_mtime_ns, self.tileSize, self.background))
+        self._tileDir = os.path.join(self.directory, hashlib.sha1(key.encode("utf-8")).hexdigest())
+        os.makedirs(self._tileDir, exist_ok=True)
+
+    def close(self):
+        """
+        Cancels any tiles being made and releases the tile textures and decoded source image.
+        Tiles already on disk are kept.
+        """
+        for job in self._jobs.values():
+            job.cancel()
+        self._jobs.clear()
+
+        self.cache.clear()
+
+        with self._sourceLock:
+            for source in self._sources.values():
+                source.close()
+            self._sources.clear()
+
+    def size(self) -> tuple:
+        """
+        Returns the full resolution size of the image as a tuple like (width, height).
+
+        If the image has not yet been opened, it is opened first.
+        """
+        if self._size == None:
+            self.open()
+
+        return self._size
+
+    def levelSize(self, level: int) -> tuple:
+        """
+        Returns the size of the image at the provided level as a tuple like (width, height).
+
+        level: An int level of the pyramid.
+        """
+        width, height = self.size()
+        return (max(1, (width + (1 << level) - 1) >> level), max(1, (height + (1 << level) - 1) >> level))
+
+    def tileCount(self, level: int) -> tuple:
+        """
+        Returns the number of tiles across the provided level as a tuple like (columns, rows).
+
+        level: An int level of the pyramid.
+        """
+        width, height = self.levelSize(level)
+        return ((width + self.tileSize - 1) // self.tileSize, (height + self.tileSize - 1) // self.tileSize)
+
+    def tileRect(self, level: int, col: int, row: int) -> tuple:
+        """
+        Returns the area a tile covers in its level's pixels as (x0, y0, x1, y1).
+        Tiles on the right and bottom edges may be smaller than `tileSize`.
+
+        level: An int level of the pyramid.
+        col: An int column of the tile.
+        row: An int row of the tile.
+        """
+        width, height = self.levelSize(level)
+        x0 = col * self.tileSize
+        y0 = row * self.tileSize
+        return (x0, y0, min(x0 + self.tileSize, width), min(y0 + self.tileSize, height))
+
+    def levelForScale(self, scale: float) -> int:
+        """
+        Returns the coarsest level that still has at least one pixel per screen pixel at the provided scale.
+
+        scale: A float number of screen pixels per full resolution image pixel.
+        """
+        if scale <= 0:
+            return self.levels - 1
+
+        ratio = int(1 / scale)
+        if ratio < 2:
+            return 0
+
+        return min(ratio.bit_length() - 1, self.levels - 1)
+
+    def getTile(self, level: int, col: int, row: int, request: bool = True):
+        """
+        Returns the texture for a tile and marks it as drawn this frame, or `None` if it is not ready.
+        Must be called from the render thread.
+
+        level: An int level of the pyramid.
+        col: An int column of the tile.
+        row: An int row of the tile.
+        request: If `True`, a missing tile is queued to be made.
+        """
+        key = (level, col, row)
+        tex = self.cache.get(key)
+        if (tex == None) and request:
+            self.requestTile(level, col, row)
+
+        return tex
+
+    def requestTile(self, level: int, col: int, row: int):
+        """
+        Queues a tile to be read from disk or made on a worker if it is not already loaded or queued.
+
+        level: An int level of the pyramid.
+        col: An int column of the tile.
+        row: An int row of the tile.
+        """
+        # Check if already loaded, queued, or failed
+        key = (level, col, row)
+        if (key in self.cache) or (key in self._jobs) or (key in self._failed):
+            return
+
+        # Queue the tile
+        def decode(job):
+            return self._loadTile(level, col, row, job)
+
+        loader = self._loader if (self._loader != None) else ImageLoader.shared()
+        self._jobs[key] = loader.submit(ImageJob(self, decode))
+
+    def retainTiles(self, keys: set) -> int:
+        """
+        Cancels every queued tile not in the provided set.
+        Call after requesting the tiles for a new view so tiles that scrolled out of it before starting are skipped.
+
+        keys: A set of tile keys as (level, col, row).
+
+        Returns the number of tiles cancelled.
+        """
+        cancelled = [key for key in self._jobs if not (key in keys)]
+        for key in cancelled:
+            self._jobs.pop(key).cancel()
+
+        # Drop the source if nothing is left to make
+        if len(self._jobs) == 0:
+            self._dropSources()
+
+        return len(cancelled)
+
+    def pending(self) -> int:
+        """
+        Returns the number of tiles queued or being made.
+        """
+        return len(self._jobs)
+
+    def stats(self) -> dict:
+        """
+        Returns a dict of the image's counters.
+        Keys are `levels`, `pending`, `tilesMade` from the source image, `tilesRead` from disk, and the `TextureCache.stats()` of its tile textures under `textures`.
+        """
+        return {
+            "levels": self.levels,
+            "pending": len(self._jobs),
+            "tilesMade": self.tilesMade,
+            "tilesRead": self.tilesRead,
+            "textures": self.cache.stats()
+        }
+
+    def clearDisk(self):
+        """
+        Deletes every tile of this image stored on disk.
+        """
+        if self._tileDir != None:
+            shutil.rmtree(self._tileDir, ignore_errors=True)
+            os.makedirs(self._tileDir, exist_ok=True)
+
+    ## Private Functions
+    def _loadTile(self, level: int, col: int, row: int, job: ImageJob = None):
+        """
+        Reads a tile from disk, or makes it from the source image and stores it on disk.
+        Safe to call from any thread.
+
+        level: An int level of the pyramid.
+        col: An int column of the tile.
+        row: An int row of the tile.
+        job: The `ImageJob` making the tile, checked for cancellation before the source is decoded. Provide `None` if not on a worker.
+
+        Returns a tuple of (PIL image in one of the `ImguiImage.UPLOAD_MODES`, `True` if the tile was made rather than read from disk), or `None` if cancelled.
+        """
+        # Read from disk
+        tilePath = os.path.join(self._tileDir, f"{level}_{col}_{row}{TILE_EXTENSION}")
+        try:
+            tile = Image.open(tilePath)
+            tile.load()
+            return (ImguiImage.convertForUpload(tile), False)
+        except OSError:
+            pass
+
+        # Check the tile is still wanted
+        if (job != None) and job.cancelled:
+            return None
+
+        # Reduce the covered area of the source
+        # NOTE: Only the tile's own area is reduced, so coarse tiles never require the finer levels to exist.
+        source, shift = self._getSource(level)
+        x0, y0, x1, y1 = self.tileRect(level, col, row)
+        width, height = source.size
+        box = ((x0 << level) >> shift, (y0 << level) >> shift, min((x1 << level) >> shift, width), min((y1 << level) >> shift, height))
+
+        if level == shift:
+            tile = source.crop(box)
+        else:
+            tile = source.reduce(1 << (level - shift), box)
+
+        # Store atomically
+        tempPath = f"{tilePath}.{threading.get_ident()}.tmp"
+        try:
+            tile.save(tempPath, "PNG", compress_level=TILE_COMPRESS_LEVEL)
+            os.replace(tempPath, tilePath)
+        except OSError:
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+
+        return (ImguiImage.convertForUpload(tile), True)
+
+    def _getSource(self, level: int) -> tuple:
+        """
+        Returns the decoded source image to make tiles of the level from, decoding it on first use.
+        JPEG sources are decoded at the smallest scale the decoder offers that is no smaller than the level, so coarse tiles never decode every pixel. A finer source that is already decoded is used instead of decoding another.
+        Safe to call from any thread.
+
+        level: An int level of the pyramid.
+
+        Returns a tuple of (PIL image in one of the `SOURCE_MODES`, int number of times each side was halved while decoding).
+        """
+        shift = min(level, MAX_DRAFT_SHIFT) if self._draftable else 0
+        with self._sourceLock:
+            # Reuse a finer source already decoded
+            finer = [key for key in self._sources if key <= shift]
+            source = self._sources[max(finer)] if (len(finer) > 0) else None
+            if source == None:
+                # Verbose
+                if self.verbose:
+                    print(f"Decoding \"{self.path[:64]}\" at 1/{1 << shift} scale to make tiles.")
+
+                # Decode at the level's scale
+                # NOTE: A limit of the source's sides divided by the scale asks the decoder for exactly that scale.
+                limit = None
+                if shift > 0:
+                    width, height = self._size
+                    scale = 1 << shift
+                    limit = (-(-max(width, height) // scale), -(-min(width, height) // scale))
+                # NOTE: Grayscale sources stay single channel, as only each tile needs converting for upload.
+                source = ImguiImage.openReduced(self.path, limit, self.background)[0]
+                if not (source.mode in SOURCE_MODES):
+                    converted = source.convert("RGBA")
+                    source.close()
+                    source = converted
+
+                self._sources[shift] = source
+
+        # Check the scale the decoder chose
+        return (source, (round(self._size[0] / source.size[0])).bit_length() - 1)
+
+    def _dropSources(self):
+        """
+        Forgets every decoded source image so its memory is freed once no worker still uses it.
+        """
+        # NOTE: Not closed, as a cancelled tile may still be reducing it on a worker.
+        with self._sourceLock:
+            self._sources.clear()
+
+    def _uploadTile(self, key: tuple, tile):
+        """
+        Uploads a tile into the `TextureCache` and closes the tile.
+        Must be called from the render thread.
+
+        key: A tuple tile key as (level, col, row).
+        tile: A PIL image in one of the `ImguiImage.UPLOAD_MODES`.
+        """
+        # Wrap the raw pixels
+        imgData = pygletImage.ImageData(tile.size[0], tile.size[1], tile.mode, tile.tobytes(), pitch=(tile.size[0] * len(tile.mode)))
+
+        # Get a texture from the pool
+        tex = TexturePool.shared().acquire(imgData, ImguiImage.supportsNpot())
+        self.cache.put(key, tex)
+        tile.close()
+
+    def _onDecodeStarted(self, job: ImageJob):
+        """
+        Called on a worker thread when a tile starts being made.
+
+        job: The `ImageJob` being decoded.
+        """
+        pass
+
+    def _onDecodeFinished(self, job: ImageJob):
+        """
+        Called on the render thread when a tile has been made.
+        Uploads the tile.
+
+        job: The decoded `ImageJob`.
+        """
+        # Find the tile
+        key = None
+        for jobKey, tileJob in self._jobs.items():
+            if tileJob is job:
+                key = jobKey
+                break
+
+        # Check the tile is still wanted
+        if key == None:
+            if job.result != None:
+                job.result[0].close()
+            return
+        del self._jobs[key]
+
+        # Drop the source if nothing is left to make
+        if len(self._jobs) == 0:
+            self._dropSources()
+
+        # Check if the tile failed
+        if (job.error != None) or (job.result == None):
+            print(f"{self} could not make tile {key}: {job.error}")
+            self._failed.add(key)
+            return
+
+        # Count where the tile came from
+        tile, made = job.result
+        if made:
+            self.tilesMade += 1
+        else:
+            self.tilesRead += 1
+
+        # Upload the tile
+        # NOTE: The tile is kept marked as failed until the upload succeeds so one that fails to upload is not made again.
+        self._failed.add(key)
+        self._uploadTile(key, tile)
+        self._failed.discard(key)
+
+    def _onUploadFailed(self, job: ImageJob):
+        """
+        Called on the render thread when uploading a tile raised an exception.
+        The tile stays marked as failed the same way a tile that could not be made does.
+
+        job: The `ImageJob` with the exception as its `error`.
+        """
+        print(f"{self} could not upload a tile: {job.error}")
@@ -0,0 +1,225 @@
+## ImGui Boilerplate: Remote Source Tests
+## Tests `RemoteSource` against a local stand in HTTP server.
+## Run from the repository root: `python -m pytest tests` or `python -m unittest discover tests`
+
+## Imports
+import os
+import sys
+import time
+import socket
+import shutil
+import tempfile
+import unittest
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from imguiRenderer.remoteSource import RemoteSource, BODY_EXTENSION
+
+## Constants
+LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+SLOW_SECONDS = 0.2
+
+## Classes
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Answers requests for the stand in server's routes, keeping connections alive between them.
+    """
+    ## Statics
+    protocol_version = "HTTP/1.1"
+
+    ## Internal
+    def log_message(self, format, *args):
+        pass
+
+    # Functions
+    def do_GET(self):
+        server = self.server
+        path = self.path.split("?")[0]
+
+        # Record the request
+        with server.lock:
+            server.requests.append((path, dict(self.headers), self.client_address))
+            server.connections.add(self.connection)
+
+        if path == "/etag":
+            # Revalidate by entity tag
+            body = f"etag body {server.etag}".encode("utf-8")
+            if self.headers.get("If-None-Match") == server.etag:
+                self._send(304, {"ETag": server.etag})
+            else:
+                self._send(200, {"ETag": server.etag}, body)
+        elif path == "/modified":
+            # Revalidate by modification date
+            if self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                self._send(304, {"Last-Modified": LAST_MODIFIED})
+            else:
+                self._send(200, {"Last-Modified": LAST_MODIFIED}, b"modified body")
+        elif path == "/redirect":
+            # Send to another route
+            self._send(302, {"Location": "/etag"})
+        elif path == "/slow":
+            # Count how many requests are in flight at once
+            with server.lock:
+                server.inFlight += 1
+                server.maxInFlight = max(server.maxInFlight, server.inFlight)
+            time.sleep(SLOW_SECONDS)
+            with server.lock:
+                server.inFlight -= 1
+            self._send(200, {}, b"slow body")
+        else:
+            self._send(404, {}, b"missing")
+
+    ## Private Functions
+    def _send(self, status: int, headers: dict, body: bytes = b""):
+        """
+        Sends a response with a body length so the connection stays open.
+
+        status: An int HTTP status.
+        headers: A dict of headers.
+        body: The body bytes.
+        """
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and (status != 304):
+            self.wfile.write(body)
+
+class TestRemoteSource(unittest.TestCase):
+    """
+    Fetches from a stand in HTTP server on 127.0.0.1 run in a thread.
+    """
+    ## Internal
+    def setUp(self):
+        # Start the server
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.connections = set()
+        self.server.etag = "\"v1\""
+        self.server.inFlight = 0
+        self.server.maxInFlight = 0
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        # Point a source at it
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.directory = tempfile.mkdtemp()
+        self.source = RemoteSource(self.directory, timeout=5)
+
+    def tearDown(self):
+        self.source.close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    # Functions
+    def testEtagRevalidationReusesStoredBody(self):
+        first, firstVersion = self.source.fetch(f"{self.base}/etag")
+        second, secondVersion = self.source.fetch(f"{self.base}/etag")
+
+        self.assertEqual(first.read(), b"etag body \"v1\"")
+        self.assertEqual(second.read(), b"etag body \"v1\"")
+        self.assertEqual(firstVersion, secondVersion)
+        self.assertEqual(self.server.requests[1][1].get("If-None-Match"), "\"v1\"")
+        self.assertEqual(self.source.stats()["downloads"], 1)
+        self.assertEqual(self.source.stats()["revalidated"], 1)
+
+    def testLastModifiedRevalidation(self):
+        first, version = self.source.fetch(f"{self.base}/modified")
+        second, _ = self.source.fetch(f"{self.base}/modified")
+
+        self.assertEqual(version, LAST_MODIFIED)
+        self.assertEqual(second.read(), first.getvalue())
+        self.assertEqual(self.server.requests[1][1].get("If-Modified-Since"), LAST_MODIFIED)
+        self.assertEqual(self.source.stats()["downloads"], 1)
+        self.assertEqual(self.source.stats()["revalidated"], 1)
+
+    def testChangedEtagDownloadsAgain(self):
+        _, firstVersion = self.source.fetch(f"{self.base}/etag")
+        self.server.etag = "\"v2\""
+        body, secondVersion = self.source.fetch(f"{self.base}/etag")
+
+        self.assertEqual(body.read(), b"etag body \"v2\"")
+        self.assertNotEqual(firstVersion, secondVersion)
+        self.assertEqual(self.source.stats()["downloads"], 2)
+        self.assertEqual(self.source.stats()["revalidated"], 0)
+
+        # The new version is stored for the next revalidation
+        self.source.fetch(f"{self.base}/etag")
+        self.assertEqual(self.source.stats()["revalidated"], 1)
+
+    def testMissingStoredBodyDownloadsAgain(self):
+        self.source.fetch(f"{self.base}/etag")
+        os.remove(self.source._cachePath(f"{self.base}/etag", BODY_EXTENSION))
+        body, _ = self.source.fetch(f"{self.base}/etag")
+
+        self.assertEqual(body.read(), b"etag body \"v1\"")
+        self.assertEqual(self.server.requests[2][1].get("If-None-Match"), None)
+        self.assertEqual(self.source.stats()["downloads"], 2)
+        self.assertEqual(self.source.stats()["requests"], 3)
+
+    def testRedirectIsFollowed(self):
+        body, version = self.source.fetch(f"{self.base}/redirect")
+
+        self.assertEqual(body.read(), b"etag body \"v1\"")
+        self.assertEqual(version, "\"v1\"")
+        self.assertEqual([request[0] for request in self.server.requests], ["/redirect", "/etag"])
+
+    def testMissingRaisesOSError(self):
+        with self.assertRaises(OSError):
+            self.source.fetch(f"{self.base}/missing")
+
+    def testKeepAliveConnectionIsReused(self):
+        source = RemoteSource(None, timeout=5)
+        for _ in range(3):
+            source.fetch(f"{self.base}/etag")
+        source.close()
+
+        self.assertEqual(source.stats()["connectionsOpened"], 1)
+        self.assertEqual(len({request[2] for request in self.server.requests}), 1)
+
+    def testStaleConnectionIsRetried(self):
+        source = RemoteSource(None, timeout=5)
+        source.fetch(f"{self.base}/etag")
+
+        # Close the kept alive connection from the server's side
+        with self.server.lock:
+            connections = list(self.server.connections)
+        for conn in connections:
+            conn.shutdown(socket.SHUT_RDWR)
+        time.sleep(0.1)
+
+        body, _ = source.fetch(f"{self.base}/etag")
+        source.close()
+
+        self.assertEqual(body.read(), b"etag body \"v1\"")
+        self.assertEqual(source.stats()["connectionsOpened"], 2)
+
+    def testInFlightFetchesStayWithinMaxConnections(self):
+        source = RemoteSource(None, maxConnections=2, timeout=5)
+        errors = []
+
+        def fetch(i):
+            try:
+                source.fetch(f"{self.base}/slow?i={i}")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=fetch, args=(i,)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        source.close()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.server.maxInFlight, 2)
+        self.assertLessEqual(source.stats()["connectionsOpened"], 2)
+
+## Execution
+if __name__ == "__main__":
+    unittest.main()